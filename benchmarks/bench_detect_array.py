@@ -0,0 +1,109 @@
+"""
+Benchmark: MouseGestureDetector.detect() vs detect_array().
+
+Usage:
+    python benchmarks/bench_detect_array.py [n_events ...]
+
+Default sizes: 100_000 and 1_000_000 events.
+Requires numpy (pip install gestura[numpy]).
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from gestura.input.mouse.pipeline import MouseGestureDetector
+from gestura.input.mouse.vectorized import extract_segments_array
+from gestura.models.event import EventData_move
+from gestura.models.mouse import GestureMouseCondition
+
+
+def make_gestures() -> list[GestureMouseCondition]:
+    gestures: list[GestureMouseCondition] = []
+
+    for callback, conditions in {
+        "right": [("x", "right", 300)],
+        "up": [("y", "up", 300)],
+        "right_down": [("x", "right", 200), ("y", "down", 200)],
+        "zigzag": [("x", "left", 100), ("x", "right", 100), ("y", "up", 100)],
+    }.items():
+        gesture = GestureMouseCondition()
+        for axis, trend, min_delta in conditions:
+            gesture.add_condition(axis=axis, trend=trend, min_delta=min_delta)  # type: ignore[call-overload]
+        gesture.callback = callback
+        gestures.append(gesture)
+
+    return gestures
+
+
+def make_trace(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Strokes of 50-400 samples with 10% small jitter samples.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    lengths = rng.integers(50, 400, size=n // 50 + 1)
+    directions = rng.choice([-1, 1], size=(len(lengths), 2))
+    steps = np.repeat(directions, lengths, axis=0)[:n] * rng.integers(0, 6, size=(n, 2))
+
+    jitter = rng.random(n) < 0.10
+    steps[jitter] = -np.sign(steps[jitter]) * rng.integers(1, 3, size=(int(jitter.sum()), 2))
+
+    xs = 10_000 + np.cumsum(steps[:, 0])
+    ys = 10_000 + np.cumsum(steps[:, 1])
+    return xs, ys
+
+
+def bench(n: int) -> None:
+    detector = MouseGestureDetector(make_gestures(), segment_min_delta=8)
+
+    xs, ys = make_trace(n)
+    ids = np.arange(n)
+    events = [EventData_move(id=i, x=int(x), y=int(y)) for i, x, y in zip(ids.tolist(), xs.tolist(), ys.tolist())]
+
+    # segment extraction alone (the part detect_array vectorizes)
+    t0 = time.perf_counter()
+    segments = detector.extract_segments(events)
+    t_extract_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    segments_array = extract_segments_array(
+        xs, ys, ids,
+        segment_min_delta=detector.segment_min_delta,
+        jitter_max_delta=detector.jitter_max_delta,
+        lookahead=detector.lookahead,
+    )
+    t_extract_array = time.perf_counter() - t0
+
+    assert segments_array == segments, "vectorized extraction diverged"
+
+    # end to end (matching is shared by both paths)
+    t0 = time.perf_counter()
+    expected = detector.detect(events)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = detector.detect_array(xs, ys, ids)
+    t_array = time.perf_counter() - t0
+
+    assert result == expected, "detect_array() diverged from detect()"
+
+    print(
+        f"n={n:>9,}  segments={len(segments):>6,}  occurrences={len(result):>6,}\n"
+        f"    extract: loop={t_extract_loop:7.3f}s  array={t_extract_array:7.3f}s  "
+        f"speedup={t_extract_loop / t_extract_array:6.1f}x\n"
+        f"    detect:  loop={t_loop:7.3f}s  array={t_array:7.3f}s  "
+        f"speedup={t_loop / t_array:6.1f}x"
+    )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: precomputed KeyUtils table vs the full normalization logic.
+
+Replays a typing-like stream of raw adapter keys (what
+KeyboardListener._normalize_key emits: characters, shifted characters,
+named keys, modifier variants and ctrl+letter control characters) through:
+- KeyUtils._normalize_key_uncached()  (previous parse_key path)
+- KeyUtils.parse_key()                (table lookup, full logic on a miss)
+
+Usage:
+    python benchmarks/bench_key_normalizer.py [n_keys ...]
+
+Default sizes: 100_000 and 1_000_000 keys.
+"""
+
+import random
+import sys
+import time
+from typing import Any, Callable
+
+from gestura.utils.key_normalizer import KeyUtils
+
+
+WORDS = "the quick brown fox jumps over lazy dog gesture engine keyboard mouse shortcut".split()
+NAMED = ["backspace", "enter", "tab", "esc", "left", "right", "up", "down"]
+MODIFIERS = ["shift", "shift_r", "ctrl_l", "alt_l", "cmd"]
+
+
+def typing_stream(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    keys: list[str] = []
+
+    while len(keys) < n:
+        roll = rng.random()
+
+        if roll < 0.75:
+            word = rng.choice(WORDS)
+            if rng.random() < 0.1:
+                keys.append("shift")
+                word = word.capitalize()
+            keys.extend(word)
+            keys.append("space")
+        elif roll < 0.9:
+            keys.append(rng.choice(NAMED))
+        else:
+            # ctrl+letter arrives as a control character
+            keys.append(rng.choice(MODIFIERS))
+            keys.append(chr(rng.randint(1, 26)))
+
+    return keys[:n]
+
+
+def timed(func: Callable[[], Any]) -> float:
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def bench(n: int) -> None:
+    keys = typing_stream(n)
+    uncached = KeyUtils._normalize_key_uncached
+    parse = KeyUtils.parse_key
+
+    assert [uncached(k, "str") for k in keys[:10_000]] == [parse(k, "str") for k in keys[:10_000]]
+
+    t_old = timed(lambda: [uncached(k, "str") for k in keys])
+    t_new = timed(lambda: [parse(k, "str") for k in keys])
+
+    hits = sum(k in KeyUtils._TABLES["str"] for k in keys) / n
+
+    print(
+        f"n={n:>9,}  table hits={hits:6.1%}\n"
+        f"    full logic: {t_old:7.3f}s  ({t_old / n * 1e9:6.0f} ns/key)\n"
+        f"    table:      {t_new:7.3f}s  ({t_new / n * 1e9:6.0f} ns/key)  "
+        f"speedup={t_old / t_new:5.2f}x"
+    )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
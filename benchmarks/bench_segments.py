@@ -0,0 +1,116 @@
+"""
+Benchmark: Segment records vs the previous per-segment dicts.
+
+Measures, for the same segment values:
+- allocation (tracemalloc) and construction time
+- sort by start_id (lambda on dict vs attrgetter on Segment)
+- a matching-style scan (the inner loop of _match_gesture)
+
+Usage:
+    python benchmarks/bench_segments.py [n_segments ...]
+
+Default sizes: 100_000 and 1_000_000 segments.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from gestura.input.mouse.segments import AXES, TREND_NAMES, Segment, by_start_id
+
+
+def make_values(n: int, seed: int = 0) -> list[tuple[int, int, int, int, int]]:
+    rng = random.Random(seed)
+    values = []
+    for i in range(n):
+        axis = rng.randint(0, 1)
+        start = i * 8 + axis
+        values.append((start, start + rng.randint(1, 40), axis, rng.choice((1, -1)), rng.randint(8, 400)))
+
+    rng.shuffle(values)
+    return values
+
+
+def as_dicts(values: list[tuple[int, int, int, int, int]]) -> list[dict[str, Any]]:
+    names = [(AXES[axis], TREND_NAMES[axis, trend]) for _, _, axis, trend, _ in values]
+    return [
+        {"start_id": s, "end_id": e, "axis": axis, "trend": trend, "delta": d}
+        for (s, e, _, _, d), (axis, trend) in zip(values, names)
+    ]
+
+
+def as_segments(values: list[tuple[int, int, int, int, int]]) -> list[Segment]:
+    return [Segment(s, e, axis, trend, d) for s, e, axis, trend, d in values]
+
+
+def scan_dicts(segments: list[dict[str, Any]]) -> int:
+    found = 0
+    for seg in segments:
+        if seg["end_id"] >= 0 and seg["axis"] == "x" and seg["trend"] == "right" and seg["delta"] >= 100:
+            found += 1
+    return found
+
+
+def scan_segments(segments: list[Segment]) -> int:
+    found = 0
+    for seg in segments:
+        if seg.end_id >= 0 and seg.axis == 0 and seg.trend == 1 and seg.delta >= 100:
+            found += 1
+    return found
+
+
+def measure(build: Callable[[], list[Any]]) -> tuple[list[Any], float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def timed(func: Callable[[], Any]) -> float:
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def bench(n: int) -> None:
+    values = make_values(n)
+
+    # construction time is measured without tracemalloc overhead
+    t_build_dict = timed(lambda: as_dicts(values))
+    t_build_seg = timed(lambda: as_segments(values))
+
+    dicts, _, mem_dict = measure(lambda: as_dicts(values))
+    segments, _, mem_seg = measure(lambda: as_segments(values))
+
+    t_sort_dict = timed(lambda: sorted(dicts, key=lambda s: s["start_id"]))
+    t_sort_seg = timed(lambda: sorted(segments, key=by_start_id))
+
+    t_scan_dict = timed(lambda: scan_dicts(dicts))
+    t_scan_seg = timed(lambda: scan_segments(segments))
+
+    assert scan_dicts(dicts) == scan_segments(segments)
+
+    print(
+        f"n={n:>9,}\n"
+        f"    memory: dict={mem_dict / n:6.0f} B/seg  Segment={mem_seg / n:6.0f} B/seg\n"
+        f"    build:  dict={t_build_dict:7.3f}s  Segment={t_build_seg:7.3f}s\n"
+        f"    sort:   dict={t_sort_dict:7.3f}s  Segment={t_sort_seg:7.3f}s  "
+        f"speedup={t_sort_dict / t_sort_seg:5.2f}x\n"
+        f"    scan:   dict={t_scan_dict:7.3f}s  Segment={t_scan_seg:7.3f}s  "
+        f"speedup={t_scan_dict / t_scan_seg:5.2f}x"
+    )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
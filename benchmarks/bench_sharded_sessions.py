@@ -0,0 +1,103 @@
+"""
+Benchmark: ShardedEngine (N processes) vs MultiSessionEngine (one process).
+
+Synthetic sessions each send a mouse stroke (down, then right) and a
+ctrl + k sequence. Everything is submitted up front; the time runs until
+stop() returns, i.e. until every event has been detected and every
+resulting action published (shard start-up included). Measures:
+- input events per second
+- actions published (should match between runs)
+
+Usage:
+    python benchmarks/bench_sharded_sessions.py [n_sessions ...]
+
+Default sizes: 200 and 2_000 sessions; shard counts 1, 2 and 4.
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from gestura import MultiSessionEngine, ShardedEngine
+from gestura.models.inputs import KeyboardEvent, MouseMoveEvent
+
+
+CONFIG: list[dict[str, Any]] = [
+    {"keyboard": {"conditions": ["ctrl", "k"]}, "mouse": {"conditions": []}, "callback": "search"},
+    {"keyboard": {"conditions": []},
+     "mouse": {"conditions": [
+         {"axis": "y", "trend": "down", "min_delta": 200},
+         {"axis": "x", "trend": "right", "min_delta": 200},
+     ]},
+     "callback": "stroke"},
+]
+
+
+def make_stream(n_sessions: int) -> list[tuple[str, str, Any]]:
+    stream: list[tuple[str, str, Any]] = []
+    for step in range(60):
+        for s in range(n_sessions):
+            session_id = f"user{s}"
+            if step < 30:
+                event = MouseMoveEvent(x=100, y=100 + step * 10)
+            else:
+                event = MouseMoveEvent(x=100 + (step - 30) * 10, y=400)
+            stream.append(("mouse", session_id, event))
+
+    for key in ("ctrl", "k"):
+        for s in range(n_sessions):
+            for press in (True, False):
+                stream.append(("keyboard", f"user{s}", KeyboardEvent(key=key, press=press)))
+
+    return stream
+
+
+def run(factory: Callable[[Callable[[Any, Any], None]], Any], stream: list[tuple[str, str, Any]]) -> tuple[float, int]:
+    actions: list[Any] = []
+    lock = threading.Lock()
+
+    def publish(session_id: Any, action: Any) -> None:
+        with lock:
+            actions.append((session_id, action.callback))
+
+    engine = factory(publish)
+    engine.start()
+
+    t0 = time.perf_counter()
+    for source, session_id, event in stream:
+        if source == "mouse":
+            engine.submit_mouse(session_id, event)
+        else:
+            engine.submit_keyboard(session_id, event)
+    if isinstance(engine, MultiSessionEngine):
+        engine.stop(timeout=None)
+    else:
+        engine.stop()
+    elapsed = time.perf_counter() - t0
+
+    return elapsed, len(actions)
+
+
+def bench(n_sessions: int) -> None:
+    stream = make_stream(n_sessions)
+    n = len(stream)
+
+    print(f"sessions={n_sessions:>6,}  events={n:,}")
+
+    elapsed, actions = run(lambda publish: MultiSessionEngine(CONFIG, publish, workers=1), stream)
+    print(f"    MultiSessionEngine:       {n / elapsed:>9,.0f} events/s  actions={actions:,}")
+
+    for shards in (1, 2, 4):
+        elapsed, actions = run(lambda publish: ShardedEngine(CONFIG, publish, shards=shards), stream)
+        print(f"    ShardedEngine(shards={shards}):  {n / elapsed:>9,.0f} events/s  actions={actions:,}")
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 2_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
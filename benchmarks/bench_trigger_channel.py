@@ -0,0 +1,144 @@
+"""
+Benchmark: TriggerChannel vs the previous per-callback queue.Queue handoff.
+
+A producer thread plays the detection thread at a high mouse rate: one
+submission per input event, most of them empty, a few with 1-3
+callbacks. A consumer thread plays ShortcutWorker. Measures:
+- producer time per input event
+- consumer wakeups
+- context switches of the process (getrusage, Unix only)
+
+Usage:
+    python benchmarks/bench_trigger_channel.py [n_events ...]
+
+Default sizes: 100_000 and 1_000_000 input events (5% produce triggers).
+"""
+
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from gestura.engine.channel import TriggerChannel
+from gestura.models.policy import TriggerEvent
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def make_submissions(n: int, rate: float = 0.05, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [
+        [f"cb{rng.randint(0, 20)}" for _ in range(rng.randint(1, 3))] if rng.random() < rate else []
+        for _ in range(n)
+    ]
+
+
+def context_switches() -> int:
+    if resource is None:
+        return -1
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+# ------------------------------------------------------------
+# Previous handoff
+# ------------------------------------------------------------
+
+def run_queue(submissions: list[list[str]]) -> tuple[float, int, int]:
+    q: queue.Queue[TriggerEvent] = queue.Queue()
+    stats = {"wakeups": 0, "handled": 0}
+
+    def consume() -> None:
+        while True:
+            trigger = q.get()
+            stats["wakeups"] += 1
+            if trigger.source == "__STOP__":
+                return
+            stats["handled"] += 1
+
+    def submit(callbacks: list[str]) -> None:
+        now = time.monotonic()
+        for cb in callbacks:
+            q.put(TriggerEvent("mouse", cb, now))
+
+    def stop() -> None:
+        q.put(TriggerEvent("__STOP__", "", 0.0))
+
+    return run(consume, submit, stop, submissions, stats)
+
+
+# ------------------------------------------------------------
+# TriggerChannel
+# ------------------------------------------------------------
+
+def run_channel(submissions: list[list[str]]) -> tuple[float, int, int]:
+    channel = TriggerChannel()
+    stats = {"wakeups": 0, "handled": 0}
+
+    def consume() -> None:
+        while (batches := channel.drain()) is not None:
+            stats["wakeups"] += 1
+            for source, callbacks, timestamp in batches:
+                for callback in callbacks:
+                    TriggerEvent(source, callback, timestamp)  # type: ignore[arg-type]
+                    stats["handled"] += 1
+
+    def submit(callbacks: list[str]) -> None:
+        if callbacks:
+            channel.put("mouse", callbacks, time.monotonic())
+
+    return run(consume, submit, channel.close, submissions, stats)
+
+
+def run(
+    consume: Callable[[], None],
+    submit: Callable[[list[str]], None],
+    stop: Callable[[], Any],
+    submissions: list[list[str]],
+    stats: dict[str, int],
+) -> tuple[float, int, int]:
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    switches = context_switches()
+    t0 = time.perf_counter()
+    for callbacks in submissions:
+        submit(callbacks)
+    elapsed = time.perf_counter() - t0
+
+    stop()
+    consumer.join()
+    switches = context_switches() - switches
+
+    assert stats["handled"] == sum(map(len, submissions))
+    return elapsed, stats["wakeups"], switches
+
+
+def bench(n: int) -> None:
+    submissions = make_submissions(n)
+    triggers = sum(map(len, submissions))
+
+    t_queue, w_queue, cs_queue = run_queue(submissions)
+    t_channel, w_channel, cs_channel = run_channel(submissions)
+
+    print(
+        f"events={n:>9,}  triggers={triggers:,}\n"
+        f"    queue.Queue:    {t_queue / n * 1e9:6.0f} ns/event  wakeups={w_queue:>8,}  ctx switches={cs_queue:>8,}\n"
+        f"    TriggerChannel: {t_channel / n * 1e9:6.0f} ns/event  wakeups={w_channel:>8,}  ctx switches={cs_channel:>8,}"
+    )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
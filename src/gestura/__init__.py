@@ -1,4 +1,9 @@
 from .engine.engine import GesturaEngine, ActionEvent
+from .engine.async_engine import AsyncGesturaEngine
+from .engine.sessions import MultiSessionEngine
+from .engine.shards import ShardedEngine
+
+from .models.queues import QueueLimit, QueueLimits, QueueStats
 
 from .models.inputs import (
     MouseEvent,
@@ -9,7 +14,8 @@ from .models.inputs import (
 
 
 __all__ = [
-    "GesturaEngine", "ActionEvent",
+    "GesturaEngine", "AsyncGesturaEngine", "MultiSessionEngine", "ShardedEngine", "ActionEvent",
     "MouseEvent", "MouseMoveEvent", "MouseClickEvent",
     "KeyboardEvent",
+    "QueueLimit", "QueueLimits", "QueueStats",
 ]
\ No newline at end of file
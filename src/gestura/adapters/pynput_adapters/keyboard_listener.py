@@ -1,4 +1,5 @@
 from typing import Callable, Optional, Any
+import time
 
 import pynput
 from ...models.inputs import KeyboardEvent
@@ -29,15 +30,17 @@ class KeyboardListener:
         """
         Internal handler for key press events.
         """
+        timestamp_ns = time.monotonic_ns()
         key_str = self._normalize_key(key)
-        self.on_event(KeyboardEvent(key=key_str, press=True))
+        self.on_event(KeyboardEvent(key=key_str, press=True, timestamp_ns=timestamp_ns))
 
     def _on_release(self, key: Any) -> None:
         """
         Internal handler for key release events.
         """
+        timestamp_ns = time.monotonic_ns()
         key_str = self._normalize_key(key)
-        self.on_event(KeyboardEvent(key=key_str, press=False))
+        self.on_event(KeyboardEvent(key=key_str, press=False, timestamp_ns=timestamp_ns))
 
     def _normalize_key(self, key: Any) -> str:
         """
@@ -1,4 +1,5 @@
 from typing import Callable, Optional
+import time
 from pynput import mouse
 from ...models.inputs import MouseEvent, MouseClickEvent, MouseMoveEvent
 
@@ -20,11 +21,11 @@ class MouseListener:
 
     # -------------- Mouse Move --------------
     def _on_move(self, x: int, y: int) -> None:
-        self.on_event(MouseMoveEvent(x=x, y=y))
+        self.on_event(MouseMoveEvent(x=x, y=y, timestamp_ns=time.monotonic_ns()))
 
     # -------------- Mouse Click --------------
     def _on_click(self, x: int, y: int, button: mouse.Button, press: bool) -> None:
-        self.on_event(MouseClickEvent(x=x, y=y,position=button.name, press=press))
+        self.on_event(MouseClickEvent(x=x, y=y, position=button.name, press=press, timestamp_ns=time.monotonic_ns()))
 
     # -------------- Start Listener --------------
     def start(self) -> None:
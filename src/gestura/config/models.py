@@ -1,13 +1,21 @@
 # 100/100
 
-from typing import Callable
+from typing import Callable, Optional
 from dataclasses import dataclass, field
 import time
 
 from ..models.keyboard import GestureKeyboardCondition
 from ..models.mouse import GestureMouseCondition
 from ..models.policy import PolicyEngineProtocol, ActionEvent
+from ..models.combine import CombineRule
+from ..models.queues import QueueLimit
 from ..config.parser import WorkerGestureMap
+from ..input.tracing import GestureTracer
+from ..input.keyboard.keycodes import KeyTable
+from ..input.keyboard.index import KeyboardIndex
+from ..input.mouse.trie import GestureTrie
+from ..input.keyboard.hold import TimerScheduler
+from ..input.keyboard.repeat import RepeatPolicy
 
 
 # ===== Models =====
@@ -25,6 +33,34 @@ class KeyboardConfig:
             Example:
                 [{"conditions": ["ctrl", "a"], "callback": "some_name"}]
 
+        key_table (KeyTable | None):
+            key name <-> int code table (built from gestures when None)
+
+        HeldKeyExpirySeconds (float):
+            a key held this long without a new press (auto-repeat) is
+            considered released (guards against missed releases)
+
+        AutoRepeatPolicy ("pass" | "drop" | "collapse"):
+            what to do with OS auto-repeat presses of a held key:
+            pass them on as presses, drop them, or collapse them into the
+            original press (kept alive in the time window while held).
+            Default "pass": a held key keeps re-firing single-key and
+            repeated-key sequences, as before repeats were recognized.
+            "drop" / "collapse" rely on AutoRepeatIntervalSeconds alone to
+            end a repeat whose release was missed
+
+        AutoRepeatIntervalSeconds (float):
+            max time between two presses of the same key (without release)
+            for the second one to count as auto-repeat
+
+        scheduler (TimerScheduler | None):
+            deadline scheduler of the detection thread; required by
+            "hold" gestures (the engine passes its TimerHeap)
+
+        index (KeyboardIndex | None):
+            prebuilt read-only matching tables of `gestures` (built from
+            gestures / key_table when None); shared by every app using it
+
     ===== Usage Example =====:
         config = KeyboardConfig(
             gestures=[
@@ -38,6 +74,13 @@ class KeyboardConfig:
     gestures: list[GestureKeyboardCondition] = field(default_factory=list)
     on_trigger: Callable[[list[str]], None] = lambda _: None
     BufferWindowSeconds: float = 1.5
+    tracer: Optional[GestureTracer] = None
+    key_table: Optional[KeyTable] = None
+    HeldKeyExpirySeconds: float = 10.0
+    scheduler: Optional[TimerScheduler] = None
+    AutoRepeatPolicy: RepeatPolicy = "pass"
+    AutoRepeatIntervalSeconds: float = 1.0
+    index: Optional[KeyboardIndex] = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -57,6 +100,17 @@ class MouseConfig:
         min_delta (float):
             minimum delta to keep a segment (final filter)
 
+        BufferCapacity (int):
+            maximum number of moves kept in the window (oldest overwritten);
+            the buffer grows up to it only as far as the window needs
+
+        tracer (GestureTracer | None):
+            optional observer of segment / reversal / match decisions
+
+        trie (GestureTrie | None):
+            prebuilt read-only index of `gestures` (built from gestures
+            when None); shared by every app using it
+
     ===== Usage Example =====:
         config = MouseConfig(
             gestures=[
@@ -72,7 +126,10 @@ class MouseConfig:
     gestures: list[GestureMouseCondition] = field(default_factory=list)
     on_trigger: Callable[[list[str]], None] = lambda _: None
     BufferWindowSeconds: float = 4.0
+    BufferCapacity: int = 8192
     min_delta: float = 10.0
+    tracer: Optional[GestureTracer] = None
+    trie: Optional[GestureTrie] = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -82,3 +139,20 @@ class ShortcutConfig:
     worker_map: WorkerGestureMap
     combined_window_seconds: float = 4.0
     func_now: Callable[[], float] = time.monotonic
+
+    # callback -> dense int id (parse_shortcut_config); when None the
+    # worker takes the policy engine's ids and numbers the rest itself
+    callback_ids: Optional[dict[str, int]] = None
+
+    # combo callback -> window / order; combos without a rule pair in
+    # either order within combined_window_seconds
+    combine_rules: Optional[dict[str, CombineRule]] = None
+
+    # Trigger queue (detection thread -> worker) limits per source
+    keyboard_queue: QueueLimit = QueueLimit()
+    mouse_queue: QueueLimit = QueueLimit()
+
+    # Triggers older than this (seconds since capture) when the worker
+    # reaches them are dropped as late; per callback, else global
+    max_trigger_age: Optional[float] = None
+    max_trigger_ages: Optional[dict[str, float]] = None
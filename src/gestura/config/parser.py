@@ -6,11 +6,13 @@ tests:
 """
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, get_args
 
 from ..models.keyboard import GestureKeyboardCondition
 from ..models.mouse import GestureMouseCondition
 from ..models.policy import CallbackPolicy
+from ..models.combine import CombineOrder, CombineRule
+from ..input.keyboard.keycodes import KeyTable
 
 
 @dataclass(frozen=True, slots=True)
@@ -29,6 +31,18 @@ class ShortcutConfigBundle:
     # For policy engine
     policies: dict[str, CallbackPolicy]
 
+    # Key name <-> int code for every key used by keyboard gestures
+    key_table: KeyTable
+
+    # callback -> dense int id (worker dispatch / policy state index)
+    callback_ids: dict[str, int]
+
+    # combo callback -> pairing window / order
+    combine_rules: dict[str, CombineRule]
+
+    # callback -> max age (seconds since capture) of its triggers
+    max_trigger_ages: dict[str, float]
+
 
 # -------------------------
 # Worker Map
@@ -66,6 +80,54 @@ def _build_worker_map(_GesturesMap: GesturesMap) -> WorkerGestureMap:
     )
 
 
+# -------------------------
+# Combine Rules
+# -------------------------
+
+def _build_combine_rules(config: list[dict[str, Any]], worker_map: WorkerGestureMap) -> dict[str, CombineRule]:
+    """
+    Build combo callback → pairing rule (window / order).
+    """
+
+    rules: dict[str, CombineRule] = {}
+
+    for item in config:
+        callback = item["callback"]
+        if callback not in worker_map.combo:
+            continue
+
+        combine_cfg = item.get("combine", {})
+
+        order = combine_cfg.get("order", "either")
+        if order not in get_args(CombineOrder):
+            raise ValueError(f"combine order {order!r} for {callback!r} is not one of {get_args(CombineOrder)}")
+
+        window_seconds = combine_cfg.get("window_seconds")
+        if window_seconds is not None and window_seconds < 0:
+            raise ValueError(f"combine window_seconds for {callback!r} must be >= 0")
+
+        rules[callback] = CombineRule(window_seconds=window_seconds, order=order)
+
+    return rules
+
+
+# -------------------------
+# Callback IDs
+# -------------------------
+
+def _build_callback_ids(config: list[dict[str, Any]]) -> dict[str, int]:
+    """
+    Dense ids in order of first appearance (same order as the policy map).
+    """
+
+    callback_ids: dict[str, int] = {}
+
+    for item in config:
+        callback_ids.setdefault(item["callback"], len(callback_ids))
+
+    return callback_ids
+
+
 # -------------------------
 # Policy Builder
 # -------------------------
@@ -91,6 +153,26 @@ def _build_policy_map(config: list[dict[str, Any]]) -> dict[str, CallbackPolicy]
     return policy_map
 
 
+def _build_trigger_ages(config: list[dict[str, Any]]) -> dict[str, float]:
+    """
+    Build callback → max trigger age (only callbacks that set one).
+    """
+
+    ages: dict[str, float] = {}
+
+    for item in config:
+        max_age = item.get("policy", {}).get("max_trigger_age")
+        if max_age is None:
+            continue
+
+        if max_age <= 0:
+            raise ValueError(f"max_trigger_age for {item['callback']!r} must be > 0")
+
+        ages[item["callback"]] = max_age
+
+    return ages
+
+
 # -------------------------
 # Public Parser
 # -------------------------
@@ -105,13 +187,17 @@ def _buil_gesters_map(config: list[dict[str, Any]]) -> GesturesMap:
     for item in config:
         callback = item["callback"]
 
-        keyboard_conditions = item.get("keyboard", {}).get("conditions", [])
+        keyboard_cfg = item.get("keyboard", {})
+        keyboard_conditions = keyboard_cfg.get("conditions", [])
         mouse_conditions = item.get("mouse", {}).get("conditions", [])
 
         if keyboard_conditions:
             keyboard_list.append(
                 GestureKeyboardCondition(
                     conditions=keyboard_conditions,
+                    mode=keyboard_cfg.get("mode", "sequence"),
+                    hold_seconds=keyboard_cfg.get("hold_seconds", 0.0),
+                    max_gap=keyboard_cfg.get("max_gap", 0),
                     callback=callback
                 )
             )
@@ -144,5 +230,9 @@ def parse_shortcut_config(config: list[dict[str, Any]]) -> ShortcutConfigBundle:
         keyboard_gestures=_gesters_map.keyboard_gestures,
         mouse_gestures=_gesters_map.mouse_gestures,
         worker_map=worker_map,
-        policies=policy_map
+        policies=policy_map,
+        key_table=KeyTable.from_gestures(_gesters_map.keyboard_gestures),
+        callback_ids=_build_callback_ids(config),
+        combine_rules=_build_combine_rules(config, worker_map),
+        max_trigger_ages=_build_trigger_ages(config)
     )
@@ -0,0 +1,226 @@
+"""
+tests:
+    test_AsyncGesturaEngine.py
+"""
+
+from types import TracebackType
+from typing import Any, AsyncIterator, Optional, Type
+from collections import deque
+import asyncio
+import logging
+import threading
+
+from gestura.adapters import KeyboardListenerType, MouseListenerType
+from gestura.adapters.pynput_adapters import KeyboardListener, MouseListener
+from gestura.engine.engine import GesturaEngine
+from gestura.models.policy import ActionEvent
+from gestura.models.queues import QueueLimits, QueueStats
+from gestura.input.tracing import GestureTracer
+
+
+class AsyncGesturaEngine:
+    """
+    asyncio facade over GesturaEngine.
+
+    Actions published by the worker thread are collected in a list; the
+    first action of a batch schedules one `call_soon_threadsafe` flush,
+    and every action published before that flush runs rides along with
+    it. The loop wakes once per batch, not once per action.
+
+    Usage:
+        async with AsyncGesturaEngine(config) as engine:
+            async for action in engine.actions():
+                ...
+
+    `actions()` ends once the engine is stopped and everything published
+    before the stop has been yielded. Meant for a single consumer.
+
+    queue_limits.actions bounds the actions published but not yet
+    yielded: "block" (default) stalls the worker thread until the
+    consumer catches up, "drop_newest" discards the new action. The
+    other limits go to the GesturaEngine.
+    """
+
+    def __init__(
+        self,
+        config: list[dict[str, Any]],
+
+        # OS listener factories (DI entry point)
+        keyboard_listener_factory: KeyboardListenerType = KeyboardListener,
+        mouse_listener_factory: MouseListenerType = MouseListener,
+
+        # Optional detection tracer (debugging / visualization)
+        tracer: Optional[GestureTracer] = None,
+
+        # Capacity / overload policy of the internal queues (unbounded by default)
+        queue_limits: Optional[QueueLimits] = None,
+
+        # Drop triggers older than this (seconds since capture) instead of
+        # firing them late; per callback with policy.max_trigger_age
+        max_trigger_age: Optional[float] = None,
+    ) -> None:
+
+        self._engine = GesturaEngine(
+            config,
+            self._publish,
+            keyboard_listener_factory=keyboard_listener_factory,
+            mouse_listener_factory=mouse_listener_factory,
+            tracer=tracer,
+            queue_limits=queue_limits,
+            max_trigger_age=max_trigger_age,
+        )
+
+        limit = (queue_limits if queue_limits is not None else QueueLimits()).actions
+        self._capacity: Optional[int] = limit.capacity
+        self._block: bool = limit.resolve("block", ("block", "drop_newest")) == "block"
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Worker thread side (guarded by _lock)
+        self._lock = threading.Lock()
+        self._pending: list[ActionEvent] = []
+        self._scheduled: bool = False
+
+        # Bounded only: actions not yet yielded, and who waits for room
+        self._backlog: int = 0
+        self._not_full = threading.Condition(self._lock)
+        self._stopping: bool = False
+        self._dropped: int = 0
+
+        # Loop side
+        self._ready: deque[ActionEvent] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed: bool = True
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+
+    async def start(self) -> None:
+        if not self._closed:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._stopping = False
+
+        self._engine.start()
+
+    async def stop(self) -> None:
+        """
+        Stop the engine (off the loop, it joins threads), then deliver
+        what was published before the stop and end `actions()`.
+        """
+
+        if self._closed:
+            return
+
+        # a blocked worker thread must not hold up the stop
+        with self._lock:
+            self._stopping = True
+            self._not_full.notify_all()
+
+        await asyncio.get_running_loop().run_in_executor(None, self._engine.stop)
+
+        self._flush()
+        self._closed = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ---------------------------------------------------------
+    # Consumer API
+    # ---------------------------------------------------------
+
+    async def actions(self) -> AsyncIterator[ActionEvent]:
+        if self._wakeup is None:
+            raise RuntimeError("AsyncGesturaEngine is not started")
+
+        ready, wakeup = self._ready, self._wakeup
+        bounded = self._capacity is not None
+
+        while True:
+            while ready:
+                action = ready.popleft()
+                if bounded:
+                    with self._lock:
+                        self._backlog -= 1
+                        self._not_full.notify()
+                yield action
+
+            if self._closed:
+                return
+
+            wakeup.clear()
+            await wakeup.wait()
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        GesturaEngine.queue_stats(), plus "actions" when bounded.
+        """
+
+        stats = self._engine.queue_stats()
+        if self._capacity is not None:
+            stats["actions"] = QueueStats(dropped=self._dropped)
+        return stats
+
+    # ---------------------------------------------------------
+    # Thread -> loop handoff
+    # ---------------------------------------------------------
+
+    def _publish(self, action: ActionEvent) -> None:
+        """
+        Runs on the worker thread.
+        """
+
+        with self._lock:
+            capacity = self._capacity
+            if capacity is not None:
+                while self._backlog >= capacity and not self._stopping:
+                    if not self._block:
+                        if not self._dropped:
+                            logging.warning("[AsyncGesturaEngine] actions queue full: actions are being dropped")
+                        self._dropped += 1
+                        return
+                    self._not_full.wait()
+                self._backlog += 1
+
+            self._pending.append(action)
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        """
+        Runs on the loop: move the whole pending batch in one go.
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._scheduled = False
+
+        if not pending:
+            return
+
+        self._ready.extend(pending)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ---------------------------------------------------------
+    # Async Context Manager Support
+    # ---------------------------------------------------------
+
+    async def __aenter__(self) -> "AsyncGesturaEngine":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        await self.stop()
@@ -0,0 +1,164 @@
+"""
+tests:
+    test_TriggerChannel.py
+"""
+
+from collections import deque
+from dataclasses import replace
+from typing import Deque, Optional
+import logging, threading
+
+from ..models.queues import POLICIES, QueueLimit, QueueStats
+
+
+# (source, callbacks, timestamp): every callback one input event produced
+TriggerBatch = tuple[str, list[str], float]
+
+
+class TriggerChannel:
+    """
+    Detection thread -> ShortcutWorker handoff.
+
+    - Empty submissions return before touching the lock
+    - One append + notify per input event (not per callback)
+    - The consumer takes everything pending in one wakeup (deque swap)
+
+    Optional per-source limits (QueueLimit): once `capacity` batches of a
+    source are pending, its policy applies to the next batch of that
+    source; other sources are unaffected. Lost callbacks are counted
+    (stats()) and the first loss per source is logged.
+
+    close() lets the consumer finish what is pending, then drain()
+    returns None.
+    """
+
+    def __init__(self, limits: Optional[dict[str, QueueLimit]] = None) -> None:
+        self._items: Deque[TriggerBatch] = deque()
+        lock = threading.Lock()
+        self._cond = threading.Condition(lock)
+        self._closed: bool = False
+
+        # Bounded sources only (policy resolved); unbounded ones skip all accounting
+        self._limits: dict[str, QueueLimit] = {
+            source: replace(limit, policy=limit.resolve("block", POLICIES))
+            for source, limit in (limits or {}).items() if limit.capacity is not None
+        }
+        self._counts: dict[str, int] = dict.fromkeys(self._limits, 0)
+        self._not_full = threading.Condition(lock)
+
+        # (source, callback) pending for coalescing sources
+        self._pending_keys: set[tuple[str, str]] = set()
+
+        self._dropped: dict[str, int] = dict.fromkeys(self._limits, 0)
+        self._coalesced: dict[str, int] = dict.fromkeys(self._limits, 0)
+
+    def put(self, source: str, callbacks: list[str], timestamp: float) -> None:
+        if not callbacks:
+            return
+
+        limit = self._limits.get(source)
+
+        with self._cond:
+            if limit is not None:
+                admitted = self._admit(source, limit, callbacks)
+                if admitted is None:
+                    return
+                callbacks = admitted
+
+            self._items.append((source, callbacks, timestamp))
+            self._cond.notify()
+
+    def _admit(self, source: str, limit: QueueLimit, callbacks: list[str]) -> Optional[list[str]]:
+        """
+        Apply the source's limit (lock held). The callbacks to enqueue,
+        or None when the batch is discarded.
+        """
+
+        policy = limit.policy
+
+        if self._counts[source] >= limit.capacity:  # type: ignore[operator]
+            if policy == "drop_newest":
+                self._lose(self._dropped, "dropped", source, len(callbacks))
+                return None
+
+            if policy == "drop_oldest":
+                self._evict_oldest(source)
+
+            elif policy == "block":
+                while self._counts[source] >= limit.capacity and not self._closed:  # type: ignore[operator]
+                    self._not_full.wait()
+
+            else:  # coalesce: capacity may be exceeded by distinct callbacks only
+                fresh = [cb for cb in callbacks if (source, cb) not in self._pending_keys]
+                if len(fresh) < len(callbacks):
+                    self._lose(self._coalesced, "coalesced", source, len(callbacks) - len(fresh))
+                if not fresh:
+                    return None
+                callbacks = fresh
+
+        if policy == "coalesce":
+            self._pending_keys.update((source, cb) for cb in callbacks)
+
+        self._counts[source] += 1
+        return callbacks
+
+    def _evict_oldest(self, source: str) -> None:
+        items = self._items
+        for index, (item_source, callbacks, _) in enumerate(items):
+            if item_source == source:
+                del items[index]
+                self._counts[source] -= 1
+                self._lose(self._dropped, "dropped", source, len(callbacks))
+                return
+
+    def _lose(self, counter: dict[str, int], kind: str, source: str, count: int) -> None:
+        if not counter[source]:
+            logging.warning(f"[TriggerChannel] {source} queue full: triggers are being {kind}")
+        counter[source] += count
+
+    def drain(self) -> Optional[Deque[TriggerBatch]]:
+        """
+        Block until something is pending; return all of it.
+        None once closed and empty.
+        """
+
+        with self._cond:
+            while not self._items:
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            items = self._items
+            self._items = deque()
+
+            if self._limits:
+                for source in self._counts:
+                    self._counts[source] = 0
+                self._pending_keys.clear()
+                self._not_full.notify_all()
+
+            return items
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            self._not_full.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+    def stats(self) -> dict[str, QueueStats]:
+        """Losses per bounded source."""
+
+        with self._cond:
+            return {
+                source: QueueStats(dropped=self._dropped[source], coalesced=self._coalesced[source])
+                for source in self._limits
+            }
+
+    def __len__(self) -> int:
+        """Pending batches."""
+
+        return len(self._items)
@@ -1,5 +1,5 @@
 from types import TracebackType
-from typing import Callable, Any, Type
+from typing import Callable, Any, Optional, Type
 
 from gestura.adapters import (
     Listener, KeyboardListenerType, MouseListenerType
@@ -23,9 +23,13 @@ from gestura.config.parser import parse_shortcut_config
 from gestura.config.models import ShortcutConfig
 from gestura.policy.engine import PolicyEngine
 from gestura.engine.worker import ShortcutWorker
+from gestura.engine.input_worker import InputWorker
+from gestura.engine.timers import TimerHeap
 from gestura.models.policy import ActionEvent
+from gestura.models.queues import QueueLimits, QueueStats
 from gestura.input.keyboard.handler import KeyboardApp
 from gestura.input.mouse.handler import MouseApp
+from gestura.input.tracing import GestureTracer
 
 
 class GesturaEngine:
@@ -36,7 +40,7 @@ class GesturaEngine:
     - Parse user config
     - Wire policy engine
     - Wire worker
-    - Connect OS listeners to input apps
+    - Connect OS listeners to input apps (through one detection thread)
     - Manage lifecycle of owned listeners
     """
 
@@ -47,14 +51,28 @@ class GesturaEngine:
 
         # OS listener factories (DI entry point)
         keyboard_listener_factory: KeyboardListenerType = KeyboardListener,
-        mouse_listener_factory: MouseListenerType = MouseListener
+        mouse_listener_factory: MouseListenerType = MouseListener,
+
+        # Optional detection tracer (debugging / visualization)
+        tracer: Optional[GestureTracer] = None,
+
+        # Capacity / overload policy of the internal queues (unbounded by default)
+        queue_limits: Optional[QueueLimits] = None,
+
+        # Drop triggers older than this (seconds since capture) instead of
+        # firing them late; per callback with policy.max_trigger_age
+        max_trigger_age: Optional[float] = None
     ) -> None:
 
+        if max_trigger_age is not None and max_trigger_age <= 0:
+            raise ValueError("max_trigger_age must be > 0")
+
         # -------------------------------
         # Parse configuration
         # -------------------------------
         self._bundle = parse_shortcut_config(config)
         self._publish_action = publish_action
+        limits = queue_limits if queue_limits is not None else QueueLimits()
 
         # -------------------------------
         # Setup core components
@@ -62,42 +80,76 @@ class GesturaEngine:
         # Worker
         self._worker = ShortcutWorker(
             ShortcutConfig(
-                policy_engine=PolicyEngine(self._bundle.policies),
+                policy_engine=PolicyEngine(self._bundle.policies, self._bundle.callback_ids),
                 publish_action=self._publish_action,
                 worker_map=self._bundle.worker_map,
-                combined_window_seconds=4.0)
+                callback_ids=self._bundle.callback_ids,
+                combine_rules=self._bundle.combine_rules,
+                combined_window_seconds=4.0,
+                keyboard_queue=limits.keyboard_triggers,
+                mouse_queue=limits.mouse_triggers,
+                max_trigger_age=max_trigger_age,
+                max_trigger_ages=self._bundle.max_trigger_ages)
         )
 
+        # Deadlines (hold gestures), driven by the detection thread
+        self._timers = TimerHeap()
+
         # Keyboard
         self._keyboard_app = KeyboardApp(
             KeyboardConfig(
                 gestures=self._bundle.keyboard_gestures,
-                on_trigger=self._worker.submit_keyboard_triggers,
-                BufferWindowSeconds=1.5)
+                on_trigger=self._submit_keyboard_triggers,
+                BufferWindowSeconds=1.5,
+                tracer=tracer,
+                key_table=self._bundle.key_table,
+                scheduler=self._timers)
         )
 
         # Mouse
         self._mouse_app = MouseApp(
             MouseConfig(
                 gestures=self._bundle.mouse_gestures,
-                on_trigger=self._worker.submit_mouse_triggers,
+                on_trigger=self._submit_mouse_triggers,
                 BufferWindowSeconds=4.0,
-                min_delta=8.0)
+                min_delta=8.0,
+                tracer=tracer)
+        )
+
+        # Detection thread (listeners only enqueue)
+        self._input_worker = InputWorker(
+            keyboard_handler=self._keyboard_app.HandleEvens,
+            mouse_handler=self._mouse_app.HandleEvens,
+            timers=self._timers,
+            keyboard_limit=limits.keyboard_input,
+            mouse_limit=limits.mouse_input
         )
 
         # -------------------------------
         # Create OS listeners (engine owns them)
         # -------------------------------
         self._keyboard_listener: Listener = keyboard_listener_factory(
-            on_event=self._keyboard_app.HandleEvens
+            on_event=self._input_worker.submit_keyboard
         )
 
         self._mouse_listener: Listener = mouse_listener_factory(
-            on_event=self._mouse_app.HandleEvens
+            on_event=self._input_worker.submit_mouse
         )
 
         self._running = False
 
+    # ---------------------------------------------------------
+    # Detection -> worker (stamped with the input's capture time)
+    # ---------------------------------------------------------
+
+    def _submit_keyboard_triggers(self, callbacks: list[str]) -> None:
+        if callbacks:
+            self._worker.submit_keyboard_triggers(callbacks, self._input_worker.current_timestamp)
+
+    def _submit_mouse_triggers(self, callbacks: list[str]) -> None:
+        if callbacks:
+            self._worker.submit_mouse_triggers(callbacks, self._input_worker.current_timestamp)
+
     # ---------------------------------------------------------
     # Lifecycle
     # ---------------------------------------------------------
@@ -107,6 +159,7 @@ class GesturaEngine:
             return
 
         self._worker.start()
+        self._input_worker.start()
         self._keyboard_listener.start()
         self._mouse_listener.start()
 
@@ -118,10 +171,34 @@ class GesturaEngine:
 
         self._keyboard_listener.stop()
         self._mouse_listener.stop()
+
+        # The detection thread submits triggers until it exits: the trigger
+        # channel is closed only after that
+        self._input_worker.stop(timeout=None)
         self._worker.stop()
 
         self._running = False
 
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        Losses of every bounded queue: keyboard_input, mouse_input,
+        keyboard_triggers, mouse_triggers (unbounded ones are omitted).
+        """
+
+        stats: dict[str, QueueStats] = {}
+        for source, queue_stats in self._input_worker.queue_stats().items():
+            stats[f"{source}_input"] = queue_stats
+        for source, queue_stats in self._worker.queue_stats().items():
+            stats[f"{source}_triggers"] = queue_stats
+        return stats
+
+    def late_triggers(self) -> dict[str, int]:
+        """
+        Triggers dropped per source for exceeding their max_trigger_age.
+        """
+
+        return self._worker.late_triggers()
+
     # ---------------------------------------------------------
     # Context Manager Support
     # ---------------------------------------------------------
@@ -0,0 +1,276 @@
+"""
+tests:
+    test_InputWorker.py
+"""
+
+from typing import Any, Callable, Optional
+import logging, threading, queue, time
+
+from ..models.inputs import KeyboardEvent, MouseEvent, capture_time
+from ..models.queues import QueueLimit, QueueStats
+from .timers import TimerHeap
+
+
+# (handler, timestamp, event, slot to release once taken)
+_Item = tuple[Callable[[Any, Optional[float]], None], float, Any, Optional["_Slot"]]
+
+_STOP: Any = object()
+
+
+class _Slot:
+    """
+    Capacity of one bounded input source (a semaphore per pending event).
+    """
+
+    __slots__ = ("_semaphore", "_block", "dropped")
+
+    def __init__(self, capacity: int, block: bool) -> None:
+        self._semaphore = threading.BoundedSemaphore(capacity)
+        self._block = block
+        self.dropped: int = 0
+
+    def acquire(self, source: str) -> bool:
+        """Hook thread: False when the event is dropped."""
+
+        if self._semaphore.acquire(blocking=self._block):
+            return True
+
+        if not self.dropped:
+            logging.warning(f"[InputWorker] {source} queue full: events are being dropped")
+        self.dropped += 1
+        return False
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class InputWorker:
+    """
+    Single detection thread fed by the OS listener callbacks.
+
+    Listener (hook) threads only stamp and enqueue raw events.
+    Keyboard and mouse events share one queue, so the detection thread
+    sees them as a single timeline in arrival order, and all
+    normalization, buffering and gesture detection runs here.
+
+    Handlers receive (event, timestamp), where timestamp is the capture
+    time: the adapter's timestamp_ns when the event carries one, else
+    taken on the hook thread.
+
+    Timers (hold gestures) live in a TimerHeap owned by this thread.
+    The queue wait is bounded by the next deadline only, and before each
+    event every timer due at its capture time runs first, so deadlines and
+    events interleave in capture-time order.
+    """
+
+    # ------------------------------------------------------------------
+    # Initialization
+    # ------------------------------------------------------------------
+
+    def __init__(
+        self,
+        keyboard_handler: Callable[[KeyboardEvent, Optional[float]], None],
+        mouse_handler: Callable[[MouseEvent, Optional[float]], None],
+        func_now: Callable[[], float] = time.monotonic,
+        batch_size: int = 256,
+        timers: Optional[TimerHeap] = None,
+        keyboard_limit: QueueLimit = QueueLimit(),
+        mouse_limit: QueueLimit = QueueLimit(),
+    ) -> None:
+        """
+        Args:
+            keyboard_limit / mouse_limit: pending events per source;
+                "drop_newest" (default) or "block" (raw events carry no
+                callback to coalesce, and the queue head belongs to the
+                consumer). "block" stalls the producer: only for
+                producers that may wait, never an OS hook thread
+        """
+
+        self._keyboard_handler = keyboard_handler
+        self._mouse_handler = mouse_handler
+        self.func_now = func_now
+        self._batch_size = batch_size
+
+        # Bounded sources: a slot per pending event, released once taken
+        self._keyboard_slot = self._make_slot(keyboard_limit)
+        self._mouse_slot = self._make_slot(mouse_limit)
+        self._slots: dict[str, Optional[_Slot]] = {"keyboard": self._keyboard_slot, "mouse": self._mouse_slot}
+
+        # Capture time of the event (or timer wakeup) being handled; lets
+        # downstream stages stamp their output with the input's time.
+        # None outside the loop: callers fall back to now
+        self.current_timestamp: Optional[float] = None
+
+        # Deadlines are on the func_now clock (same as event timestamps)
+        self.timers: TimerHeap = timers if timers is not None else TimerHeap()
+
+        self._queue: queue.SimpleQueue[_Item] = queue.SimpleQueue()
+
+        self._running: bool = False
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _make_slot(limit: QueueLimit) -> Optional["_Slot"]:
+        if limit.capacity is None:
+            return None
+
+        return _Slot(limit.capacity, limit.resolve("drop_newest", ("drop_newest", "block")) == "block")
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        Events dropped per bounded source.
+        """
+
+        stats: dict[str, QueueStats] = {}
+        for source, slot in (("keyboard", self._keyboard_slot), ("mouse", self._mouse_slot)):
+            if slot is not None:
+                stats[source] = QueueStats(dropped=slot.dropped)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        # a previous stop() timed out: that thread still owns the backlog
+        # up to its stop marker
+        if self._thread is not None:
+            self._thread.join()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """
+        Process everything enqueued so far, then exit the thread.
+        Events submitted after this call stay queued (holding their
+        slots) for the next start().
+
+        Args:
+            timeout: max wait for the backlog; None waits until drained
+                (the thread may still be running when a timeout expires,
+                see is_alive())
+        """
+
+        if not self._running:
+            return
+
+        self._running = False
+        self._queue.put(_STOP)
+
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logging.warning("[InputWorker] Backlog not drained in time: the thread is still running")
+
+    def is_alive(self) -> bool:
+        """True while the detection thread runs (also after a stop() timeout)."""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Public API (hook threads)
+    # ------------------------------------------------------------------
+
+    def submit_keyboard(self, event: KeyboardEvent) -> None:
+        slot = self._keyboard_slot
+        if slot is not None and not slot.acquire("keyboard"):
+            return
+        self._queue.put((self._keyboard_handler, self._stamp(event), event, slot))
+
+    def submit_mouse(self, event: MouseEvent) -> None:
+        slot = self._mouse_slot
+        if slot is not None and not slot.acquire("mouse"):
+            return
+        self._queue.put((self._mouse_handler, self._stamp(event), event, slot))
+
+    def submit(
+        self,
+        handler: Callable[[Any, Optional[float]], None],
+        event: Any,
+        timestamp: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Enqueue an event for an explicit handler (one detection thread
+        serving several owners, e.g. MultiSessionEngine sessions).
+
+        Args:
+            timestamp: capture time when taken elsewhere (func_now clock);
+                defaults to the event's timestamp_ns, then to now
+            source: "keyboard" | "mouse" to count the event against that
+                source's limit; None for control items, which are never
+                dropped
+        """
+
+        slot = None if source is None else self._slots[source]
+        if slot is not None and not slot.acquire(source):  # type: ignore[arg-type]
+            return
+
+        if timestamp is None:
+            timestamp = self._stamp(event)
+        self._queue.put((handler, timestamp, event, slot))
+
+    def _stamp(self, event: Any) -> float:
+        """
+        The adapter's capture time when the event carries one, else now.
+        Adapters stamp with time.monotonic_ns(), so a custom func_now
+        must be the same clock for the two to mix.
+        """
+
+        timestamp = capture_time(event)
+        return self.func_now() if timestamp is None else timestamp
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def _loop(self) -> None:
+        """
+        Block for one event (or until the next deadline), then drain
+        whatever else is already queued.
+        """
+
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        timers = self.timers
+
+        while True:
+            try:
+                batch = [get(timeout=timers.timeout(self.func_now()))]
+            except queue.Empty:
+                now = self.func_now()
+                self.current_timestamp = now
+                timers.run_due(now)
+                self.current_timestamp = None
+                continue
+
+            # nothing past the stop marker is taken: it is left queued for
+            # the next start(), with its slot
+            try:
+                while len(batch) < self._batch_size and batch[-1] is not _STOP:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+
+            for item in batch:
+                if item is _STOP:
+                    timers.clear()
+                    return
+
+                handler, timestamp, event, slot = item
+                self.current_timestamp = timestamp
+                if slot is not None:
+                    slot.release()
+
+                timers.run_due(timestamp)
+                try:
+                    handler(event, timestamp)
+                except Exception:
+                    logging.exception(f"[InputWorker] Error handling event: {event}")
+
+            self.current_timestamp = None
@@ -0,0 +1,343 @@
+"""
+tests:
+    test_MultiSessionEngine.py
+"""
+
+from dataclasses import replace
+from functools import partial
+from types import TracebackType
+from typing import Any, Callable, Hashable, Optional, Type
+import threading, time
+
+from gestura.config import ShortcutConfig, MouseConfig, KeyboardConfig
+from gestura.config.parser import parse_shortcut_config
+from gestura.policy.engine import PolicyEngine
+from gestura.engine.worker import DispatchTable, ShortcutWorker
+from gestura.engine.input_worker import InputWorker
+from gestura.models.inputs import KeyboardEvent, MouseEvent
+from gestura.models.policy import ActionEvent
+from gestura.models.queues import QueueLimits, QueueStats
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.input.keyboard.index import KeyboardIndex
+from gestura.input.mouse.handler import MouseApp
+from gestura.input.mouse.trie import GestureTrie
+from gestura.input.tracing import GestureTracer
+
+
+SessionId = Hashable
+
+
+def _unrouted(event: Any, timestamp: Optional[float]) -> None:
+    """Pool threads only receive events through InputWorker.submit()."""
+
+
+class _Session:
+    """
+    Mutable state of one input stream; only touched by its pool thread.
+    """
+
+    __slots__ = ("keyboard", "mouse", "worker", "input_worker")
+
+    def __init__(
+        self,
+        keyboard: KeyboardApp,
+        mouse: MouseApp,
+        worker: ShortcutWorker,
+        input_worker: InputWorker,
+    ) -> None:
+        self.keyboard = keyboard
+        self.mouse = mouse
+        self.worker = worker
+        self.input_worker = input_worker
+
+
+class MultiSessionEngine:
+    """
+    One engine serving many independent input streams, keyed by session id.
+
+    Compiled once and shared read-only by every session:
+    - the parsed config (gesture models, KeyTable, callback ids, policies,
+      combine rules)
+    - the matcher indexes: KeyboardIndex (automaton, Shift-And masks,
+      chord / hold masks) and the mouse GestureTrie
+    - the worker DispatchTable
+
+    Per session (created on its first event):
+    - KeyboardApp / MouseApp (buffers, matcher cursors, occurrence filters)
+    - PolicyEngine state
+    - a threadless ShortcutWorker (combo state)
+
+    A fixed pool of detection threads (InputWorker) serves all sessions.
+    A session is routed to hash(session_id) % workers, so its events stay
+    ordered on one thread and its state is only touched there; hold
+    gestures use the TimerHeap of that thread.
+
+    publish_action(session_id, action) is called from the pool threads.
+
+    queue_limits: keyboard_input / mouse_input bound the queue of every
+    pool thread (shared by its sessions); triggers are handled inline by
+    the session's worker, so the trigger limits do not apply.
+
+    Each session's move buffer is capped at MOVE_BUFFER_CAPACITY moves
+    (its columns grow from a small start only as far as the window needs).
+    """
+
+    # Per-session MouseConfig.BufferCapacity (about 128 KB at the cap)
+    MOVE_BUFFER_CAPACITY = 2048
+
+    def __init__(
+        self,
+        config: list[dict[str, Any]],
+        publish_action: Callable[[SessionId, ActionEvent], None],
+        workers: int = 4,
+
+        # Optional detection tracer, shared by every session
+        tracer: Optional[GestureTracer] = None,
+        func_now: Callable[[], float] = time.monotonic,
+
+        # Capacity / overload policy of the pool queues (unbounded by default)
+        queue_limits: Optional[QueueLimits] = None,
+
+        # Drop triggers older than this (seconds since capture) instead of
+        # firing them late; per callback with policy.max_trigger_age
+        max_trigger_age: Optional[float] = None,
+    ) -> None:
+
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if max_trigger_age is not None and max_trigger_age <= 0:
+            raise ValueError("max_trigger_age must be > 0")
+
+        # -------------------------------
+        # Compile configuration (once)
+        # -------------------------------
+        self._bundle = parse_shortcut_config(config)
+        self._publish_action = publish_action
+        self._tracer = tracer
+        self.func_now = func_now
+
+        # Per-session ShortcutConfig differs only by policy engine / publish
+        self._shortcut_config = ShortcutConfig(
+            policy_engine=PolicyEngine(self._bundle.policies, self._bundle.callback_ids),
+            publish_action=lambda action: None,
+            worker_map=self._bundle.worker_map,
+            callback_ids=self._bundle.callback_ids,
+            combine_rules=self._bundle.combine_rules,
+            combined_window_seconds=4.0,
+            func_now=func_now,
+            max_trigger_age=max_trigger_age,
+            max_trigger_ages=self._bundle.max_trigger_ages,
+        )
+        self._table = DispatchTable.build(self._shortcut_config)
+
+        # Read-only matcher indexes; sessions only keep cursors into them
+        self._keyboard_index = KeyboardIndex.build(self._bundle.keyboard_gestures, self._bundle.key_table)
+        self._mouse_trie = GestureTrie(self._bundle.mouse_gestures)
+
+        # -------------------------------
+        # Worker pool (one TimerHeap each)
+        # -------------------------------
+        limits = queue_limits if queue_limits is not None else QueueLimits()
+
+        self._pool: list[InputWorker] = [
+            InputWorker(
+                keyboard_handler=_unrouted,
+                mouse_handler=_unrouted,
+                func_now=func_now,
+                keyboard_limit=limits.keyboard_input,
+                mouse_limit=limits.mouse_input,
+            )
+            for _ in range(workers)
+        ]
+
+        self._sessions: dict[SessionId, _Session] = {}
+        self._lock = threading.Lock()
+
+        self._running = False
+
+    # ---------------------------------------------------------
+    # Sessions
+    # ---------------------------------------------------------
+
+    def _session(self, session_id: SessionId) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = self._create_session(session_id)
+            return session
+
+    def _create_session(self, session_id: SessionId) -> _Session:
+        bundle = self._bundle
+        input_worker = self._pool[hash(session_id) % len(self._pool)]
+
+        worker = ShortcutWorker(
+            replace(
+                self._shortcut_config,
+                policy_engine=PolicyEngine(bundle.policies, bundle.callback_ids),
+                publish_action=partial(self._publish_action, session_id),
+            ),
+            self._table,
+        )
+
+        # Triggers carry the capture time of the input that produced them
+        # (now, when raised outside the pool thread's loop)
+        def stamp() -> float:
+            timestamp = input_worker.current_timestamp
+            return worker.func_now() if timestamp is None else timestamp
+
+        def on_keyboard(callbacks: list[str]) -> None:
+            if callbacks:
+                worker.handle_batch("keyboard", callbacks, stamp())
+
+        def on_mouse(callbacks: list[str]) -> None:
+            if callbacks:
+                worker.handle_batch("mouse", callbacks, stamp())
+
+        keyboard = KeyboardApp(
+            KeyboardConfig(
+                gestures=bundle.keyboard_gestures,
+                on_trigger=on_keyboard,
+                BufferWindowSeconds=1.5,
+                tracer=self._tracer,
+                key_table=bundle.key_table,
+                scheduler=input_worker.timers,
+                index=self._keyboard_index)
+        )
+
+        mouse = MouseApp(
+            MouseConfig(
+                gestures=bundle.mouse_gestures,
+                on_trigger=on_mouse,
+                BufferWindowSeconds=4.0,
+                BufferCapacity=self.MOVE_BUFFER_CAPACITY,
+                min_delta=8.0,
+                tracer=self._tracer,
+                trie=self._mouse_trie)
+        )
+
+        return _Session(keyboard, mouse, worker, input_worker)
+
+    def close_session(self, session_id: SessionId) -> None:
+        """
+        Forget a session. Events already submitted for it are still
+        processed; its armed hold deadlines are cancelled after them.
+        """
+
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+
+        if session is not None:
+            session.input_worker.submit(self._close, session)
+
+    @staticmethod
+    def _close(session: _Session, timestamp: Optional[float]) -> None:
+        session.keyboard.close()
+
+    def __contains__(self, session_id: SessionId) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        """Open sessions."""
+
+        return len(self._sessions)
+
+    # ---------------------------------------------------------
+    # Public API (any thread)
+    # ---------------------------------------------------------
+
+    def submit_keyboard(
+        self,
+        session_id: SessionId,
+        event: KeyboardEvent,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            timestamp: capture time (func_now clock); defaults to the
+                event's timestamp_ns, then to now
+        """
+
+        session = self._session(session_id)
+        session.input_worker.submit(session.keyboard.HandleEvens, event, timestamp, "keyboard")
+
+    def submit_mouse(
+        self,
+        session_id: SessionId,
+        event: MouseEvent,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            timestamp: capture time (func_now clock); defaults to the
+                event's timestamp_ns, then to now
+        """
+
+        session = self._session(session_id)
+        session.input_worker.submit(session.mouse.HandleEvens, event, timestamp, "mouse")
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        Events dropped per bounded input source, summed over the pool:
+        keyboard_input, mouse_input (unbounded ones are omitted).
+        """
+
+        dropped: dict[str, int] = {}
+        for input_worker in self._pool:
+            for source, queue_stats in input_worker.queue_stats().items():
+                key = f"{source}_input"
+                dropped[key] = dropped.get(key, 0) + queue_stats.dropped
+
+        return {key: QueueStats(dropped=count) for key, count in dropped.items()}
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        for input_worker in self._pool:
+            input_worker.start()
+
+        self._running = True
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """
+        Process everything submitted so far, then stop the pool and drop
+        every session.
+
+        Args:
+            timeout: max wait per pool thread; None waits until drained
+        """
+
+        if not self._running:
+            return
+
+        for input_worker in self._pool:
+            input_worker.stop(timeout)
+
+        with self._lock:
+            self._sessions.clear()
+
+        self._running = False
+
+    # ---------------------------------------------------------
+    # Context Manager Support
+    # ---------------------------------------------------------
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        self.stop()
@@ -0,0 +1,559 @@
+"""
+tests:
+    test_ShardedEngine.py
+"""
+
+from bisect import bisect
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from types import TracebackType
+from typing import Any, Callable, Hashable, Iterable, Optional, Type
+import hashlib, logging, multiprocessing, queue, threading, time
+
+from gestura.config.parser import parse_shortcut_config
+from gestura.engine.sessions import MultiSessionEngine, SessionId
+from gestura.models.inputs import KeyboardEvent, MouseEvent, capture_time
+from gestura.models.policy import ActionEvent
+from gestura.models.queues import QueueLimits, QueueStats
+
+
+# (kind, session_id, timestamp, event)
+_Item = tuple[int, SessionId, float, Any]
+
+_KEYBOARD, _MOUSE, _CLOSE = 0, 1, 2
+_SOURCES = {_KEYBOARD: "keyboard", _MOUSE: "mouse"}
+
+# How often the collector checks for shards that died without finishing
+_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class _ShardDone:
+    """
+    Last item a shard puts on the result queue.
+
+    Args:
+        shard: shard index
+        stats: losses of the shard's bounded queues (queue_stats())
+    """
+
+    shard: int
+    stats: dict[str, QueueStats]
+
+
+def _add_stats(total: dict[str, QueueStats], stats: dict[str, QueueStats]) -> None:
+    for key, queue_stats in stats.items():
+        current = total.get(key, QueueStats())
+        total[key] = QueueStats(
+            dropped=current.dropped + queue_stats.dropped,
+            coalesced=current.coalesced + queue_stats.coalesced,
+        )
+
+
+def _stable_hash(key: Hashable) -> int:
+    """
+    Same value in every process (unlike hash(), which is salted per
+    interpreter for str / bytes).
+    """
+
+    return int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring.
+
+    Every node owns `replicas` points on a 64-bit ring; a key belongs to
+    the first point at or after its own hash. Adding or removing a node
+    only moves the keys of that node's points (about 1/N of them).
+    """
+
+    def __init__(self, nodes: Iterable[Hashable] = (), replicas: int = 64) -> None:
+        if replicas < 1:
+            raise ValueError("replicas must be positive")
+
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[Hashable] = []
+
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: Hashable) -> None:
+        for replica in range(self.replicas):
+            point = _stable_hash((node, replica))
+            index = bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: Hashable) -> None:
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node(self, key: Hashable) -> Hashable:
+        if not self._points:
+            raise LookupError("empty ring")
+
+        index = bisect(self._points, _stable_hash(key))
+        return self._owners[index % len(self._owners)]
+
+    def __len__(self) -> int:
+        """Nodes."""
+
+        return len(set(self._owners))
+
+
+# ---------------------------------------------------------
+# Shard process
+# ---------------------------------------------------------
+
+def _run_shard(
+    shard: int,
+    config: list[dict[str, Any]],
+    conn: Connection,
+    results: Any,
+    limits: QueueLimits,
+    max_trigger_age: Optional[float],
+) -> None:
+    """
+    Shard process: one MultiSessionEngine (config compiled once per
+    process) fed by input batches from `conn`; actions go to the merged
+    `results` queue as (session_id, action), then a _ShardDone.
+    """
+
+    engine: Optional[MultiSessionEngine] = None
+
+    limit = limits.actions
+    block = limit.capacity is None or limit.resolve("block", ("block", "drop_newest")) == "block"
+    dropped = 0
+
+    def publish(session_id: SessionId, action: ActionEvent) -> None:
+        nonlocal dropped
+
+        if block:
+            results.put((session_id, action))
+            return
+
+        try:
+            results.put_nowait((session_id, action))
+        except queue.Full:
+            if not dropped:
+                logging.warning(f"[ShardedEngine] shard {shard}: actions queue full: actions are being dropped")
+            dropped += 1
+
+    try:
+        engine = MultiSessionEngine(
+            config, publish, workers=1, queue_limits=limits, max_trigger_age=max_trigger_age)
+        engine.start()
+
+        while (batch := conn.recv()) is not None:
+            for kind, session_id, timestamp, event in batch:
+                if kind == _KEYBOARD:
+                    engine.submit_keyboard(session_id, event, timestamp)
+                elif kind == _MOUSE:
+                    engine.submit_mouse(session_id, event, timestamp)
+                else:
+                    engine.close_session(session_id)
+    except EOFError:
+        pass
+    finally:
+        stats: dict[str, QueueStats] = {}
+        if engine is not None:
+            engine.stop(timeout=None)
+            stats = engine.queue_stats()
+        if limit.capacity is not None:
+            stats["actions"] = QueueStats(dropped=dropped)
+        results.put(_ShardDone(shard, stats))
+
+
+class ShardedEngine:
+    """
+    Sessions spread over `shards` worker processes.
+
+    - Session ids are placed on shards by a consistent-hash ring, so a
+      session always lands on the same process
+    - Each process runs a MultiSessionEngine (the config is compiled once
+      per process, sessions are created there on their first event)
+    - Input is stamped on the calling thread (unless it carries the
+      adapter's timestamp_ns) and buffered per shard; one sender thread
+      ships everything pending to each shard as one pipe message per
+      wakeup, so batches grow with load
+    - Actions from every shard come back on one multiprocessing queue; a
+      collector thread calls publish_action(session_id, action)
+    - A shard process that dies is logged and left out: input for its
+      sessions is dropped, the other shards keep running
+
+    queue_limits:
+    - keyboard_input / mouse_input bound the input pending for the
+      shards (per source, over all shards) and the pool queue inside
+      each shard
+    - actions bounds the merged result queue ("block" or "drop_newest")
+
+    Timestamps cross process boundaries, so `func_now` must be a clock
+    shared by all processes (time.monotonic is). max_trigger_age is
+    measured from that stamp, so it also covers the trip to the shard.
+    """
+
+    def __init__(
+        self,
+        config: list[dict[str, Any]],
+        publish_action: Callable[[SessionId, ActionEvent], None],
+        shards: int = 2,
+        replicas: int = 64,
+        func_now: Callable[[], float] = time.monotonic,
+        mp_context: Optional[Any] = None,
+
+        # Capacity / overload policy of the queues (unbounded by default)
+        queue_limits: Optional[QueueLimits] = None,
+
+        # Drop triggers older than this (seconds since capture) instead of
+        # firing them late; per callback with policy.max_trigger_age
+        max_trigger_age: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            mp_context: multiprocessing context; "spawn" by default (the
+                caller is usually multi-threaded, which fork does not
+                survive reliably)
+        """
+
+        if shards < 1:
+            raise ValueError("shards must be positive")
+        if max_trigger_age is not None and max_trigger_age <= 0:
+            raise ValueError("max_trigger_age must be > 0")
+
+        # Fail here, not in a shard process
+        parse_shortcut_config(config)
+
+        self._config = config
+        self._publish_action = publish_action
+        self.func_now = func_now
+        self._ctx = mp_context if mp_context is not None else multiprocessing.get_context("spawn")
+
+        self._limits = queue_limits if queue_limits is not None else QueueLimits()
+        self._limits.actions.resolve("block", ("block", "drop_newest"))
+        self._max_trigger_age = max_trigger_age
+
+        self._ring = HashRing(range(shards), replicas=replicas)
+        self._shard_count = shards
+
+        # session -> shard (the ring lookup hashes; sessions repeat)
+        self._placement: dict[SessionId, int] = {}
+
+        # Per-shard pending input (guarded by _cond)
+        lock = threading.Lock()
+        self._cond = threading.Condition(lock)
+        self._pending: list[list[_Item]] = [[] for _ in range(shards)]
+        self._dirty: bool = False
+        self._closing: bool = False
+
+        # input refused because stop() had begun
+        self._late: int = 0
+
+        # Bounded input sources, by kind: pending count, who waits for room
+        self._input_limits: dict[int, tuple[int, bool]] = {}
+        for kind, limit in ((_KEYBOARD, self._limits.keyboard_input), (_MOUSE, self._limits.mouse_input)):
+            if limit.capacity is not None:
+                policy = limit.resolve("drop_newest", ("drop_newest", "block"))
+                self._input_limits[kind] = (limit.capacity, policy == "block")
+        self._counts: dict[int, int] = dict.fromkeys(self._input_limits, 0)
+        self._dropped: dict[int, int] = dict.fromkeys(self._input_limits, 0)
+        self._not_full = threading.Condition(lock)
+
+        # losses reported by finished shards
+        self._shard_stats: dict[int, dict[str, QueueStats]] = {}
+
+        self._conns: list[Connection] = []
+        self._processes: list[Any] = []
+        self._results: Any = None
+
+        # shards whose pipe broke (sender thread only)
+        self._dead: set[int] = set()
+
+        self._sender: threading.Thread | None = None
+        self._collector: threading.Thread | None = None
+        self._running = False
+
+    # ---------------------------------------------------------
+    # Placement
+    # ---------------------------------------------------------
+
+    def shard_of(self, session_id: SessionId) -> int:
+        shard = self._placement.get(session_id)
+        if shard is None:
+            shard = self._placement[session_id] = self._ring.node(session_id)  # type: ignore[assignment]
+        return shard  # type: ignore[return-value]
+
+    # ---------------------------------------------------------
+    # Public API (any thread)
+    # ---------------------------------------------------------
+
+    def submit_keyboard(self, session_id: SessionId, event: KeyboardEvent) -> None:
+        self._put((_KEYBOARD, session_id, self._stamp(event), event))
+
+    def submit_mouse(self, session_id: SessionId, event: MouseEvent) -> None:
+        self._put((_MOUSE, session_id, self._stamp(event), event))
+
+    def close_session(self, session_id: SessionId) -> None:
+        self._put((_CLOSE, session_id, self.func_now(), None))
+        self._placement.pop(session_id, None)
+
+    def _stamp(self, event: Any) -> float:
+        timestamp = capture_time(event)
+        return self.func_now() if timestamp is None else timestamp
+
+    def _put(self, item: _Item) -> None:
+        shard = self.shard_of(item[1])
+        limit = self._input_limits.get(item[0])
+
+        with self._cond:
+            if self._closing:
+                self._refuse_late()
+                return
+
+            if limit is not None and not self._admit(item[0], *limit):
+                return
+
+            self._pending[shard].append(item)
+            if not self._dirty:
+                self._dirty = True
+                self._cond.notify()
+
+    def _refuse_late(self) -> None:
+        """
+        Input after stop() began (lock held): the sender has shipped, or is
+        shipping, its last batch, so the item would never be delivered.
+        """
+
+        if not self._late:
+            logging.warning("[ShardedEngine] Input submitted while stopping or stopped is dropped")
+        self._late += 1
+
+    def _admit(self, kind: int, capacity: int, block: bool) -> bool:
+        """
+        Apply the source's limit (lock held); False when the item is dropped.
+        """
+
+        counts = self._counts
+
+        while counts[kind] >= capacity:
+            if self._closing:
+                self._refuse_late()
+                return False
+            if not block:
+                if not self._dropped[kind]:
+                    logging.warning(f"[ShardedEngine] {_SOURCES[kind]} queue full: events are being dropped")
+                self._dropped[kind] += 1
+                return False
+            self._not_full.wait()
+
+        counts[kind] += 1
+        return True
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        Losses of every bounded queue: keyboard_input, mouse_input (here
+        and inside the shards) and actions. Losses inside a shard are
+        added once it has stopped.
+        """
+
+        stats: dict[str, QueueStats] = {}
+        with self._cond:
+            _add_stats(stats, {
+                f"{_SOURCES[kind]}_input": QueueStats(dropped=dropped)
+                for kind, dropped in self._dropped.items()
+            })
+
+        for shard_stats in list(self._shard_stats.values()):
+            _add_stats(stats, shard_stats)
+
+        return stats
+
+    # ---------------------------------------------------------
+    # Threads (parent side)
+    # ---------------------------------------------------------
+
+    def _send_loop(self) -> None:
+        """
+        Ship everything pending, one pipe message per shard per wakeup.
+        """
+
+        cond = self._cond
+
+        while True:
+            with cond:
+                while not self._dirty and not self._closing:
+                    cond.wait()
+
+                pending = self._pending
+                self._pending = [[] for _ in range(self._shard_count)]
+                self._dirty = False
+                closing = self._closing
+
+                if self._counts:
+                    for kind in self._counts:
+                        self._counts[kind] = 0
+                    self._not_full.notify_all()
+
+            for shard, batch in enumerate(pending):
+                if batch:
+                    self._send(shard, batch)
+
+            if closing:
+                for shard in range(self._shard_count):
+                    self._send(shard, None)
+                return
+
+    def _send(self, shard: int, message: Optional[list[_Item]]) -> None:
+        """
+        One pipe message; a shard that cannot receive any more is left
+        out from then on.
+        """
+
+        if shard in self._dead:
+            return
+
+        try:
+            self._conns[shard].send(message)
+        except (OSError, ValueError):
+            self._dead.add(shard)
+            logging.exception(f"[ShardedEngine] Shard {shard} is gone: its input is being dropped")
+
+    def _collect_loop(self) -> None:
+        """
+        Merged action stream; ends when every shard has finished or died.
+        """
+
+        results, processes = self._results, self._processes
+        finished: set[int] = set()
+
+        # shards seen dead before the last empty poll
+        dead: set[int] = set()
+
+        while len(finished) < self._shard_count:
+            try:
+                item = results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                # A process flushes the queue before it exits: nothing
+                # more comes from the ones already dead before this poll
+                finished |= dead
+                dead = {shard for shard, process in enumerate(processes) if not process.is_alive()}
+                continue
+
+            if isinstance(item, _ShardDone):
+                finished.add(item.shard)
+                self._shard_stats[item.shard] = item.stats
+                continue
+
+            session_id, action = item
+            try:
+                self._publish_action(session_id, action)
+            except Exception:
+                logging.exception(f"[ShardedEngine] Error publishing action: {session_id} {action}")
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        self._results = self._ctx.Queue(self._limits.actions.capacity or 0)
+        self._conns, self._processes = [], []
+
+        for _ in range(self._shard_count):
+            receiver, sender = self._ctx.Pipe(duplex=False)
+            process = self._ctx.Process(
+                target=_run_shard,
+                args=(
+                    len(self._processes), self._config, receiver, self._results,
+                    self._limits, self._max_trigger_age),
+                daemon=True,
+            )
+            process.start()
+            receiver.close()
+
+            self._conns.append(sender)
+            self._processes.append(process)
+
+        with self._cond:
+            self._closing = False
+            self._late = 0
+            for kind in self._counts:
+                self._counts[kind] = 0
+        self._dead = set()
+        self._shard_stats = {}
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._collector = threading.Thread(target=self._collect_loop, daemon=True)
+        self._sender.start()
+        self._collector.start()
+
+        self._running = True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Deliver everything submitted so far (and every resulting action),
+        then stop the shards. Input submitted from now on is dropped
+        (logged) until the next start().
+
+        Args:
+            timeout: max wait for the shards to drain their backlog;
+                shards still running after it are killed (their
+                remaining input is lost). None waits until drained.
+        """
+
+        if not self._running:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+            self._not_full.notify_all()
+
+        if self._sender:
+            self._sender.join(remaining())
+        for process in self._processes:
+            process.join(remaining())
+
+        stuck = [process for process in self._processes if process.is_alive()]
+        if stuck:
+            logging.warning(f"[ShardedEngine] {len(stuck)} shard(s) did not stop in time: killing them")
+            for process in stuck:
+                process.kill()
+                process.join()
+
+        # every process is gone: the sender cannot block on a pipe and the
+        # collector only has their last actions left to publish
+        if self._sender:
+            self._sender.join()
+        if self._collector:
+            self._collector.join()
+
+        for conn in self._conns:
+            conn.close()
+
+        self._placement.clear()
+        self._running = False
+
+    # ---------------------------------------------------------
+    # Context Manager Support
+    # ---------------------------------------------------------
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        self.stop()
@@ -0,0 +1,97 @@
+"""
+tests:
+    test_TimerHeap.py
+"""
+
+from typing import Callable, Optional
+import heapq
+import itertools
+import logging
+
+
+class TimerHandle:
+    """
+    One armed deadline. Cancelling only marks it; the heap drops it lazily.
+    """
+
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable[[], None]) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerHeap:
+    """
+    Deadline queue owned by the detection thread (not thread-safe).
+
+    The thread blocks on its input queue with `timeout()` as the wait
+    limit, so nothing wakes up unless an event arrives or a deadline is
+    due: with no armed timers the wait is unbounded (zero idle CPU).
+    """
+
+    def __init__(self) -> None:
+        # (deadline, sequence, handle); sequence keeps equal deadlines FIFO
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._sequence = itertools.count()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        handle = TimerHandle(deadline, callback)
+        heapq.heappush(self._heap, (deadline, next(self._sequence), handle))
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> None:
+        handle.cancelled = True
+
+    # ------------------------------------------------------------------
+    # Driving (detection thread)
+    # ------------------------------------------------------------------
+
+    def timeout(self, now: float) -> Optional[float]:
+        """
+        Seconds until the next live deadline (0 if overdue, None if none).
+        """
+
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - now)
+
+    def run_due(self, now: float) -> int:
+        """
+        Run every live timer with deadline <= now, earliest first.
+        Returns the number of callbacks run.
+        """
+
+        heap = self._heap
+        ran = 0
+
+        while heap and heap[0][0] <= now:
+            _, _, handle = heapq.heappop(heap)
+            if handle.cancelled:
+                continue
+
+            handle.cancelled = True  # fired; a later cancel() is a no-op
+            ran += 1
+            try:
+                handle.callback()
+            except Exception:
+                logging.exception("[TimerHeap] Error in timer callback")
+
+        return ran
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def __len__(self) -> int:
+        """Armed timers, including cancelled ones not dropped yet."""
+
+        return len(self._heap)
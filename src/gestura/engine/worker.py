@@ -1,38 +1,172 @@
-from typing import Callable, Dict
-import logging, threading, queue
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import heapq, logging, math, threading
 
 from ..config import ShortcutConfig
+from ..models.combine import CombineOrder
 from ..models.policy import TriggerEvent, ActionEvent
+from ..models.queues import QueueStats
+from .channel import TriggerChannel
+
+
+# Combined halves: index into ShortcutWorker._recent, and the order that
+# lets that half lead
+_KEYBOARD, _MOUSE = 0, 1
+_LEADS: tuple[CombineOrder, CombineOrder] = ("keyboard_first", "mouse_first")
+
+
+# Dispatch kinds (DispatchTable.kinds -> ShortcutWorker._handlers)
+_NONE, _KEYBOARD_ONLY, _MOUSE_ONLY, _COMBINED = 0, 1, 2, 3
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchTable:
+    """
+    Read-only worker tables of one shortcut config, indexed by callback
+    id. Built once; any number of workers of that config can share it.
+    """
+
+    # callback -> id, id -> name
+    ids: dict[str, int]
+    names: list[str]
+
+    # id -> dispatch kind
+    kinds: list[int]
+
+    # id -> pairing window / order (combos)
+    windows: list[float]
+    orders: list[CombineOrder]
+
+    # id -> max trigger age (inf: no limit); False when nothing is limited
+    max_ages: list[float]
+    ages_limited: bool
+
+    @classmethod
+    def build(cls, config: ShortcutConfig) -> "DispatchTable":
+        ids = cls._build_ids(config)
+        worker_map = config.worker_map
+
+        names: list[str] = [""] * (max(ids.values(), default=-1) + 1)
+        for name, callback_id in ids.items():
+            names[callback_id] = name
+
+        kinds: list[int] = [_NONE] * len(names)
+        for group, kind in (
+            (worker_map.keyboard_only, _KEYBOARD_ONLY),
+            (worker_map.mouse_only, _MOUSE_ONLY),
+            (worker_map.combo, _COMBINED),
+        ):
+            for name in group:
+                kinds[ids[name]] = kind
+
+        windows: list[float] = [config.combined_window_seconds] * len(names)
+        orders: list[CombineOrder] = ["either"] * len(names)
+        for name, rule in (config.combine_rules or {}).items():
+            callback_id = ids.get(name)
+            if callback_id is None:
+                continue
+            if rule.window_seconds is not None:
+                windows[callback_id] = rule.window_seconds
+            orders[callback_id] = rule.order
+
+        default_age = config.max_trigger_age if config.max_trigger_age is not None else math.inf
+        max_ages: list[float] = [default_age] * len(names)
+        for name, max_age in (config.max_trigger_ages or {}).items():
+            callback_id = ids.get(name)
+            if callback_id is not None:
+                max_ages[callback_id] = max_age
+
+        return cls(
+            ids=ids, names=names, kinds=kinds, windows=windows, orders=orders,
+            max_ages=max_ages, ages_limited=any(age != math.inf for age in max_ages),
+        )
+
+    @staticmethod
+    def _build_ids(config: ShortcutConfig) -> dict[str, int]:
+        """
+        Configured ids, else the policy engine's; callbacks without one
+        are numbered after them.
+        """
+
+        ids = config.callback_ids
+        if ids is None:
+            ids = getattr(config.policy_engine, "callback_ids", None) or {}
+        ids = dict(ids)
+
+        worker_map = config.worker_map
+        next_id = max(ids.values(), default=-1) + 1
+        for name in sorted(worker_map.keyboard_only | worker_map.mouse_only | worker_map.combo):
+            if name not in ids:
+                ids[name] = next_id
+                next_id += 1
+
+        return ids
 
 
 class ShortcutWorker:
     """
     Event-driven shortcut coordinator.
     Handles keyboard-only, mouse-only and combined triggers.
+
+    Triggers arrive through a TriggerChannel: one batch per input event
+    (empty ones are skipped), all pending batches handled per wakeup.
+
+    Callback names are turned into dense int ids once, at ingress; the
+    DispatchTable maps an id straight to its keyboard-only / mouse-only /
+    combined handler. A TriggerEvent carries both the name and the id.
+
+    Each combo pairs its halves within its own window (CombineRule,
+    default combined_window_seconds) and optionally in a fixed order.
+    Pending halves expire through a min-heap keyed by expiry time.
+
+    Trigger timestamps are capture times. A trigger older than its
+    max_trigger_age when the worker reaches it is dropped as late,
+    before combo pairing and policy, so a backlog never fires stale
+    actions.
     """
 
     # ------------------------------------------------------------------
     # Initialization
     # ------------------------------------------------------------------
 
-    def __init__(self, config: ShortcutConfig) -> None:
+    def __init__(self, config: ShortcutConfig, table: Optional["DispatchTable"] = None) -> None:
+        """
+        Args:
+            table: precompiled tables for this config (shared between
+                workers of one config); built from `config` when None
+        """
 
         self._policy_engine = config.policy_engine
         self._publish_action: Callable[[ActionEvent], None] = config.publish_action
 
-        self._keyboard_only: set[str] = config.worker_map.keyboard_only
-        self._mouse_only: set[str] = config.worker_map.mouse_only
-        self._combined: set[str] = config.worker_map.combo
+        self._table: DispatchTable = table if table is not None else DispatchTable.build(config)
 
-        self._combined_window: float = config.combined_window_seconds
+        # callback -> id (shared with the policy engine)
+        self._ids: dict[str, int] = self._table.ids
+
+        # dispatch kind -> handler (_NONE: callback not handled by this worker)
+        self._handlers: tuple[Optional[Callable[[TriggerEvent], None]], ...] = (
+            None, self._handle_keyboard_only, self._handle_mouse_only, self._handle_combined,
+        )
+
+        # id -> pairing window / order of combos
+        self._windows: list[float] = self._table.windows
+        self._orders: list[CombineOrder] = self._table.orders
 
         self.func_now: Callable[[], float] = config.func_now
 
-        # Store recent source timestamps for combined logic
-        self._recent_keyboard: Dict[str, float] = {}
-        self._recent_mouse: Dict[str, float] = {}
+        # Store recent source timestamps for combined logic (by id)
+        self._recent_keyboard: Dict[int, float] = {}
+        self._recent_mouse: Dict[int, float] = {}
+        self._recent = (self._recent_keyboard, self._recent_mouse)
+
+        # (expires_at, id, side, timestamp) min-heap over both stores
+        self._expiry: list[tuple[float, int, int, float]] = []
+
+        self._channel = TriggerChannel({"keyboard": config.keyboard_queue, "mouse": config.mouse_queue})
 
-        self._queue: queue.Queue[TriggerEvent] = queue.Queue()
+        # source -> triggers dropped for exceeding max_trigger_age
+        self._late: dict[str, int] = {"keyboard": 0, "mouse": 0}
 
         self._running: bool = False
         self._thread: threading.Thread | None = None
@@ -46,15 +180,20 @@ class ShortcutWorker:
             return
 
         self._running = True
+        self._channel.reopen()
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
+        """
+        Handle everything submitted so far, then exit the thread.
+        """
+
         if not self._running:
             return
 
         self._running = False
-        self._queue.put(TriggerEvent("__STOP__", "", 0.0))
+        self._channel.close()
 
         if self._thread:
             self._thread.join(timeout=1)
@@ -63,15 +202,39 @@ class ShortcutWorker:
     # Public API (Ingress)
     # ------------------------------------------------------------------
 
-    def submit_keyboard_triggers(self, callbacks: list[str]) -> None:
-        now = self.func_now()
-        for cb in callbacks:
-            self._queue.put((TriggerEvent("keyboard", cb, now)))
+    def submit_keyboard_triggers(self, callbacks: list[str], timestamp: Optional[float] = None) -> None:
+        """
+        Args:
+            timestamp: capture time of the input that produced the
+                callbacks (func_now clock); defaults to now
+        """
 
-    def submit_mouse_triggers(self, callbacks: list[str]) -> None:
-        now = self.func_now()
-        for cb in callbacks:
-            self._queue.put((TriggerEvent("mouse", cb, now)))
+        if callbacks:
+            self._channel.put("keyboard", callbacks, self.func_now() if timestamp is None else timestamp)
+
+    def submit_mouse_triggers(self, callbacks: list[str], timestamp: Optional[float] = None) -> None:
+        """
+        Args:
+            timestamp: capture time of the input that produced the
+                callbacks (func_now clock); defaults to now
+        """
+
+        if callbacks:
+            self._channel.put("mouse", callbacks, self.func_now() if timestamp is None else timestamp)
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """
+        Triggers lost per bounded source (keyboard_queue / mouse_queue).
+        """
+
+        return self._channel.stats()
+
+    def late_triggers(self) -> dict[str, int]:
+        """
+        Triggers dropped per source for exceeding their max_trigger_age.
+        """
+
+        return dict(self._late)
 
     # ------------------------------------------------------------------
     # Main loop
@@ -79,92 +242,127 @@ class ShortcutWorker:
 
     def _loop(self) -> None:
         """
-        Blocking wait on queue.
+        Blocking wait on the channel; one wakeup handles every pending batch.
         """
 
-        while self._running:
-            _TriggerEvent = self._queue.get()
+        drain = self._channel.drain
+        handle_batch = self.handle_batch
 
-            if _TriggerEvent.source == "__STOP__":
+        while True:
+            batches = drain()
+            if batches is None:
                 break
 
+            for source, callbacks, timestamp in batches:
+                handle_batch(source, callbacks, timestamp)
+
+    def handle_batch(self, source: str, callbacks: list[str], timestamp: float) -> None:
+        """
+        Handle the callbacks of one input event on the calling thread.
+        The worker thread runs this per batch; threadless owners
+        (MultiSessionEngine sessions) call it directly.
+        """
+
+        ids, kinds, handlers = self._ids, self._table.kinds, self._handlers
+
+        # Age since capture, checked before pairing / policy
+        max_ages = self._table.max_ages
+        age = self.func_now() - timestamp if self._table.ages_limited else 0.0
+
+        for callback in callbacks:
+            callback_id = ids.get(callback)
+            if callback_id is None:
+                continue
+
+            handler = handlers[kinds[callback_id]]
+            if handler is None:
+                continue
+
+            if age > max_ages[callback_id]:
+                self._drop_late(source)
+                continue
+
+            _TriggerEvent = TriggerEvent(source, callback, timestamp, callback_id)  # type: ignore[arg-type]
             try:
-                self._handle_trigger(_TriggerEvent)
+                handler(_TriggerEvent)
             except Exception:
-                logging.exception(f"[ShortcutWorker] Error handling trigger: {_TriggerEvent}")
+                logging.exception(f"[ShortcutWorker] Error handling trigger: {callback} {_TriggerEvent}")
+
+    def _drop_late(self, source: str) -> None:
+        if not self._late[source]:
+            logging.warning(f"[ShortcutWorker] {source} triggers are arriving late and being dropped")
+        self._late[source] += 1
 
     # ------------------------------------------------------------------
     # Trigger dispatcher
     # ------------------------------------------------------------------
 
-    def _handle_trigger(self, _TriggerEvent: TriggerEvent) -> None:
-
-        # -----------------------------
-        # Keyboard-only
-        # -----------------------------
-        if _TriggerEvent.callback in self._keyboard_only:
-            if _TriggerEvent.source == "keyboard":
-                self._evaluate_and_publish(_TriggerEvent)
-            return
-
-        # -----------------------------
-        # Mouse-only
-        # -----------------------------
-        elif _TriggerEvent.callback in self._mouse_only:
-            if _TriggerEvent.source == "mouse":
-                self._evaluate_and_publish(_TriggerEvent)
-            return
+    def _handle_keyboard_only(self, _TriggerEvent: TriggerEvent) -> None:
+        if _TriggerEvent.source == "keyboard":
+            self._evaluate_and_publish(_TriggerEvent)
 
-        # -----------------------------
-        # Combined
-        # -----------------------------
-        elif _TriggerEvent.callback in self._combined:
-            self._handle_combined(_TriggerEvent)
+    def _handle_mouse_only(self, _TriggerEvent: TriggerEvent) -> None:
+        if _TriggerEvent.source == "mouse":
+            self._evaluate_and_publish(_TriggerEvent)
 
     # ------------------------------------------------------------------
     # Combined coordination
     # ------------------------------------------------------------------
 
     def _handle_combined(self, _TriggerEvent: TriggerEvent) -> None:
+        """
+        Pair the keyboard and mouse halves of a combo.
 
-        self._prune_old(_TriggerEvent.timestamp)
+        The half arriving first is remembered (if its order allows it to
+        lead); the other half completes the combo if it is still within
+        the combo's window.
+        """
 
-        if _TriggerEvent.source == "keyboard":
-            self._recent_keyboard[_TriggerEvent.callback] = _TriggerEvent.timestamp
+        self._expire(_TriggerEvent.timestamp)
 
-            if _TriggerEvent.callback in self._recent_mouse:
-                self._try_emit_combined(_TriggerEvent)
+        callback = _TriggerEvent.callback_id
+        side = _KEYBOARD if _TriggerEvent.source == "keyboard" else _MOUSE
+        order = self._orders[callback]
 
-        elif _TriggerEvent.source == "mouse":
-            self._recent_mouse[_TriggerEvent.callback] = _TriggerEvent.timestamp
+        if order != _LEADS[side] and callback in self._recent[1 - side]:
+            self._try_emit_combined(_TriggerEvent)
+            return
 
-            if _TriggerEvent.callback in self._recent_keyboard:
-                self._try_emit_combined(_TriggerEvent)
+        if order == "either" or order == _LEADS[side]:
+            timestamp = _TriggerEvent.timestamp
+            self._recent[side][callback] = timestamp
+            heapq.heappush(self._expiry, (timestamp + self._windows[callback], callback, side, timestamp))
 
     def _try_emit_combined(self, _TriggerEvent: TriggerEvent) -> None:
         """
         Emit if policy allows, then clear state.
         """
 
-        self._clear_combined(_TriggerEvent.callback)
+        self._clear_combined(_TriggerEvent.callback_id)
 
         self._evaluate_and_publish(_TriggerEvent)
 
-    def _clear_combined(self, callback: str) -> None:
+    def _clear_combined(self, callback: int) -> None:
+        # heap entries of cleared halves go stale; _expire skips them
         self._recent_keyboard.pop(callback, None)
         self._recent_mouse.pop(callback, None)
 
-    def _prune_old(self, now: float) -> None:
+    def _expire(self, now: float) -> None:
         """
-        Remove expired combined timestamps.
+        Drop halves whose window ended before `now`.
+
+        Pops the expiry heap only while its head is due: O(log n) per
+        expired entry, nothing when none is due. An entry is stale when its
+        half was consumed or re-recorded since; it is discarded unchecked.
         """
 
-        threshold = now - self._combined_window
+        expiry = self._expiry
+        while expiry and expiry[0][0] < now:
+            _, callback, side, timestamp = heapq.heappop(expiry)
 
-        for store in (self._recent_keyboard, self._recent_mouse):
-            expired = [cb for cb, ts in store.items() if ts < threshold]
-            for cb in expired:
-                del store[cb]
+            store = self._recent[side]
+            if store.get(callback) == timestamp:
+                del store[callback]
 
     # ------------------------------------------------------------------
     # Policy + Publish
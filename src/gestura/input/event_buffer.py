@@ -1,6 +1,6 @@
 from collections import deque
 import time
-from typing import Deque, Any, Callable
+from typing import Deque, Any, Callable, Optional
 
 
 class EventBuffer:
@@ -15,16 +15,40 @@ class EventBuffer:
         while buf and buf[0][0] < cutoff:
             buf.popleft()
 
-    def add(self, event: Any) -> None:
-        now = self.func_now()
+    def add(self, event: Any, timestamp: Optional[float] = None) -> None:
+        now = self.func_now() if timestamp is None else timestamp
         self._prune(now)
         self._buffer.append((now, event))
 
-    def snapshot(self) -> list[Any]:
-        now = self.func_now()
-        self._prune(now)
+    def snapshot(self, now: Optional[float] = None) -> list[Any]:
+        """
+        Events inside the window at `now`: the capture time of the event
+        being processed (defaults to func_now()).
+        """
+
+        self._prune(self.func_now() if now is None else now)
         return [e for _, e in self._buffer]
 
+    def newest(self) -> Optional[Any]:
+        return self._buffer[-1][1] if self._buffer else None
+
+    def refresh_newest(self, timestamp: Optional[float] = None) -> None:
+        """
+        Move the newest event's time forward (keeps it inside the window).
+        """
+
+        if self._buffer:
+            now = self.func_now() if timestamp is None else timestamp
+            self._buffer[-1] = (now, self._buffer[-1][1])
+
+    def oldest(self, now: Optional[float] = None) -> Optional[Any]:
+        """
+        Oldest event still inside the window at `now` (None if empty).
+        """
+
+        self._prune(self.func_now() if now is None else now)
+        return self._buffer[0][1] if self._buffer else None
+
     def clear(self) -> None:
         self._buffer.clear()
 
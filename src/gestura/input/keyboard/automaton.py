@@ -0,0 +1,115 @@
+"""
+tests:
+    test_KeySequenceAutomaton.py
+"""
+
+from collections import deque
+from typing import Hashable, Sequence
+
+
+class KeySequenceAutomaton:
+    """
+    Aho-Corasick automaton over key sequences
+    (interned key codes in the pipeline; any hashable key works).
+
+    One step per key press. `outputs(state)` lists every sequence that
+    ends at the current key, including overlapping ones (via failure
+    links), ordered by length (shortest first).
+
+    Read-only once built, so one automaton can be shared by any number
+    of streams (each keeps its own state int). Missing transitions are
+    resolved through the failure links, amortized O(1) per step.
+    """
+
+    def __init__(self, sequences: Sequence[Sequence[Hashable]]) -> None:
+        # state 0 is the root
+        self._goto: list[dict[Hashable, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[list[int]] = [[]]
+
+        self.lengths: list[int] = [len(sequence) for sequence in sequences]
+        self.max_length: int = max(self.lengths, default=0)
+        self._alphabet: set[Hashable] = set()
+
+        for index, sequence in enumerate(sequences):
+            if sequence:
+                self._insert(index, sequence)
+
+        self._outputs: list[tuple[int, ...]] = [()] * len(self._goto)
+        self._build_failure_links()
+
+    # ------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------
+
+    def _insert(self, index: int, sequence: Sequence[Hashable]) -> None:
+        state = 0
+        for key in sequence:
+            self._alphabet.add(key)
+
+            nxt = self._goto[state].get(key)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._goto[state][key] = nxt
+
+            state = nxt
+
+        self._own[state].append(index)
+
+    def _build_failure_links(self) -> None:
+        """
+        BFS: fail(s) is the longest proper suffix of s that is a prefix.
+        outputs(s) = outputs(fail(s)) + own(s), so shorter sequences
+        always come first.
+        """
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+
+        queue: deque[int] = deque(goto[0].values())
+        for state in queue:
+            outputs[state] = tuple(self._own[state])
+
+        while queue:
+            state = queue.popleft()
+
+            for key, child in goto[state].items():
+                link = fail[state]
+                while link and key not in goto[link]:
+                    link = fail[link]
+
+                fail[child] = goto[link].get(key, 0)
+                outputs[child] = outputs[fail[child]] + tuple(self._own[child])
+
+                queue.append(child)
+
+    # ------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------
+
+    def step(self, state: int, key: Hashable) -> int:
+        nxt = self._goto[state].get(key)
+        if nxt is not None:
+            return nxt
+
+        if key not in self._alphabet:
+            return 0
+
+        goto, fail = self._goto, self._fail
+
+        link = fail[state]
+        while link and key not in goto[link]:
+            link = fail[link]
+
+        return goto[link].get(key, 0)
+
+    def outputs(self, state: int) -> tuple[int, ...]:
+        """Indexes of sequences ending in `state`, shortest first."""
+
+        return self._outputs[state]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
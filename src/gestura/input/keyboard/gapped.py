@@ -0,0 +1,187 @@
+"""
+tests:
+    test_GappedSequenceMatcher.py
+"""
+
+from collections import deque
+from typing import Deque, Hashable, Optional, Sequence
+
+
+def latest_start(keys: Sequence[Hashable], sequence: Sequence[Hashable], max_gap: int) -> Optional[int]:
+    """
+    Latest start index of `sequence` as a subsequence of `keys` that ends
+    on the last key, with at most `max_gap` other keys between two steps.
+    None if there is no such occurrence. max_gap=0 is a contiguous tail.
+
+    Backward level sets: positions of step i-1 are the matching keys at
+    most max_gap+1 before some position of step i.
+    """
+
+    last = len(keys) - 1
+    if last < 0 or not sequence or keys[last] != sequence[-1]:
+        return None
+
+    positions = [last]
+    for step in reversed(sequence[:-1]):
+        found: set[int] = set()
+        for p in positions:
+            for q in range(p - 1, max(p - max_gap - 2, -1), -1):
+                if keys[q] == step:
+                    found.add(q)
+
+        if not found:
+            return None
+        positions = sorted(found, reverse=True)
+
+    return positions[0]
+
+
+class _GapGroup:
+    """
+    Shift-And masks of every gesture sharing one max_gap.
+
+    Gestures are laid out side by side in one int; bit i of the state word
+    D is set when the prefix ending at pattern position i ends exactly at
+    this press. A prefix may be extended by a press at most max_gap+1
+    later, so the predecessors are the OR of the last max_gap+1 state
+    words (kept per stream by GappedSequenceMatcher).
+    """
+
+    __slots__ = ("gap", "first", "masks", "finals", "final_mask")
+
+    def __init__(self, max_gap: int) -> None:
+        self.gap: int = max_gap
+        self.first: int = 0                      # first position of every gesture
+        self.masks: dict[Hashable, int] = {}     # key -> positions holding it
+        self.finals: dict[int, list[int]] = {}   # final bit -> gesture indexes
+        self.final_mask: int = 0
+
+    def add(self, index: int, sequence: Sequence[Hashable], offset: int) -> int:
+        self.first |= 1 << offset
+
+        for position, key in enumerate(sequence):
+            self.masks[key] = self.masks.get(key, 0) | 1 << (offset + position)
+
+        final = 1 << (offset + len(sequence) - 1)
+        self.finals.setdefault(final, []).append(index)
+        self.final_mask |= final
+
+        return offset + len(sequence)
+
+    def step(self, history: Deque[int], key: Hashable) -> int:
+        ready = 0
+        for state in history:
+            ready |= state
+
+        # A bit shifted out of one gesture's last position lands on the next
+        # gesture's first position, which `first` sets anyway
+        state = ((ready << 1) | self.first) & self.masks.get(key, 0)
+        history.append(state)
+        return state & self.final_mask
+
+
+class GappedIndex:
+    """
+    Gap-tolerant key sequences compiled into one Shift-And group per
+    distinct max_gap. Read-only once built; any number of
+    GappedSequenceMatcher streams can share it.
+    """
+
+    def __init__(self, sequences: Sequence[Sequence[Hashable]], gaps: Sequence[int]) -> None:
+        self.sequences: list[tuple[Hashable, ...]] = [tuple(sequence) for sequence in sequences]
+        self.gaps: list[int] = list(gaps)
+
+        groups: dict[int, _GapGroup] = {}
+        offsets: dict[int, int] = {}
+
+        for index, (sequence, gap) in enumerate(zip(self.sequences, self.gaps)):
+            if not sequence:
+                continue
+
+            group = groups.get(gap)
+            if group is None:
+                group = groups[gap] = _GapGroup(gap)
+
+            offsets[gap] = group.add(index, sequence, offsets.get(gap, 0))
+
+        self.groups: tuple[_GapGroup, ...] = tuple(groups.values())
+
+        # longest possible occurrence, in presses
+        self.span: int = max(
+            (len(s) + (len(s) - 1) * gap for s, gap in zip(self.sequences, self.gaps)),
+            default=0,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+
+class GappedSequenceMatcher:
+    """
+    Gap-tolerant key sequences: between two consecutive keys of a
+    gesture, up to `max_gap` unrelated presses are allowed.
+
+    Gestures are grouped by max_gap and each group is one Shift-And word,
+    so a press costs a constant number of int operations per distinct
+    max_gap value, regardless of how many gestures there are.
+
+    `step()` reports the gestures completed at this press; the latest
+    start of an occurrence (for the time window) is only searched for
+    those, over the last `span` presses.
+
+    Only the state words and recent presses of one stream live here; the
+    masks come from a GappedIndex (built from `sequences` / `gaps` when
+    `index` is None).
+    """
+
+    def __init__(
+        self,
+        sequences: Sequence[Sequence[Hashable]] = (),
+        gaps: Sequence[int] = (),
+        index: Optional[GappedIndex] = None,
+    ) -> None:
+        self.index = index if index is not None else GappedIndex(sequences, gaps)
+        self.span: int = self.index.span
+
+        # per group: the last max_gap+1 state words
+        self._history: list[Deque[int]] = [
+            deque([0] * (group.gap + 1), maxlen=group.gap + 1) for group in self.index.groups
+        ]
+        self._recent: Deque[Hashable] = deque(maxlen=max(self.span, 1))
+
+    def step(self, key: Hashable) -> list[int]:
+        """
+        Indexes of the gestures completed by this press.
+        """
+
+        self._recent.append(key)
+
+        completed: list[int] = []
+        for group, history in zip(self.index.groups, self._history):
+            hits = group.step(history, key)
+            while hits:
+                low = hits & -hits
+                completed.extend(group.finals[low])
+                hits ^= low
+
+        return completed
+
+    def start_offset(self, index: int) -> Optional[int]:
+        """
+        Presses between the latest start of gesture `index` and the
+        newest press (0 = the newest press itself).
+        """
+
+        compiled = self.index
+        start = latest_start(list(self._recent), compiled.sequences[index], compiled.gaps[index])
+        if start is None:
+            return None
+        return len(self._recent) - 1 - start
+
+    def reset(self) -> None:
+        self._recent.clear()
+        for history in self._history:
+            history.extend([0] * len(history))
+
+    def __len__(self) -> int:
+        return len(self.index)
@@ -4,11 +4,16 @@ import logging
 from typing import Callable, Optional
 
 from ...config import KeyboardConfig
-from ...models.inputs import KeyboardEvent
+from ...models.inputs import KeyboardEvent, capture_time
 
 from ...models.keyboard import GestureKeyboardCondition
 from ...models.event import EventData_keyboard
 from .pipeline import KeyboardGesturePipeline
+from .keycodes import KeyTable
+from .held import ChordIndex, HeldKeyTracker
+from .index import KeyboardIndex
+from .hold import HoldDetector
+from .repeat import AutoRepeatDetector
 from ...utils.key_normalizer import KeyUtils
 from ..event_buffer import EventBuffer
 
@@ -19,7 +24,10 @@ class KeyboardApp:
 
     Responsibilities:
     - Receive raw keyboard events
+    - Filter OS auto-repeat before any other work
+    - Intern key names into int codes (KeyTable)
     - Maintain a time-windowed buffer of pressed keys
+    - Track held keys (press + release) for chord and hold gestures
     - Dispatch relevant gestures based on starting key
     - Emit triggered callbacks
     """
@@ -38,29 +46,72 @@ class KeyboardApp:
         # Configuration
         self._gesture_definitions: list[GestureKeyboardCondition] = config.gestures
 
+        # Matching tables (shared when prebuilt, e.g. by MultiSessionEngine)
+        index = (
+            config.index if config.index is not None
+            else KeyboardIndex.build(self._gesture_definitions, config.key_table)
+        )
+
+        # Key interning (built at config parse time when available)
+        self._key_table: KeyTable = index.key_table
+
+        # raw adapter key -> (normalized name, code); skips parse_key on repeats
+        self._interned: dict[str, tuple[str, int]] = {}
+
+        # Auto-repeat (held key) detection at ingress
+        self._repeat_policy = config.AutoRepeatPolicy
+        self._repeats = AutoRepeatDetector(config.AutoRepeatIntervalSeconds)
+
         # Time-windowed key buffer
         self._event_buffer = EventBuffer(config.BufferWindowSeconds) # Time window for gesture detection
 
         # Gesture pipeline (responsible for matching logic)
         # Internally builds an index by starting key
         self._gesture_pipeline = KeyboardGesturePipeline(
-            gestures=self._gesture_definitions
+            gestures=index.sequences.gestures,
+            tracer=config.tracer,
+            index=index.sequences,
         )
 
+        # Held keys (bitmask) + chord gestures indexed by mask
+        self._held_keys = HeldKeyTracker(config.HeldKeyExpirySeconds)
+        self._chords: ChordIndex = index.chords
+        self._tracer = config.tracer
+
+        # Hold gestures: deadlines armed in the detection thread's scheduler
+        self._holds: Optional[HoldDetector] = None
+        if len(index.holds) and config.scheduler is None:
+            logging.warning("Hold gestures ignored: KeyboardConfig.scheduler is not set")
+        elif len(index.holds):
+            self._holds = HoldDetector(
+                [g for g in self._gesture_definitions if g.mode == "hold"],
+                self._key_table,
+                config.scheduler,  # type: ignore[arg-type]
+                on_trigger=self._emit_callback,
+                tracer=config.tracer,
+                index=index.holds,
+            )
+
     # ------------------------------------------------------------------
     # Validator
     # ------------------------------------------------------------------
     def _validator(self, event: KeyboardEvent) -> Optional[EventData_keyboard]:
         """
-        Generate EventData_keyboard private model.
+        Generate EventData_keyboard private model (name + interned code).
         """
 
-        key_name = KeyUtils.parse_key(key=event.key, output_type="str")
-        if not key_name:
-            logging.debug("Ignored unsupported key name: %s", event.key)
-            return
+        interned = self._interned.get(event.key)
+        if interned is None:
+            key_name = KeyUtils.parse_key(key=event.key, output_type="str")
+            if not key_name:
+                logging.debug("Ignored unsupported key name: %s", event.key)
+                return
+
+            interned = self._interned[event.key] = (key_name, self._key_table.code(key_name))
+
+        key_name, code = interned
 
-        valid_event = EventData_keyboard(id=self._event_id, key=key_name, press=event.press)
+        valid_event = EventData_keyboard(id=self._event_id, key=key_name, code=code, press=event.press)
         self._event_id += 1
         return valid_event
 
@@ -68,49 +119,103 @@ class KeyboardApp:
     # Internal Event Handlers
     # ------------------------------------------------------------------
 
-    def _handle_key_press(self, event: EventData_keyboard) -> None:
+    def _handle_repeat(self, event: KeyboardEvent, timestamp: float) -> None:
+        """
+        Auto-repeat press under "drop" / "collapse": no new event, no
+        matching. Only the held-key state is kept fresh, and "collapse"
+        keeps the original press inside the time window.
+        """
+
+        interned = self._interned.get(event.key)
+        if interned is None:
+            return
+
+        key_name, code = interned
+        self._held_keys.press(code, timestamp, key_name)
+
+        if self._repeat_policy == "collapse":
+            newest = self._event_buffer.newest()
+            if newest is not None and newest.code == code:
+                self._event_buffer.refresh_newest(timestamp)
+
+    def _handle_key_press(self, event: EventData_keyboard, timestamp: Optional[float] = None) -> None:
         """
         Process key press events.
         Adds key to buffer and evaluates relevant gestures.
         """
 
+        if timestamp is None:
+            timestamp = self._event_buffer.func_now()
+
         # Store key inside sliding window buffer
-        self._event_buffer.add(event)
+        self._event_buffer.add(event, timestamp)
+
+        # Held set changes only on a real transition (not auto-repeat)
+        chord_callbacks = self._match_chords(event, timestamp)
 
-        # Evaluate only gestures that start with this key
-        self._evaluate_gestures(trigger_key=event.key)
+        if self._holds is not None:
+            self._holds.update(self._held_keys.mask, timestamp, event.id)  # type: ignore[arg-type]
 
-    def _handle_key_release(self, event: EventData_keyboard) -> None:
+        # Advance the gesture automaton with this key
+        self._evaluate_gestures(event, chord_callbacks, timestamp)
+
+    def _handle_key_release(self, event: EventData_keyboard, timestamp: Optional[float] = None) -> None:
         """
         Process key release events.
-        Currently not used in gesture evaluation.
+        Only updates the held-key state (and cancels/arms holds).
         """
 
-        pass
+        self._held_keys.release(event.code, event.key)  # type: ignore[arg-type]
+
+        if self._holds is not None:
+            if timestamp is None:
+                timestamp = self._event_buffer.func_now()
+            self._holds.update(self._held_keys.mask, timestamp, event.id)  # type: ignore[arg-type]
 
     # ------------------------------------------------------------------
     # Gesture Evaluation
     # ------------------------------------------------------------------
 
-    def _evaluate_gestures(self, trigger_key: str) -> None:
+    def _match_chords(self, event: EventData_keyboard, timestamp: float) -> list[str]:
+        """
+        One mask lookup: chords whose keys are exactly the held set.
         """
-        Evaluate gestures relevant to the given trigger key.
 
-        NOTE:
-        - Snapshot is intentionally preserved to prevent mutation-related
-          side effects during evaluation.
-        - Pipeline internally uses trigger-key indexing for efficiency.
+        if not self._held_keys.press(event.code, timestamp, event.key):  # type: ignore[arg-type]
+            return []
+
+        gestures = self._chords.match(self._held_keys.mask)
+        if not gestures:
+            return []
+
+        if self._tracer is not None:
+            for gesture in gestures:
+                self._tracer.match_success(gesture.callback, event.id)  # type: ignore[arg-type]
+
+        return [gesture.callback for gesture in gestures]
+
+    def _evaluate_gestures(
+        self,
+        event: EventData_keyboard,
+        chord_callbacks: Optional[list[str]] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Feed the newest press to the streaming pipeline.
+        The buffer only provides the window start; no snapshot is taken.
         """
 
-        # Take snapshot to ensure consistency across multi-stage processing
-        current_sequence = self._event_buffer.snapshot()
+        # Window measured at the capture time of this press
+        oldest = self._event_buffer.oldest(timestamp)
 
-        # Process only gestures mapped to this starting key
-        matched_callbacks = self._gesture_pipeline.process_for_trigger(
-            trigger_key=trigger_key,
-            event_sequence=current_sequence,
+        matched_callbacks = self._gesture_pipeline.process_event(
+            event,
+            window_start=None if oldest is None else oldest.id,
         )
 
+        if chord_callbacks:
+            matched_callbacks = chord_callbacks + matched_callbacks
+
         # Emit callbacks
         self._emit_callback(matched_callbacks)
 
@@ -118,17 +223,43 @@ class KeyboardApp:
     # ------------------------------------------------------------------ #
     # API
     # ------------------------------------------------------------------ #
-    def HandleEvens(self, event: KeyboardEvent) -> None:
+    def close(self) -> None:
+        """
+        Cancel armed hold deadlines (the scheduler may outlive this app).
+        """
+
+        if self._holds is not None:
+            self._holds.cancel()
+
+    def HandleEvens(self, event: KeyboardEvent, timestamp: Optional[float] = None) -> None:
         """
         Main entry point for incoming keyboard events.
         Normalizes and routes events to appropriate handlers.
+
+        Args:
+            timestamp: capture time (func_now clock); defaults to the
+                event's timestamp_ns, then to now
         """
 
+        if timestamp is None:
+            timestamp = capture_time(event)
+
+        if self._repeat_policy != "pass":
+            if event.press:
+                if timestamp is None:
+                    timestamp = self._event_buffer.func_now()
+
+                if self._repeats.press(event.key, timestamp):
+                    self._handle_repeat(event, timestamp)
+                    return
+            else:
+                self._repeats.release(event.key)
+
         valid_event = self._validator(event)
         if valid_event is None:
             return
 
         if event.press:
-            self._handle_key_press(valid_event)
+            self._handle_key_press(valid_event, timestamp)
         else:
-            self._handle_key_release(valid_event)
+            self._handle_key_release(valid_event, timestamp)
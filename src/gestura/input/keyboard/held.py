@@ -0,0 +1,121 @@
+"""
+tests:
+    test_HeldKeyTracker.py
+"""
+
+from typing import Hashable, Optional
+
+from ...models.keyboard import GestureKeyboardCondition
+from .keycodes import KeyTable, UNKNOWN_KEY
+
+
+class HeldKeyTracker:
+    """
+    Set of currently held keys as a bitmask (bit = interned key code).
+
+    Updated on press and release. pynput can miss a release (focus
+    change, lock screen, a hook dropped under load), which would leave a
+    key held forever; a held key whose last press is older than
+    `expiry_seconds` is therefore considered released. OS auto-repeat
+    re-sends the press while a key is really held, which keeps it fresh.
+
+    Keys no gesture uses share UNKNOWN_KEY (bit 0), so holding any of
+    them keeps the mask from equalling a chord. They are tracked by name
+    (`key`), and bit 0 is cleared only once the last of them is released.
+    """
+
+    __slots__ = ("expiry_seconds", "mask", "_pressed_at", "_unknown_pressed_at")
+
+    def __init__(self, expiry_seconds: float = 10.0) -> None:
+        self.expiry_seconds = expiry_seconds
+        self.mask: int = 0
+
+        # code -> time of the latest press (including auto-repeat)
+        self._pressed_at: dict[int, float] = {}
+
+        # Held keys sharing UNKNOWN_KEY, by key name
+        self._unknown_pressed_at: dict[Hashable, float] = {}
+
+    def press(self, code: int, timestamp: float, key: Hashable = None) -> bool:
+        """
+        Mark `code` as held. True if it was not held before
+        (False for auto-repeat).
+
+        Args:
+            key: key name; tells apart the keys sharing UNKNOWN_KEY
+        """
+
+        self.expire(timestamp)
+
+        if code != UNKNOWN_KEY:
+            new = code not in self._pressed_at
+            self._pressed_at[code] = timestamp
+        else:
+            new = key not in self._unknown_pressed_at
+            self._unknown_pressed_at[key] = timestamp
+
+        self.mask |= 1 << code
+        return new
+
+    def release(self, code: int, key: Hashable = None) -> None:
+        if code != UNKNOWN_KEY:
+            self._release_code(code)
+        else:
+            self._release_unknown(key)
+
+    def _release_code(self, code: int) -> None:
+        if self._pressed_at.pop(code, None) is not None:
+            self.mask &= ~(1 << code)
+
+    def _release_unknown(self, key: Hashable) -> None:
+        unknown = self._unknown_pressed_at
+        if unknown.pop(key, None) is not None and not unknown:
+            self.mask &= ~(1 << UNKNOWN_KEY)
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.expiry_seconds
+
+        stale = [code for code, pressed_at in self._pressed_at.items() if pressed_at < cutoff]
+        for code in stale:
+            self._release_code(code)
+
+        stale_unknown = [key for key, pressed_at in self._unknown_pressed_at.items() if pressed_at < cutoff]
+        for key in stale_unknown:
+            self._release_unknown(key)
+
+    def is_held(self, code: int) -> bool:
+        return bool(self.mask >> code & 1)
+
+    def clear(self) -> None:
+        self._pressed_at.clear()
+        self._unknown_pressed_at.clear()
+        self.mask = 0
+
+
+class ChordIndex:
+    """
+    Chord gestures indexed by the bitmask of their keys.
+
+    A chord fires on the press that makes the held set equal to its keys,
+    so matching is one dict lookup on the tracker mask. Auto-repeat
+    presses are not transitions and never fire a chord again.
+
+    Read-only once built (HoldDetector indexes hold gestures the same way).
+    """
+
+    def __init__(self, gestures: list[GestureKeyboardCondition], key_table: KeyTable) -> None:
+        self._index: dict[int, list[GestureKeyboardCondition]] = {}
+
+        for gesture in gestures:
+            mask = 0
+            for code in key_table.encode(gesture.conditions):
+                mask |= 1 << code
+
+            if mask:
+                self._index.setdefault(mask, []).append(gesture)
+
+    def match(self, mask: int) -> Optional[list[GestureKeyboardCondition]]:
+        return self._index.get(mask)
+
+    def __len__(self) -> int:
+        return sum(len(gestures) for gestures in self._index.values())
@@ -0,0 +1,93 @@
+"""
+tests:
+    test_HoldDetector.py
+"""
+
+from typing import Any, Callable, Optional, Protocol
+
+from ...models.keyboard import GestureKeyboardCondition
+from ..tracing import GestureTracer
+from .held import ChordIndex
+from .keycodes import KeyTable
+
+
+class TimerScheduler(Protocol):
+    """
+    Deadline scheduler driven by the detection thread (engine.TimerHeap).
+    """
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> Any: ...
+    def cancel(self, handle: Any) -> None: ...
+
+
+class HoldDetector:
+    """
+    Hold gestures: keys held together (exactly) for `hold_seconds`.
+
+    Reacts only to held-set changes. When the held mask becomes the mask
+    of a hold gesture, a deadline is armed in the scheduler; any later
+    change (release, extra press) cancels it. Nothing runs while the keys
+    stay held, the scheduler wakes the detection thread at the deadline.
+    Each hold fires at most once until the held set changes again.
+
+    Holds are indexed by the mask of their keys like chords; a prebuilt
+    ChordIndex of the hold gestures can be shared through `index`.
+    """
+
+    def __init__(
+        self,
+        gestures: list[GestureKeyboardCondition],
+        key_table: KeyTable,
+        scheduler: TimerScheduler,
+        on_trigger: Callable[[list[str]], None],
+        tracer: Optional[GestureTracer] = None,
+        index: Optional[ChordIndex] = None,
+    ) -> None:
+
+        self._scheduler = scheduler
+        self._on_trigger = on_trigger
+        self.tracer = tracer
+
+        # mask of keys -> hold gestures
+        self._index: ChordIndex = index if index is not None else ChordIndex(gestures, key_table)
+
+        # timers armed for the current held set
+        self._armed_mask: int = 0
+        self._handles: list[Any] = []
+
+    def update(self, mask: int, timestamp: float, event_id: int) -> None:
+        """
+        Held set changed to `mask` at `timestamp` (capture time).
+        """
+
+        if mask == self._armed_mask:
+            return
+
+        self.cancel()
+
+        gestures = self._index.match(mask)
+        if not gestures:
+            return
+
+        self._armed_mask = mask
+        for gesture in gestures:
+            self._handles.append(self._scheduler.call_at(
+                timestamp + gesture.hold_seconds,
+                lambda gesture=gesture: self._fire(gesture, event_id),
+            ))
+
+    def cancel(self) -> None:
+        for handle in self._handles:
+            self._scheduler.cancel(handle)
+
+        self._handles.clear()
+        self._armed_mask = 0
+
+    def _fire(self, gesture: GestureKeyboardCondition, event_id: int) -> None:
+        if self.tracer is not None:
+            self.tracer.match_success(gesture.callback, event_id)
+
+        self._on_trigger([gesture.callback])
+
+    def __len__(self) -> int:
+        return len(self._index)
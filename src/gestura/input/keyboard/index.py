@@ -0,0 +1,42 @@
+"""
+tests:
+    test_MultiSessionEngine.py
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ...models.keyboard import GestureKeyboardCondition
+from .held import ChordIndex
+from .keycodes import KeyTable
+from .pipeline import KeySequenceIndex
+
+
+@dataclass(frozen=True, slots=True)
+class KeyboardIndex:
+    """
+    Read-only matching tables of one keyboard gesture list, by mode.
+    Built once; any number of KeyboardApp streams of that list can share
+    it (KeyboardConfig.index), each keeping only its cursor state.
+    """
+
+    key_table: KeyTable
+    sequences: KeySequenceIndex
+    chords: ChordIndex
+    holds: ChordIndex
+
+    @classmethod
+    def build(
+        cls,
+        gestures: list[GestureKeyboardCondition],
+        key_table: Optional[KeyTable] = None,
+    ) -> "KeyboardIndex":
+        if key_table is None:
+            key_table = KeyTable.from_gestures(gestures)
+
+        return cls(
+            key_table=key_table,
+            sequences=KeySequenceIndex([g for g in gestures if g.mode == "sequence"], key_table),
+            chords=ChordIndex([g for g in gestures if g.mode == "chord"], key_table),
+            holds=ChordIndex([g for g in gestures if g.mode == "hold"], key_table),
+        )
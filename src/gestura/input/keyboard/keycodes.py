@@ -0,0 +1,77 @@
+"""
+tests:
+    test_KeyTable.py
+"""
+
+from typing import Iterable, Sequence
+
+from ...models.keyboard import GestureKeyboardCondition
+
+
+# Code of every key no gesture mentions
+UNKNOWN_KEY = 0
+
+
+class KeyTable:
+    """
+    Interning table: key name <-> small int code.
+
+    Built once from the gesture definitions (config parse time). Only keys
+    used by some gesture get their own code; any other key maps to
+    UNKNOWN_KEY, which can never complete a sequence, so the table does not
+    grow with whatever the user types.
+
+    Matching works on codes; names are only looked up again for logging
+    and tracing.
+    """
+
+    __slots__ = ("_codes", "_names")
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._codes: dict[str, int] = {}
+        self._names: list[str] = ["<unknown>"]
+
+        for name in names:
+            self.intern(name)
+
+    @classmethod
+    def from_gestures(cls, gestures: Iterable[GestureKeyboardCondition]) -> "KeyTable":
+        return cls(key for gesture in gestures for key in gesture.conditions)
+
+    # ------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------
+
+    def intern(self, name: str) -> int:
+        """Code of `name`, assigning the next free one if needed."""
+
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def encode(self, names: Sequence[str]) -> tuple[int, ...]:
+        """Intern a whole key sequence."""
+
+        return tuple(self.intern(name) for name in names)
+
+    # ------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------
+
+    def code(self, name: str) -> int:
+        """Code of `name`, or UNKNOWN_KEY (the table is not modified)."""
+
+        return self._codes.get(name, UNKNOWN_KEY)
+
+    def name(self, code: int) -> str:
+        return self._names[code]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._codes
+
+    def __len__(self) -> int:
+        """Number of interned keys (UNKNOWN_KEY excluded)."""
+
+        return len(self._names) - 1
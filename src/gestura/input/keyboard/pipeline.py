@@ -1,59 +1,130 @@
-import logging
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
 
 from ...models.keyboard import GestureKeyboardCondition
 from ...models.event import EventData_keyboard
+from ..tracing import GestureTracer
+from .automaton import KeySequenceAutomaton
+from .gapped import GappedIndex, GappedSequenceMatcher, latest_start
+from .keycodes import KeyTable
+
+
+class KeySequenceIndex:
+    """
+    Sequence gestures compiled against a KeyTable: the trigger index, the
+    automaton (strict gestures) and the Shift-And groups (max_gap > 0).
+
+    Read-only once built; any number of KeyboardGesturePipeline streams
+    can share it (each keeps its own cursor state).
+    """
+
+    def __init__(self, gestures: List[GestureKeyboardCondition], key_table: KeyTable) -> None:
+        self.gestures = gestures
+        self.key_table = key_table
+        self.sequences: List[Tuple[int, ...]] = [key_table.encode(g.conditions) for g in gestures]
+
+        # last key code -> (gesture, code sequence)
+        self.trigger_index: Dict[int, List[Tuple[GestureKeyboardCondition, Tuple[int, ...]]]] = {}
+        for gesture, sequence in zip(gestures, self.sequences):
+            if sequence:
+                self.trigger_index.setdefault(sequence[-1], []).append((gesture, sequence))
+
+        # Streaming matchers: local index -> gesture index
+        self.strict: List[int] = [i for i, g in enumerate(gestures) if not g.max_gap]
+        self.gapped_index: List[int] = [i for i, g in enumerate(gestures) if g.max_gap]
+
+        self.automaton = KeySequenceAutomaton([self.sequences[i] for i in self.strict])
+        self.gapped = GappedIndex(
+            [self.sequences[i] for i in self.gapped_index],
+            [gestures[i].max_gap for i in self.gapped_index],
+        )
 
 
 class KeyboardGesturePipeline:
     """
-    Keyboard gesture detection pipeline (contiguous, completion-based).
+    Keyboard gesture detection pipeline (completion-based).
 
     Design:
     - Indexed by LAST key (completion trigger)
-    - Strict contiguous matching
-    - No gap support
+    - Strict contiguous matching by default
+    - Gestures with max_gap > 0 allow up to max_gap other presses
+      between two of their keys (bit-parallel, GappedSequenceMatcher)
     - Prevent duplicate reporting
+    - Keys are compared as interned int codes (KeyTable)
+
+    Two entry points:
+    - process_event(): streaming, one automaton step (+ one Shift-And
+      step per distinct max_gap) per key press (no buffer snapshot)
+    - process_for_trigger(): tail match over a buffer snapshot
+
+    The compiled KeySequenceIndex is built from `gestures` / `key_table`
+    when `index` is None; a prebuilt one is shared as is (its gestures and
+    key table are used).
     """
 
     def __init__(
         self,
         gestures: List[GestureKeyboardCondition],
+        tracer: Optional[GestureTracer] = None,
+        key_table: Optional[KeyTable] = None,
+        index: Optional[KeySequenceIndex] = None,
     ) -> None:
 
-        self._gestures = gestures
+        if index is None:
+            # Shared with KeyboardApp so events arrive already interned
+            index = KeySequenceIndex(gestures, key_table if key_table is not None else KeyTable())
 
-        # last_key -> gestures
-        self._trigger_index: Dict[str, List[GestureKeyboardCondition]] = {}
+        self._index = index
+        self._gestures = index.gestures
+        self.tracer = tracer
+        self.key_table = index.key_table
 
         # callback -> last reported end_id
         self._last_occurrence_end_id: Dict[str, int] = {}
 
-        self._build_trigger_index()
-
-    # ------------------------------------------------------------
-    # Index Building
-    # ------------------------------------------------------------
+        self._strict: List[int] = index.strict
+        self._gapped_index: List[int] = index.gapped_index
+        self._automaton = index.automaton
+        self._gapped = GappedSequenceMatcher(index=index.gapped)
 
-    def _build_trigger_index(self) -> None:
-        for gesture in self._gestures:
-            last_key = gesture.conditions[-1]
-            self._trigger_index.setdefault(last_key, []).append(gesture)
+        # Streaming state: automaton state + ids of the latest presses
+        self._state: int = 0
+        self._recent_ids: Deque[int] = deque(
+            maxlen=max(self._automaton.max_length, self._gapped.span, 1)
+        )
 
     # ------------------------------------------------------------
     # Internal Matching
     # ------------------------------------------------------------
 
+    def _code(self, event: EventData_keyboard) -> int:
+        """
+        Interned code of an event (events not built by KeyboardApp are
+        looked up by name).
+        """
+
+        code = event.code
+        if code is None:
+            return self.key_table.code(event.key)
+        return code
+
     def _sequence_end_id(
         self,
-        sequence: List[str],
+        sequence: Tuple[int, ...],
         events: List[EventData_keyboard],
+        max_gap: int = 0,
     ) -> Optional[int]:
         """
-        Strict contiguous tail match.
-        Returns end_id if sequence matches the last events exactly.
+        Strict contiguous tail match (or gap-tolerant when max_gap > 0).
+        Returns end_id if sequence matches the last events.
         """
 
+        if max_gap:
+            codes = [self._code(e) for e in events]
+            if latest_start(codes, sequence, max_gap) is None:
+                return None
+            return events[-1].id
+
         seq_len = len(sequence)
 
         if len(events) < seq_len:
@@ -62,49 +133,139 @@ class KeyboardGesturePipeline:
         tail = events[-seq_len:]
 
         for i in range(seq_len):
-            if tail[i].key != sequence[i]:
+            if self._code(tail[i]) != sequence[i]:
                 return None
 
         return tail[-1].id
 
+    def _trace_fail(self, index: int) -> None:
+        if self.tracer is not None:
+            gesture = self._gestures[index]
+            self.tracer.match_fail(gesture.callback, gesture.conditions)
+
+    def _report(self, gesture: GestureKeyboardCondition, end_id: int) -> bool:
+        """
+        Apply duplicate suppression; True if the occurrence is new.
+        """
+
+        # Prevent duplicate reporting of same occurrence
+        if self._last_occurrence_end_id.get(gesture.callback) == end_id:
+            return False
+
+        self._last_occurrence_end_id[gesture.callback] = end_id
+
+        if self.tracer is not None:
+            self.tracer.match_success(gesture.callback, end_id)
+
+        return True
+
     # ------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------
 
+    def process_event(
+        self,
+        event: EventData_keyboard,
+        window_start: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Streaming entry point: consume the newest key press.
+
+        Cost is one automaton step (+ one Shift-And step per distinct
+        max_gap) plus the completed sequences.
+
+        Args:
+            event: newest press (ids must be increasing)
+            window_start: id of the oldest press still inside the time
+                window; sequences starting before it are ignored
+        """
+
+        event_id: int = event.id  # type: ignore[assignment]
+        code = self._code(event)
+
+        self._state = self._automaton.step(self._state, code)
+
+        recent = self._recent_ids
+        recent.append(event_id)
+
+        strict = self._strict
+        matched: List[int] = []
+
+        # Shortest first: once a sequence starts outside the window,
+        # every longer one does too
+        outputs = self._automaton.outputs(self._state)
+        for position, local in enumerate(outputs):
+            length = self._automaton.lengths[local]
+            if window_start is not None and recent[-length] < window_start:
+                for failed in outputs[position:]:
+                    self._trace_fail(strict[failed])
+                break
+            matched.append(strict[local])
+
+        if self._gapped_index:
+            for local in self._gapped.step(code):
+                # the latest start is only searched for completed gestures
+                offset = self._gapped.start_offset(local)
+                if offset is None or (window_start is not None and recent[-offset - 1] < window_start):
+                    self._trace_fail(self._gapped_index[local])
+                    continue
+                matched.append(self._gapped_index[local])
+
+        if not matched:
+            return []
+
+        # Report in gesture definition order
+        if len(matched) > 1:
+            matched.sort()
+
+        matched_callbacks: List[str] = []
+        for index in matched:
+            gesture = self._gestures[index]
+            if self._report(gesture, event_id):
+                matched_callbacks.append(gesture.callback)
+
+        return matched_callbacks
+
+    def reset(self) -> None:
+        """
+        Forget streaming progress (duplicate suppression is kept).
+        """
+
+        self._state = 0
+        self._recent_ids.clear()
+        self._gapped.reset()
+
     def process_for_trigger(
         self,
-        trigger_key: str,
+        trigger_key: Union[str, int],
         event_sequence: List[EventData_keyboard],
     ) -> List[str]:
 
         matched_callbacks: List[str] = []
 
-        relevant_gestures = self._trigger_index.get(trigger_key)
+        if isinstance(trigger_key, str):
+            trigger_key = self.key_table.code(trigger_key)
+
+        relevant_gestures = self._index.trigger_index.get(trigger_key)
         if not relevant_gestures:
             return matched_callbacks
 
-        logging.debug(
-            f"[KeyboardPipeline] Evaluating {len(relevant_gestures)} "
-            f"gestures for trigger '{trigger_key}'"
-        )
+        tracer = self.tracer
 
-        for gesture in relevant_gestures:
+        for gesture, sequence in relevant_gestures:
 
             end_id = self._sequence_end_id(
-                sequence=gesture.conditions,
+                max_gap=gesture.max_gap,
+                sequence=sequence,
                 events=event_sequence,
             )
 
             if end_id is None:
+                if tracer is not None:
+                    tracer.match_fail(gesture.callback, gesture.conditions)
                 continue
 
-            last_end_id = self._last_occurrence_end_id.get(gesture.callback)
-
-            # Prevent duplicate reporting of same occurrence
-            if last_end_id == end_id:
-                continue
-
-            self._last_occurrence_end_id[gesture.callback] = end_id
-            matched_callbacks.append(gesture.callback)
+            if self._report(gesture, end_id):
+                matched_callbacks.append(gesture.callback)
 
         return matched_callbacks
@@ -0,0 +1,47 @@
+"""
+tests:
+    test_AutoRepeat.py
+"""
+
+from typing import Literal, Optional
+
+
+# pass:     every repeat is a new press (previous behavior)
+# drop:     repeats are discarded at ingress
+# collapse: repeats are discarded, but keep the original press alive
+#           in the time window (one "held" press instead of many)
+RepeatPolicy = Literal["pass", "drop", "collapse"]
+
+
+class AutoRepeatDetector:
+    """
+    Recognizes OS auto-repeat: a press of the key pressed last, with no
+    release of it in between, at most `max_interval` after its previous
+    press (or repeat).
+
+    Only the last pressed key can auto-repeat (pressing another key stops
+    the repeat on every major OS), so a single slot is enough. The
+    interval bound keeps a missed release from turning a later real
+    press into a "repeat".
+
+    Works on raw adapter keys, before normalization or any allocation.
+    """
+
+    __slots__ = ("max_interval", "_key", "_last")
+
+    def __init__(self, max_interval: float = 1.0) -> None:
+        self.max_interval = max_interval
+        self._key: Optional[str] = None
+        self._last: float = 0.0
+
+    def press(self, key: str, timestamp: float) -> bool:
+        """True if this press is an auto-repeat."""
+
+        repeat = key == self._key and timestamp - self._last <= self.max_interval
+        self._key = key
+        self._last = timestamp
+        return repeat
+
+    def release(self, key: str) -> None:
+        if key == self._key:
+            self._key = None
@@ -1,11 +1,11 @@
 import logging
 from typing import Callable, Optional
 
-from ...models.inputs import MouseEvent, MouseMoveEvent
+from ...models.inputs import MouseEvent, MouseMoveEvent, capture_time
 from ...config import MouseConfig
 from ...models.event import EventData_click, MouseButtons, EventData_move
 from .pipeline import MouseGesturePipeline
-from ..event_buffer import EventBuffer
+from ..move_buffer import MoveRingBuffer
 
 
 class MouseApp:
@@ -13,7 +13,7 @@ class MouseApp:
     Event-driven mouse gesture handler.
 
     Design principles:
-    - Time-windowed buffering (via EventBuffer)
+    - Time-windowed buffering (via MoveRingBuffer)
     - Lightweight activation guard (min sample count)
     - All gesture recognition delegated to MouseGesturePipeline
     - No motion accumulation state in this layer
@@ -31,11 +31,16 @@ class MouseApp:
         # Pipeline handles all recognition logic
         self._pipeline = MouseGesturePipeline(
             gesture_definitions=config.gestures,
-            segment_min_delta=config.min_delta
+            segment_min_delta=config.min_delta,
+            tracer=config.tracer,
+            trie=config.trie,
         )
 
-        # Time-sliced event buffer
-        self._buffer = EventBuffer(window=config.BufferWindowSeconds)
+        # Time-sliced columnar move history
+        self._buffer = MoveRingBuffer(
+            window=config.BufferWindowSeconds,
+            capacity=config.BufferCapacity
+        )
 
     # ------------------------------------------------------------------ #
     # Validator
@@ -89,14 +94,13 @@ class MouseApp:
 
         return False
 
-    def _handle_move(self, event: EventData_move) -> None:
+    def _handle_move(self, event: EventData_move, timestamp: Optional[float] = None) -> None:
         """
         Add move event to buffer and evaluate gestures if sufficient data exists.
         """
-        self._buffer.add(event)
+        self._buffer.append(event.id, event.x, event.y, timestamp)  # type: ignore[arg-type]
 
-        # Lightweight guard — prevents processing extremely small sequences
-        self._evaluate_gestures()
+        self._evaluate_gestures(event, timestamp)
 
     def _handle_click(self, event: EventData_click) -> None:
         """
@@ -110,26 +114,42 @@ class MouseApp:
     # Core Processing
     # ------------------------------------------------------------------ #
 
-    def _evaluate_gestures(self):
+    def _evaluate_gestures(self, event: EventData_move, timestamp: Optional[float] = None):
         """
-        Snapshot current buffer and delegate recognition to pipeline.
+        Feed the newest move to the streaming pipeline.
+        The buffer only provides the window start (measured at the
+        capture time of this move); no snapshot is taken.
         """
 
-        snapshot = self._buffer.snapshot()
-        callbacks = self._pipeline.process_for_trigger(snapshot)
+        oldest = self._buffer.oldest(timestamp)
+
+        callbacks = self._pipeline.process_event(
+            event,
+            window_start=None if oldest is None else oldest[0],
+        )
 
         self._emit_callback(callbacks)
 
     # ------------------------------------------------------------------ #
     # API
     # ------------------------------------------------------------------ #
-    def HandleEvens(self, event: MouseEvent) -> None:
+    def HandleEvens(self, event: MouseEvent, timestamp: Optional[float] = None) -> None:
+        """
+        Main entry point for incoming mouse events.
+
+        Args:
+            timestamp: capture time (func_now clock); defaults to the
+                event's timestamp_ns, then to now
+        """
+
+        if timestamp is None:
+            timestamp = capture_time(event)
 
         valid_event = self._validator(event)
         if valid_event is None:
             return
 
         if valid_event.type == "move":
-            self._handle_move(valid_event)
+            self._handle_move(valid_event, timestamp)
         elif valid_event.type == "click":
             self._handle_click(valid_event)
@@ -0,0 +1,516 @@
+"""
+tests:
+    test_MouseGestureMatcher.py
+    test_SegmentStream.py
+"""
+
+from bisect import bisect_right
+from collections import deque
+from typing import Optional, Sequence, Tuple
+import math
+
+from ...models.mouse import GestureMouseCondition
+from ..tracing import GestureTracer
+from .segments import Segment
+from .trie import ChildGroup, GestureTrie, TrieNode
+
+
+# (node, last_end_id)
+_TokenKey = Tuple[TrieNode, int]
+
+# start_id, end_id (None when open), axis, trend, lower bound, upper bound
+_TentativeKey = Tuple[int, Optional[int], int, int, float, float]
+
+# tails per axis + (end_id, axis, trend, lower bound, upper bound) per head segment
+_HeadKey = Tuple[Tuple[float, float], Tuple[Tuple[int, int, int, float, float], ...]]
+
+
+class MouseGestureMatcher:
+    """
+    Incremental multi-condition matcher (NFA over closed segments).
+
+    Gestures are compiled into a GestureTrie, so gestures sharing a
+    condition prefix share its progress. A token is a partial match:
+        (trie node, last_end_id) + end_id of its first segment
+
+    Tokens wait in an index keyed by the (axis, trend) of the child group
+    they need next, and only move when a segment with that key closes.
+    Children of a group are sorted by min_delta, so one segment advances
+    a contiguous run of them and the token keeps the index of the first
+    child still waiting.
+
+    Open (tentative) segments are evaluated against the waiting tokens
+    without changing state.
+
+    Evaluation is skipped while nothing it depends on has changed:
+    no token moved and every tentative segment keeps its start, trend and
+    threshold bucket (the interval between two consecutive configured
+    min_delta values of its (axis, trend)). The previous result is then
+    reused, with open-segment end ids moved to the newest sample.
+
+    Time window (on_window): the first closed segments of the window can
+    differ from the ones tokens were built from (a segment straddling the
+    window start is truncated, see SegmentStream.head). A token only
+    depends on segments ending at or after its first one, so when the
+    head changes, tokens whose first segment ends inside the changed part
+    are dropped and restarted from the window's segments there. The head
+    only matters through end ids and threshold buckets, so this happens
+    once per segment leaving the window or threshold crossing, not on
+    every move.
+
+    Tracing: a dropped token that does not start again is a partial match
+    that expired; match_fail is traced for every condition it still
+    awaited. Successes are traced by the occurrence filter, once they
+    trigger.
+
+    Reports the same (callback, end_id) occurrences as
+    `MouseGestureDetector.match_segments` over the same segments:
+    each condition is satisfied by the first eligible segment
+    (end_id >= previous end_id) of its axis.
+
+    The trie is built from `gesture_definitions` when `trie` is None; a
+    prebuilt one is only read, so several matchers can share it.
+    """
+
+    def __init__(
+        self,
+        gesture_definitions: list[GestureMouseCondition],
+        tracer: Optional[GestureTracer] = None,
+        trie: Optional[GestureTrie] = None,
+    ) -> None:
+
+        self.tracer = tracer
+
+        self._trie = trie if trie is not None else GestureTrie(gesture_definitions)
+
+        # (axis, trend) -> sorted distinct min_delta of every condition
+        self._thresholds: dict[Tuple[int, int], list[int]] = self._trie.thresholds()
+
+        # (axis, trend) -> waiting tokens -> [first segment end_id, first waiting child]
+        self._waiting: dict[Tuple[int, int], dict[_TokenKey, list[int]]] = {}
+
+        # closed segments per axis code inside the window (ordered by end_id)
+        self._recent: tuple[deque[Segment], deque[Segment]] = (deque(), deque())
+
+        # window head the tokens were built with (see on_window)
+        self._head: tuple[list[Segment], list[Segment]] = ([], [])
+        self._tails: Tuple[float, float] = (-math.inf, -math.inf)
+        self._head_key: Optional[_HeadKey] = None
+
+        # tokens placed while the head is rebuilt (only when tracing)
+        self._placed: Optional[set[_TokenKey]] = None
+
+        # last evaluate() input/result; reused while nothing relevant changes
+        self._last_keys: Optional[list[_TentativeKey]] = None
+        self._last_newest: int = -1
+        self._last_occurrences: list[Tuple[str, int]] = []
+
+    # ============================================================
+    # PUBLIC
+    # ============================================================
+
+    def on_segment_closed(self, segment: Segment) -> list[Tuple[str, int]]:
+        """
+        Advance tokens with a newly closed segment.
+        Returns completed (callback, end_id) occurrences.
+        """
+
+        occurrences: list[Tuple[str, int]] = []
+
+        self._recent[segment.axis].append(segment)
+        self._last_keys = None
+
+        key = (segment.axis, segment.trend)
+        delta = segment.delta
+        end_id = segment.end_id
+
+        # 1. Move waiting tokens that this segment satisfies
+        waiting = self._waiting.get(key)
+        if waiting:
+            advanced: list[Tuple[TrieNode, int]] = []
+
+            for token, entry in list(waiting.items()):
+                node, last_end = token
+                if end_id < last_end:
+                    continue
+
+                origin, first = entry
+                group = node.groups[key]
+
+                children = group.satisfied(delta, first)
+                if not children:
+                    continue
+
+                advanced.extend((child, origin) for child in children)
+
+                first += len(children)
+                if first == len(group.nodes):
+                    del waiting[token]
+                else:
+                    entry[1] = first
+
+            for child, origin in advanced:
+                self._arrive(child, end_id, origin, occurrences)
+
+        # 2. Start new tokens
+        self._start(segment, occurrences)
+
+        return occurrences
+
+    def evaluate(self, tentative: list[Segment]) -> list[Tuple[str, int]]:
+        """
+        Occurrences completed with the help of tentative (open) segments.
+        Token state is not modified.
+        """
+
+        if not tentative:
+            self._last_keys = []
+            self._last_occurrences = []
+            return []
+
+        newest = max(s.end_id for s in tentative)
+
+        if self._unchanged(tentative, newest):
+            previous = self._last_newest
+            self._last_newest = newest
+            self._last_occurrences = [
+                (callback, newest if end_id == previous else end_id)
+                for callback, end_id in self._last_occurrences
+            ]
+            return list(self._last_occurrences)
+
+        occurrences = self._evaluate(tentative)
+
+        self._last_keys = [self._tentative_key(s, newest) for s in tentative]
+        self._last_newest = newest
+        self._last_occurrences = occurrences
+        return list(occurrences)
+
+    def on_window(
+        self,
+        head: list[Segment],
+        tails: Tuple[float, float],
+        originals: Tuple[Sequence[Segment], Sequence[Segment]],
+        closed: list[Segment],
+    ) -> list[Tuple[str, int]]:
+        """
+        Windowed counterpart of on_segment_closed().
+
+        Args:
+            head, tails: window head (see SegmentStream.head)
+            originals: the stream's own closed segments per axis
+                (SegmentStream.originals), newly closed ones included
+            closed: segments closed by the newest move with
+                start_id >= tail of their axis
+
+        Returns completed (callback, end_id) occurrences.
+        """
+
+        occurrences: list[Tuple[str, int]] = []
+
+        key = (tails, tuple(self._head_segment_key(segment) for segment in head))
+        if key != self._head_key:
+            self._rebase(head, tails, originals, closed, occurrences)
+            self._head_key = key
+
+        for segment in closed:
+            occurrences += self.on_segment_closed(segment)
+
+        return occurrences
+
+    def reset(self) -> None:
+        self._waiting.clear()
+        for recent in self._recent:
+            recent.clear()
+        self._head = ([], [])
+        self._tails = (-math.inf, -math.inf)
+        self._head_key = None
+        self._last_keys = None
+        self._last_occurrences = []
+
+    # ============================================================
+    # INTERNAL
+    # ============================================================
+
+    def _rebase(
+        self,
+        head: list[Segment],
+        tails: Tuple[float, float],
+        originals: Tuple[Sequence[Segment], Sequence[Segment]],
+        closed: list[Segment],
+        occurrences: list[Tuple[str, int]],
+    ) -> None:
+        """
+        Replace the window head. Closed segments per axis stay
+        head + originals from the tail on; `closed` is left to the caller.
+        """
+
+        self._last_keys = None
+
+        # end of the part that changed: old and new heads, and the stream
+        # segments between the old and new tail (a tail is a run start,
+        # so those end at or before it)
+        changed = -math.inf
+        for segment in (*self._head[0], *self._head[1], *head):
+            changed = max(changed, segment.end_id)
+
+        new_head: tuple[list[Segment], list[Segment]] = ([], [])
+        for segment in head:
+            new_head[segment.axis].append(segment)
+
+        for axis, recent in enumerate(self._recent):
+            old_tail, tail = self._tails[axis], tails[axis]
+            if tail != old_tail:
+                changed = max(changed, old_tail, tail)
+
+            for _ in self._head[axis]:
+                recent.popleft()
+
+            if tail >= old_tail:
+                while recent and recent[0].start_id < tail:
+                    recent.popleft()
+            else:
+                fresh = {segment.start_id for segment in closed if segment.axis == axis}
+                recent.extendleft(reversed([
+                    segment for segment in originals[axis]
+                    if tail <= segment.start_id < old_tail and segment.start_id not in fresh
+                ]))
+
+            recent.extendleft(reversed(new_head[axis]))
+
+        self._head = new_head
+        self._tails = tails
+
+        # A token only depends on segments ending at or after its first
+        # one: tokens started after the change are still valid, the
+        # others are started again from the window's segments.
+        stale: list[Tuple[_TokenKey, Tuple[int, int], int]] = []
+        for key, waiting in self._waiting.items():
+            for token, (origin, first) in list(waiting.items()):
+                if origin <= changed:
+                    stale.append((token, key, first))
+                    del waiting[token]
+
+        tracer = self.tracer
+        placed: set[_TokenKey] = set()
+        if tracer is not None:
+            self._placed = placed
+
+        for recent in self._recent:
+            for segment in recent:
+                if segment.end_id > changed:
+                    break
+                self._start(segment, occurrences)
+
+        if tracer is not None:
+            self._placed = None
+            self._trace_expired(tracer, stale, placed)
+
+    @staticmethod
+    def _trace_expired(
+        tracer: GestureTracer,
+        stale: list[Tuple[_TokenKey, Tuple[int, int], int]],
+        placed: set[_TokenKey],
+    ) -> None:
+        """
+        match_fail for the conditions still awaited by tokens the window
+        dropped and could not start again: their first segment left the
+        window (or changed) before the gesture completed.
+        """
+
+        for token, key, first in stale:
+            if token in placed:
+                continue
+
+            node, _ = token
+            for child in node.groups[key].nodes[first:]:
+                for callback in child.below:
+                    tracer.match_fail(callback, child.source)
+
+    def _bucket(self, segment: Segment) -> Tuple[float, float]:
+        """
+        Threshold bucket of the segment's delta: the delta only matters
+        through the conditions of its (axis, trend) it satisfies.
+        """
+
+        thresholds = self._thresholds.get((segment.axis, segment.trend), ())
+        i = bisect_right(thresholds, segment.delta)
+        lower = thresholds[i - 1] if i else float("-inf")
+        upper = thresholds[i] if i < len(thresholds) else float("inf")
+        return lower, upper
+
+    def _tentative_key(self, segment: Segment, newest: int) -> _TentativeKey:
+        """
+        Everything evaluate() depends on for one tentative segment.
+        """
+
+        end_id = segment.end_id
+        lower, upper = self._bucket(segment)
+
+        return segment.start_id, (None if end_id == newest else end_id), segment.axis, segment.trend, lower, upper
+
+    def _head_segment_key(self, segment: Segment) -> Tuple[int, int, int, float, float]:
+        """
+        Everything the tokens depend on for one closed segment.
+        """
+
+        return (segment.end_id, segment.axis, segment.trend, *self._bucket(segment))
+
+    def _unchanged(self, tentative: list[Segment], newest: int) -> bool:
+        """
+        O(len(tentative)) check that the last evaluate() result still holds.
+        """
+
+        last = self._last_keys
+        if last is None or len(last) != len(tentative):
+            return False
+
+        for segment, (start_id, end_id, axis, trend, lower, upper) in zip(tentative, last):
+            if (
+                segment.start_id != start_id
+                or segment.axis != axis
+                or segment.trend != trend
+                or not lower <= segment.delta < upper
+            ):
+                return False
+
+            segment_end = segment.end_id
+            if (None if segment_end == newest else segment_end) != end_id:
+                return False
+
+        return True
+
+    def _evaluate(self, tentative: list[Segment]) -> list[Tuple[str, int]]:
+        occurrences: list[Tuple[str, int]] = []
+
+        by_axis: tuple[list[Segment], list[Segment]] = ([], [])
+        for segment in tentative:
+            by_axis[segment.axis].append(segment)
+
+        keys = {(s.axis, s.trend) for s in tentative}
+
+        # Waiting tokens
+        for key in keys:
+            waiting = self._waiting.get(key)
+            if not waiting:
+                continue
+
+            # waiting tokens have already seen every closed segment
+            for (node, last_end), (_, first) in waiting.items():
+                self._walk_group(node.groups[key], last_end, by_axis, occurrences, first, closed=False)
+
+        # Tokens starting on a tentative segment
+        for segment in tentative:
+            group = self._trie.first_group(segment)
+            if group is not None:
+                for child in group.satisfied(segment.delta):
+                    self._walk(child, segment.end_id, by_axis, occurrences)
+
+        return occurrences
+
+    def _eligible(self, axis: int, last_end: int) -> list[Segment]:
+        """
+        Closed segments of `axis` with end_id >= last_end, oldest first.
+        """
+
+        eligible: list[Segment] = []
+        for segment in reversed(self._recent[axis]):
+            if segment.end_id < last_end:
+                break
+            eligible.append(segment)
+
+        eligible.reverse()
+        return eligible
+
+    def _report(self, node: TrieNode, end_id: int, occurrences: list[Tuple[str, int]]) -> None:
+        for _, callback in node.callbacks:
+            occurrences.append((callback, end_id))
+
+    def _start(self, segment: Segment, occurrences: list[Tuple[str, int]]) -> None:
+        """
+        Start the tokens whose first segment is `segment`.
+        """
+
+        group = self._trie.first_group(segment)
+        if group is not None:
+            for child in group.satisfied(segment.delta):
+                self._arrive(child, segment.end_id, segment.end_id, occurrences)
+
+    def _arrive(
+        self,
+        node: TrieNode,
+        last_end: int,
+        origin: int,
+        occurrences: list[Tuple[str, int]],
+    ) -> None:
+        """
+        Place a token on `node`, consuming already closed segments greedily.
+        """
+
+        self._report(node, last_end, occurrences)
+
+        if self._placed is not None:
+            self._placed.add((node, last_end))
+
+        for key, group in node.groups.items():
+            pairs, first = group.assign(self._eligible(group.axis, last_end), last_end)
+
+            for child, segment in pairs:
+                self._arrive(child, segment.end_id, origin, occurrences)
+
+            if first == len(group.nodes):
+                continue
+
+            waiting = self._waiting.setdefault(key, {})
+            token = (node, last_end)
+
+            # same state from several first segments: the latest one
+            # keeps it alive longest (see _rebase)
+            entry = waiting.get(token)
+            if entry is None:
+                waiting[token] = [origin, first]
+            else:
+                entry[0] = max(entry[0], origin)
+                entry[1] = min(entry[1], first)
+
+    def _walk(
+        self,
+        node: TrieNode,
+        last_end: int,
+        by_axis: tuple[list[Segment], list[Segment]],
+        occurrences: list[Tuple[str, int]],
+    ) -> None:
+        """
+        Greedy completion of a token that only exists with tentative
+        segments. Closed segments still qualify when they end after
+        `last_end`: a tentative segment can end before closed segments of
+        the other axis (an undecided reversal, or the truncated start of
+        the window), and nothing has consumed them for this token.
+        """
+
+        self._report(node, last_end, occurrences)
+
+        for group in node.groups.values():
+            self._walk_group(group, last_end, by_axis, occurrences)
+
+    def _walk_group(
+        self,
+        group: ChildGroup,
+        last_end: int,
+        by_axis: tuple[list[Segment], list[Segment]],
+        occurrences: list[Tuple[str, int]],
+        first: int = 0,
+        closed: bool = True,
+    ) -> None:
+        segments = by_axis[group.axis]
+
+        # closed segments of an axis always come before its tentative ones
+        if closed:
+            eligible = self._eligible(group.axis, last_end)
+            if eligible:
+                segments = eligible + segments
+
+        pairs, _ = group.assign(segments, last_end, first)
+
+        for child, segment in pairs:
+            self._walk(child, segment.end_id, by_axis, occurrences)
@@ -6,10 +6,18 @@ tests:
 """
 
 import logging
-from typing import Any, Tuple, Optional
+from typing import Tuple, Optional, TYPE_CHECKING
 
 from ...models.mouse import GestureMouseCondition
 from ...models.event import EventData_move
+from .segments import AXES, AXIS_X, AXIS_Y, Segment, SegmentStream, by_start_id
+from .trie import GestureTrie, TrieNode
+from .matcher import MouseGestureMatcher
+from ..move_buffer import MoveRingBuffer
+from ..tracing import GestureTracer
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
 
 
 class MouseGestureDetector:
@@ -17,6 +25,9 @@ class MouseGestureDetector:
     Pure gesture detector.
     No deduplication. No filtering.
     Returns raw occurrences.
+
+    Traces segments, reversals and failed conditions; successes are
+    traced by MouseGestureOccurrenceFilter, once they trigger.
     """
 
     def __init__(
@@ -25,64 +36,55 @@ class MouseGestureDetector:
         segment_min_delta: float,
         jitter_max_delta: Optional[float] = None,
         lookahead: int = 2,
+        tracer: Optional[GestureTracer] = None,
+        trie: Optional[GestureTrie] = None,
     ):
         self.gesture_definitions = gesture_definitions
         self.segment_min_delta = segment_min_delta
         self.jitter_max_delta = jitter_max_delta or segment_min_delta
         self.lookahead = lookahead
+        self.tracer = tracer
 
-        self._first_condition_index: dict[Tuple[str, str], list[GestureMouseCondition]] = {}
-        self._build_first_condition_index()
+        # shared-prefix index of all gestures (root children = first conditions)
+        self._trie = trie if trie is not None else GestureTrie(gesture_definitions)
 
     # ============================================================
-    # INDEX
+    # SEGMENT EXTRACTION
     # ============================================================
 
-    def _build_first_condition_index(self) -> None:
-        for gesture in self.gesture_definitions:
-            first = gesture.conditions[0]
-            key = (first.axis, first.trend)
-            self._first_condition_index.setdefault(key, []).append(gesture)
+    def _movement_trend(self, delta: float) -> int:
+        if delta > 0:
+            return 1
+        if delta < 0:
+            return -1
+        return 0
 
-    # ============================================================
-    # SEGMENT EXTRACTION
-    # ============================================================
+    def extract_segments(self, events: list[EventData_move]) -> list[Segment]:
+        segments: list[Segment] = []
+        segments += self._build_axis_segments(events, AXIS_X)
+        segments += self._build_axis_segments(events, AXIS_Y)
 
-    def _movement_trend(self, axis: str, delta: float) -> Optional[str]:
-        if delta == 0:
-            return None
-        if axis == "x":
-            return "right" if delta > 0 else "left"
-        return "down" if delta > 0 else "up"
-
-    def extract_segments(self, events: list[EventData_move]) -> list[dict[str, Any]]:
-        segments: list[dict[str, Any]] = []
-        segments += self._build_axis_segments(events, "x")
-        segments += self._build_axis_segments(events, "y")
-
-        segments.sort(key=lambda s: s["start_id"])
-
-        logging.debug(
-            "[Segments] %s",
-            [
-                f"{s['axis']}:{s['trend']} Δ{s['delta']} ({s['start_id']}→{s['end_id']})"
-                for s in segments
-            ]
-        )
+        segments.sort(key=by_start_id)
+
+        tracer = self.tracer
+        if tracer is not None:
+            for segment in segments:
+                tracer.segment_closed(segment)
 
         return segments
 
     def _build_axis_segments(
         self,
         events: list[EventData_move],
-        axis: str,
-    ) -> list[dict[str, Any]]:
+        axis_code: int,
+    ) -> list[Segment]:
 
-        segments: list[dict[str, Any]] = []
+        segments: list[Segment] = []
+        axis = AXES[axis_code]
 
         start_index = 0
         start_value = getattr(events[0], axis)
-        current_trend: Optional[str] = None
+        current_trend = 0
 
         for i in range(1, len(events)):
 
@@ -90,25 +92,17 @@ class MouseGestureDetector:
             curr = events[i]
 
             delta = getattr(curr, axis) - getattr(prev, axis)
-            new_trend = self._movement_trend(axis, delta)
+            new_trend = self._movement_trend(delta)
 
             if not new_trend:
                 continue
 
-            if current_trend is None:
+            if not current_trend:
                 current_trend = new_trend
                 continue
 
             if new_trend != current_trend:
 
-                logging.debug(
-                    "[TrendChange] axis=%s id=%s %s→%s",
-                    axis,
-                    curr.id,
-                    current_trend,
-                    new_trend,
-                )
-
                 # decide if real reversal
                 if not self._is_real_reversal(
                     events,
@@ -123,13 +117,10 @@ class MouseGestureDetector:
                 delta_total = abs(getattr(prev, axis) - start_value)
 
                 if delta_total >= self.segment_min_delta:
-                    segments.append({
-                        "start_id": events[start_index].id,
-                        "end_id": prev.id,
-                        "axis": axis,
-                        "trend": current_trend,
-                        "delta": int(delta_total),
-                    })
+                    segments.append(Segment(
+                        events[start_index].id, prev.id,  # type: ignore[arg-type]
+                        axis_code, current_trend, int(delta_total),
+                    ))
 
                 start_index = i - 1
                 start_value = getattr(prev, axis)
@@ -140,13 +131,10 @@ class MouseGestureDetector:
             delta_total = abs(getattr(events[-1], axis) - start_value)
 
             if delta_total >= self.segment_min_delta:
-                segments.append({
-                    "start_id": events[start_index].id,
-                    "end_id": events[-1].id,
-                    "axis": axis,
-                    "trend": current_trend,
-                    "delta": int(delta_total),
-                })
+                segments.append(Segment(
+                    events[start_index].id, events[-1].id,  # type: ignore[arg-type]
+                    axis_code, current_trend, int(delta_total),
+                ))
 
         return segments
 
@@ -155,135 +143,165 @@ class MouseGestureDetector:
         events: list[EventData_move],
         axis: str,
         index: int,
-        current_trend: str,
+        current_trend: int,
         delta: float,
     ) -> bool:
         """
         Decide if trend change is real or jitter.
         """
 
+        real = self._judge_reversal(events, axis, index, current_trend, delta)
+
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.reversal(axis, events[index].id, delta, real)  # type: ignore[arg-type]
+
+        return real
+
+    def _judge_reversal(
+        self,
+        events: list[EventData_move],
+        axis: str,
+        index: int,
+        current_trend: int,
+        delta: float,
+    ) -> bool:
+
         # 1️⃣ Large jump → always real
         if abs(delta) >= self.jitter_max_delta:
-            logging.debug(
-                "[Reversal] Large jump axis=%s id=%s Δ=%s → REAL",
-                axis,
-                events[index].id,
-                delta,
-            )
             return True
 
         # 2️⃣ Small movement → lookahead confirmation
-        opposite_trend = self._movement_trend(axis, delta)
+        opposite_trend = -current_trend
         confirm = 0
 
         max_check = min(len(events), index + self.lookahead + 1)
 
         for j in range(index + 1, max_check):
             d = getattr(events[j], axis) - getattr(events[j - 1], axis)
-            trend = self._movement_trend(axis, d)
+            trend = self._movement_trend(d)
 
             if trend == opposite_trend:
                 confirm += 1
             elif trend == current_trend:
-                logging.debug(
-                    "[Reversal] JITTER axis=%s id=%s → ignored",
-                    axis,
-                    events[index].id,
-                )
                 return False
 
-        if confirm >= self.lookahead:
-            logging.debug(
-                "[Reversal] Confirmed axis=%s id=%s → REAL",
-                axis,
-                events[index].id,
-            )
-            return True
-
-        logging.debug(
-            "[Reversal] Not enough confirmation axis=%s id=%s → JITTER",
-            axis,
-            events[index].id,
-        )
-        return False
+        return confirm >= self.lookahead
 
     # ============================================================
     # MATCHING
     # ============================================================
 
-    def _match_gesture(
+    def _match_node(
         self,
-        segments: list[dict[str, Any]],
-        gesture: GestureMouseCondition,
-        start_segment: dict[str, Any],
-    ) -> Optional[int]:
-
-        last_end_id = start_segment["end_id"]
-
-        for cond in gesture.conditions[1:]:
+        segments: list[Segment],
+        node: TrieNode,
+        last_end_id: int,
+        found: list[Tuple[int, str, int]],
+    ) -> None:
+        """
+        Depth-first greedy match below `node`; a shared prefix is matched
+        once for every gesture through it.
+        Appends (gesture_index, callback, end_id) to `found`.
+        """
 
-            found = False
+        for index, callback in node.callbacks:
+            found.append((index, callback, last_end_id))
 
-            for seg in segments:
-                if seg["end_id"] < last_end_id:
-                    continue
+        for group in node.groups.values():
+            pairs, first = group.assign(segments, last_end_id)
 
-                if (
-                    seg["axis"] == cond.axis
-                    and seg["trend"] == cond.trend
-                    and seg["delta"] >= cond.min_delta
-                ):
-                    last_end_id = seg["end_id"]
-                    found = True
-                    break
-
-            if not found:
-                logging.debug(
-                    "[MatchFail] %s failed at condition %s",
-                    gesture.callback,
-                    cond
-                )
-                return None
-
-        logging.debug(
-            "[MatchSuccess] %s ending at id=%s",
-            gesture.callback,
-            last_end_id
-        )
+            for child, seg in pairs:
+                self._match_node(segments, child, seg.end_id, found)
 
-        return last_end_id
+            if self.tracer is not None:
+                for child in group.nodes[first:]:
+                    for callback in child.below:
+                        self.tracer.match_fail(callback, child.source)
 
     # ============================================================
     # PUBLIC
     # ============================================================
 
+    def create_stream(self) -> SegmentStream:
+        """
+        Streaming segment extractor configured like this detector.
+        """
+
+        return SegmentStream(
+            segment_min_delta=self.segment_min_delta,
+            jitter_max_delta=self.jitter_max_delta,
+            lookahead=self.lookahead,
+            tracer=self.tracer,
+        )
+
     def detect(self, events: list[EventData_move]) -> list[Tuple[str, int]]:
         """
         Returns raw (callback, occurrence_end_id)
         """
 
+        return self.match_segments(self.extract_segments(events))
+
+    def detect_array(
+        self,
+        xs: "ArrayLike",
+        ys: "ArrayLike",
+        ids: "Optional[ArrayLike]" = None,
+    ) -> list[Tuple[str, int]]:
+        """
+        Batch mode over columnar x/y/id arrays (requires numpy).
+        Same output as detect() over the equivalent EventData_move list.
+
+        Args:
+            ids: event ids (default: 0..n-1)
+        """
+
+        from .vectorized import extract_segments_array
+
+        if ids is None:
+            ids = range(len(xs))  # type: ignore[arg-type]
+
+        segments = extract_segments_array(
+            xs, ys, ids,
+            segment_min_delta=self.segment_min_delta,
+            jitter_max_delta=self.jitter_max_delta,
+            lookahead=self.lookahead,
+        )
+        return self.match_segments(segments)
+
+    def detect_buffer(self, buffer: MoveRingBuffer, now: Optional[float] = None) -> list[Tuple[str, int]]:
+        """
+        Batch mode over the window of a MoveRingBuffer at `now` (capture
+        time; requires numpy). Reads the buffer columns without copying them.
+        """
+
+        ids, _, xs, ys = buffer.window_views(now)
+        return self.detect_array(xs, ys, ids)
+
+    def match_segments(self, segments: list[Segment]) -> list[Tuple[str, int]]:
+        """
+        Match gestures against already extracted segments (ordered by start_id).
+        Returns raw (callback, occurrence_end_id)
+        """
+
         occurrences: list[Tuple[str, int]] = []
 
-        segments = self.extract_segments(events)
         if not segments:
             return occurrences
 
         for seg in segments:
 
-            key = (seg["axis"], seg["trend"])
-            candidates = self._first_condition_index.get(key, [])
-
-            for gesture in candidates:
-
-                first = gesture.conditions[0]
-
-                if seg["delta"] < first.min_delta:
-                    continue
+            group = self._trie.first_group(seg)
+            if group is None:
+                continue
 
-                end_id = self._match_gesture(segments, gesture, seg)
+            found: list[Tuple[int, str, int]] = []
+            for child in group.satisfied(seg.delta):
+                self._match_node(segments, child, seg.end_id, found)
 
-                if end_id is not None:
-                    occurrences.append((gesture.callback, end_id))
+            # report in gesture definition order
+            found.sort()
+            occurrences.extend((callback, end_id) for _, callback, end_id in found)
 
         return occurrences
 
@@ -292,9 +310,12 @@ class MouseGestureOccurrenceFilter:
     """
     Filters raw occurrences.
     Prevents duplicate triggering.
+
+    match_success is traced here, for the occurrences that trigger.
     """
 
-    def __init__(self):
+    def __init__(self, tracer: Optional[GestureTracer] = None):
+        self.tracer = tracer
         self._last_occurrence_end_id: dict[str, int] = {}
 
     def filter(
@@ -319,18 +340,75 @@ class MouseGestureOccurrenceFilter:
                 triggered.append(callback)
                 self._last_occurrence_end_id[callback] = end_id
 
+                if self.tracer is not None:
+                    self.tracer.match_success(callback, end_id)
+
         return triggered
 
 
 class MouseGesturePipeline:
+    """
+    Detector (batch), streaming matcher and occurrence filter of one
+    stream. The detector and the matcher read the same GestureTrie
+    (built from `gesture_definitions` when `trie` is None).
+    """
+
+    def __init__(
+        self,
+        gesture_definitions: list[GestureMouseCondition],
+        segment_min_delta: float,
+        tracer: Optional[GestureTracer] = None,
+        trie: Optional[GestureTrie] = None,
+    ):
+        if trie is None:
+            trie = GestureTrie(gesture_definitions)
 
-    def __init__(self, gesture_definitions: list[GestureMouseCondition], segment_min_delta: float):
         self.detector = MouseGestureDetector(
             gesture_definitions=gesture_definitions,
             segment_min_delta=segment_min_delta,
+            tracer=tracer,
+            trie=trie,
         )
-        self.filter = MouseGestureOccurrenceFilter()
+        self.filter = MouseGestureOccurrenceFilter(tracer=tracer)
+        self._stream = self.detector.create_stream()
+        self._matcher = MouseGestureMatcher(gesture_definitions, tracer=tracer, trie=trie)
 
     def process_for_trigger(self, events: list[EventData_move]):
         raw = self.detector.detect(events)
         return self.filter.filter(raw)
+
+    def process_event(
+        self,
+        event: EventData_move,
+        window_start: Optional[int] = None,
+    ) -> list[str]:
+        """
+        Streaming entry point: consume only the newest move.
+
+        Args:
+            event: newest move (ids must be increasing)
+            window_start: id of the oldest move still inside the time
+                window (e.g. MoveRingBuffer.oldest())
+        """
+
+        stream, matcher = self._stream, self._matcher
+
+        closed = stream.push(event)
+        raw: list[Tuple[str, int]] = []
+
+        if window_start is None:
+            # Persistent progress: only closed segments move tokens
+            for segment in closed:
+                raw += matcher.on_segment_closed(segment)
+        else:
+            stream.expire(window_start)
+            head, tails = stream.head()
+
+            # segments straddling the window start are replaced by the head
+            closed = [segment for segment in closed if segment.start_id >= tails[segment.axis]]
+            raw += matcher.on_window(head, tails, stream.originals(), closed)
+
+        # Open segments: evaluated without changing state
+        raw += matcher.evaluate(stream.tentative())
+
+        return self.filter.filter(raw)
@@ -0,0 +1,612 @@
+"""
+tests:
+    test_SegmentStream.py
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
+from typing import Any, Optional, Tuple
+import math
+
+from ...models.event import EventData_move
+from ..tracing import GestureTracer
+
+
+# ===== Codes =====
+# axis: index into AXES
+# trend: sign of the movement (+1 right / down, -1 left / up)
+AXIS_X, AXIS_Y = 0, 1
+AXES = ("x", "y")
+
+TREND_NAMES: dict[Tuple[int, int], str] = {
+    (AXIS_X, 1): "right", (AXIS_X, -1): "left",
+    (AXIS_Y, 1): "down", (AXIS_Y, -1): "up",
+}
+TREND_CODES: dict[str, Tuple[int, int]] = {name: key for key, name in TREND_NAMES.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """
+    One monotonic movement on a single axis.
+
+    Args:
+        start_id: id of the first event
+        end_id:   id of the last event
+        axis:     AXIS_X | AXIS_Y
+        trend:    +1 | -1 (see TREND_NAMES)
+        delta:    absolute movement
+    """
+
+    start_id: int
+    end_id: int
+    axis: int
+    trend: int
+    delta: int
+
+    @property
+    def axis_name(self) -> str:
+        return AXES[self.axis]
+
+    @property
+    def trend_name(self) -> str:
+        return TREND_NAMES[self.axis, self.trend]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Readable form (names instead of codes)."""
+        return {
+            "start_id": self.start_id,
+            "end_id": self.end_id,
+            "axis": self.axis_name,
+            "trend": self.trend_name,
+            "delta": self.delta,
+        }
+
+
+def make_segment(start_id: int, end_id: int, axis: str, trend: str, delta: int) -> Segment:
+    """
+    Build a Segment from axis / trend names.
+    """
+
+    axis_code, trend_code = TREND_CODES[trend]
+    if AXES[axis_code] != axis:
+        raise ValueError(f"trend {trend!r} does not belong to axis {axis!r}")
+
+    return Segment(start_id, end_id, axis_code, trend_code, delta)
+
+
+# stable sort key (keeps x before y on equal start ids)
+by_start_id = attrgetter("start_id")
+
+
+def _sign(delta: int) -> int:
+    if delta > 0:
+        return 1
+    if delta < 0:
+        return -1
+    return 0
+
+
+# start_id, start_value, trend (0 = none yet), prev_id, prev_value
+_AxisState = Tuple[int, int, int, int, int]
+
+# One run of the stream (a segment of any size, closed or open):
+# reversal_id (sample that set its trend), start_id, start_value, trend
+_Run = Tuple[int, int, int, int]
+_reversal_id = itemgetter(0)
+
+# head, tail, resume (see AxisSegmentTracker.view)
+_View = Tuple[list[Segment], float, Optional[Tuple[_AxisState, int]]]
+
+# tail values: every / no stream segment follows the head (see AxisSegmentTracker.view)
+FULL_TAIL = -math.inf
+NO_TAIL = math.inf
+
+
+class AxisSegmentTracker:
+    """
+    Streaming segment extractor for a single axis.
+
+    Consumes one sample at a time and reproduces the result of
+    `MouseGestureDetector._build_axis_segments` over the same samples.
+
+    State:
+    - Open segment (start id/value, trend)
+    - Last committed sample
+    - Pending samples waiting for jitter confirmation (at most lookahead + 1)
+
+    A small reversal cannot be judged until `lookahead` further samples
+    are seen, so those samples stay pending and are committed in order
+    once the decision is known.
+
+    Time window (set_window): batch extraction restarts at the first
+    sample of the window, so its first segments can differ from the
+    stream's: a segment straddling the window start is truncated, and the
+    first moves may be judged against a different trend. The tracker
+    keeps the window's samples and run boundaries and replays the batch
+    rules from the window start until both have the same trend after the
+    same sample; from there on their decisions are identical and the
+    stream's own segments are reused. The replay normally stops at the
+    first move after the window start (moves are indexed, pauses are
+    skipped).
+    """
+
+    __slots__ = (
+        "axis", "segment_min_delta", "jitter_max_delta", "lookahead", "history",
+        "tracer", "_axis_code", "_state", "_ids", "_values", "_offset",
+        "_committed", "_moves", "_runs", "_window_id", "_view",
+    )
+
+    def __init__(
+        self,
+        axis: str,
+        segment_min_delta: float,
+        jitter_max_delta: float,
+        lookahead: int,
+        tracer: Optional[GestureTracer] = None,
+        history: int = 8192,
+    ) -> None:
+        """
+        Args:
+            history: samples kept for windowed replay (the window never
+                holds more; MoveRingBuffer has the same default capacity)
+        """
+
+        self.axis = axis
+        self.segment_min_delta = segment_min_delta
+        self.jitter_max_delta = jitter_max_delta
+        self.lookahead = lookahead
+        self.history = history
+        self.tracer = tracer
+
+        self._axis_code = AXES.index(axis)
+
+        self._state: Optional[_AxisState] = None
+
+        # Samples by absolute position p, stored at p - _offset;
+        # positions >= _committed are pending
+        self._ids: array[int] = array("q")
+        self._values: array[int] = array("q")
+        self._offset: int = 0
+        self._committed: int = 0
+
+        # positions whose value differs from the previous sample
+        self._moves: array[int] = array("q")
+
+        # runs of the stream that may still reach into the window
+        self._runs: list[_Run] = []
+
+        # window start id (None: no window) and its cached view
+        self._window_id: Optional[int] = None
+        self._view: Optional[_View] = None
+
+    # ============================================================
+    # PUBLIC
+    # ============================================================
+
+    @property
+    def start_id(self) -> Optional[int]:
+        """Id of the first sample of the open segment."""
+        return None if self._state is None else self._state[0]
+
+    def push(self, event_id: int, value: int) -> list[Segment]:
+        """
+        Consume the newest sample.
+        Returns segments closed by this sample (may be empty).
+        """
+
+        position = self._offset + len(self._ids)
+        if self._ids and value != self._values[-1]:
+            self._moves.append(position)
+
+        self._ids.append(event_id)
+        self._values.append(value)
+        self._view = None
+
+        if self._state is None:
+            self._state = (event_id, value, 0, event_id, value)
+            self._committed = position + 1
+            return []
+
+        state, committed, closed = self._advance(self._state, self._committed, final=False, runs=self._runs)
+        self._state = state
+        self._committed = committed
+
+        self._trim()
+
+        if closed and self.tracer is not None:
+            for segment in closed:
+                self.tracer.segment_closed(segment)
+
+        return closed
+
+    def tentative(self) -> list[Segment]:
+        """
+        Segments the batch extractor would report if the stream ended now
+        (over the window, when one is set): undecided reversals count as
+        jitter and the open segment is closed at the newest sample.
+        Does not modify state.
+        """
+
+        if self._state is None:
+            return []
+
+        _, _, resume = self.view()
+        state, position = resume if resume is not None else (self._state, self._committed)
+
+        state, _, segments = self._advance(state, position, final=True)
+
+        start_id, start_value, trend, prev_id, prev_value = state
+        if trend:
+            delta_total = abs(prev_value - start_value)
+            if delta_total >= self.segment_min_delta:
+                segments.append(self._segment(start_id, prev_id, trend, delta_total))
+
+        return segments
+
+    def set_window(self, oldest_id: Optional[int]) -> None:
+        """
+        Restrict the segments to samples with id >= oldest_id (the time
+        window); None removes the window.
+        """
+
+        if oldest_id != self._window_id:
+            self._window_id = oldest_id
+            self._view = None
+
+    def view(self) -> _View:
+        """
+        Closed segments of the window as (head, tail, resume):
+        - head: segments batch extraction closes before it agrees with
+          the stream again (replayed from the window start)
+        - tail: the stream's own closed segments with start_id >= tail
+          follow the head; it is the start of a stream run, so no other
+          segment of the axis ends after it
+        - resume: (state, position) tentative() continues from, when it
+          differs from the stream's own
+        """
+
+        if self._view is None:
+            self._view = self._replay()
+        return self._view
+
+    def reset(self) -> None:
+        self._state = None
+        del self._ids[:]
+        del self._values[:]
+        self._offset = self._committed = 0
+        del self._moves[:]
+        self._runs.clear()
+        self._window_id = None
+        self._view = None
+
+    # ============================================================
+    # INTERNAL
+    # ============================================================
+
+    def _segment(self, start_id: int, end_id: int, trend: int, delta_total: float) -> Segment:
+        return Segment(start_id, end_id, self._axis_code, trend, int(delta_total))
+
+    def _judge(self, index: int, current_trend: int, delta: int) -> Optional[bool]:
+        """
+        Mirror of `MouseGestureDetector._is_real_reversal` for the sample
+        at list index `index`. Returns None while the lookahead samples
+        have not arrived yet.
+        """
+
+        if abs(delta) >= self.jitter_max_delta:
+            return True
+
+        values = self._values
+        opposite_trend = -current_trend
+        confirm = 0
+        last = values[index]
+
+        for j in range(index + 1, index + self.lookahead + 1):
+            if j >= len(values):
+                return None
+
+            value = values[j]
+            trend = _sign(value - last)
+            last = value
+
+            if trend == opposite_trend:
+                confirm += 1
+            elif trend == current_trend:
+                return False
+
+        return confirm >= self.lookahead
+
+    def _advance(
+        self,
+        state: _AxisState,
+        position: int,
+        final: bool,
+        runs: Optional[list[_Run]] = None,
+    ) -> Tuple[_AxisState, int, list[Segment]]:
+        """
+        Commit samples from `position` on, in order, while their outcome
+        is known. With final=True undecided reversals are treated as
+        jitter (end-of-batch behaviour). New runs are appended to `runs`.
+
+        Returns (new_state, next_position, closed_segments).
+        """
+
+        start_id, start_value, current_trend, prev_id, prev_value = state
+        closed: list[Segment] = []
+
+        ids, values, offset = self._ids, self._values, self._offset
+        index = position - offset
+
+        while index < len(ids):
+            event_id, value = ids[index], values[index]
+            delta = value - prev_value
+            new_trend = _sign(delta)
+
+            if new_trend:
+                if not current_trend:
+                    current_trend = new_trend
+                    if runs is not None:
+                        runs.append((event_id, start_id, start_value, new_trend))
+
+                elif new_trend != current_trend:
+                    real = self._judge(index, current_trend, delta)
+
+                    if real is None:
+                        if not final:
+                            break
+                        real = False
+
+                    elif not final and self.tracer is not None:
+                        self.tracer.reversal(self.axis, event_id, delta, real)
+
+                    if real:
+                        delta_total = abs(prev_value - start_value)
+                        if delta_total >= self.segment_min_delta:
+                            closed.append(self._segment(start_id, prev_id, current_trend, delta_total))
+
+                        start_id, start_value = prev_id, prev_value
+                        current_trend = new_trend
+                        if runs is not None:
+                            runs.append((event_id, start_id, start_value, new_trend))
+
+            prev_id, prev_value = event_id, value
+            index += 1
+
+        return (start_id, start_value, current_trend, prev_id, prev_value), index + offset, closed
+
+    def _trend_after(self, event_id: int) -> int:
+        """Trend of the stream once the sample `event_id` is committed."""
+
+        k = bisect_right(self._runs, event_id, key=_reversal_id)
+        return self._runs[k - 1][3] if k else 0
+
+    def _replay(self) -> _View:
+        """
+        Batch extraction from the window start until it agrees with the
+        stream (see class docstring).
+        """
+
+        ids, values, offset = self._ids, self._values, self._offset
+        window_id = self._window_id
+
+        # the window holds every sample: nothing differs from the stream
+        if window_id is None or not ids or (window_id <= ids[0] and offset == 0):
+            return [], FULL_TAIL, None
+
+        first = bisect_left(ids, window_id)
+        if first >= len(ids):
+            return [], NO_TAIL, None
+
+        head: list[Segment] = []
+        start = prev = first
+        trend = 0
+        frontier = self._committed - offset
+
+        moves = self._moves
+        for m in range(bisect_right(moves, first + offset), len(moves)):
+            index = moves[m] - offset
+
+            if index >= frontier:
+                # undecided by the stream: the rest is tentative
+                prev = index - 1
+                break
+
+            delta = values[index] - values[index - 1]
+            new_trend = _sign(delta)
+
+            if not trend:
+                trend = new_trend
+
+            elif new_trend != trend:
+                real = self._judge(index, trend, delta)
+                if real is None:
+                    prev = index - 1
+                    break
+
+                if real:
+                    delta_total = abs(values[index - 1] - values[start])
+                    if delta_total >= self.segment_min_delta:
+                        head.append(self._segment(ids[start], ids[index - 1], trend, delta_total))
+                    start, trend = index - 1, new_trend
+
+            prev = index
+            if self._trend_after(ids[index]) != trend:
+                continue
+
+            # Same trend after the same sample: the stream takes over.
+            # Its run holding this sample is the batch segment from `start`.
+            return self._bridge(head, ids[index], ids[start], values[start], trend)
+
+        else:
+            prev = len(ids) - 1
+
+        resume = (ids[start], values[start], trend, ids[prev], values[prev])
+        return head, NO_TAIL, (resume, prev + 1 + offset)
+
+    def _bridge(
+        self,
+        head: list[Segment],
+        event_id: int,
+        start_id: int,
+        start_value: int,
+        trend: int,
+    ) -> _View:
+        """
+        Close the replay at the stream run holding `event_id`: the batch
+        segment from `start_id` ends where that run ends, and the stream's
+        segments follow from the next run on.
+        """
+
+        runs = self._runs
+
+        k = bisect_right(runs, event_id, key=_reversal_id)
+        if k == len(runs):
+            # open run: tentative() closes it from the batch start
+            assert self._state is not None
+            _, _, _, prev_id, prev_value = self._state
+            return head, NO_TAIL, ((start_id, start_value, trend, prev_id, prev_value), self._committed)
+
+        _, end_id, end_value, _ = runs[k]
+        delta_total = abs(end_value - start_value)
+        if delta_total >= self.segment_min_delta:
+            head.append(self._segment(start_id, end_id, trend, delta_total))
+
+        return head, end_id, None
+
+    def _trim(self) -> None:
+        """
+        Forget samples before the window start (or beyond `history`) and
+        runs that ended before it.
+        """
+
+        ids = self._ids
+        keep = len(ids) - self.history
+
+        if self._window_id is not None:
+            keep = max(keep, bisect_left(ids, self._window_id))
+
+        # the stream itself still needs its pending samples
+        keep = min(keep, self._committed - self._offset)
+        if keep < len(ids) // 2 or keep <= 0:
+            return
+
+        del ids[:keep]
+        del self._values[:keep]
+        self._offset += keep
+
+        del self._moves[:bisect_left(self._moves, self._offset)]
+
+        # keep the run holding the first sample
+        if ids:
+            k = bisect_right(self._runs, ids[0], key=_reversal_id)
+            del self._runs[:max(k - 1, 0)]
+
+
+class SegmentStream:
+    """
+    Streaming counterpart of `MouseGestureDetector.extract_segments`.
+
+    Keeps one AxisSegmentTracker per axis plus the closed segments that
+    are still inside the time window. Each move costs O(lookahead),
+    independent of how many events the window holds (plus a short
+    replay at the window start once a window is set).
+    """
+
+    def __init__(
+        self,
+        segment_min_delta: float,
+        jitter_max_delta: float,
+        lookahead: int,
+        tracer: Optional[GestureTracer] = None,
+    ) -> None:
+        self._x = AxisSegmentTracker("x", segment_min_delta, jitter_max_delta, lookahead, tracer)
+        self._y = AxisSegmentTracker("y", segment_min_delta, jitter_max_delta, lookahead, tracer)
+
+        # closed segments per axis, ordered by start_id
+        self._closed_x: deque[Segment] = deque()
+        self._closed_y: deque[Segment] = deque()
+
+    def push(self, event: EventData_move) -> list[Segment]:
+        """
+        Consume the newest move.
+        Returns segments closed by this move, as the stream sees them
+        (without the window; see closed() / head()).
+        """
+
+        event_id: int = event.id  # type: ignore[assignment]
+
+        closed_x = self._x.push(event_id, event.x)
+        closed_y = self._y.push(event_id, event.y)
+
+        self._closed_x.extend(closed_x)
+        self._closed_y.extend(closed_y)
+
+        return closed_x + closed_y
+
+    def expire(self, oldest_id: int) -> None:
+        """
+        Apply the time window: `oldest_id` is the first event still
+        inside it. Segments are then extracted as the batch extractor
+        would over the window alone (a segment straddling its start is
+        truncated to the part inside).
+        """
+
+        self._x.set_window(oldest_id)
+        self._y.set_window(oldest_id)
+
+        # segments starting before the window can only reappear truncated
+        for closed in (self._closed_x, self._closed_y):
+            while closed and closed[0].start_id < oldest_id:
+                closed.popleft()
+
+    def head(self) -> Tuple[list[Segment], Tuple[float, float]]:
+        """
+        Closed segments at the start of the window that differ from the
+        stream's own, and per axis the start_id from which the stream's
+        own closed segments follow them (see AxisSegmentTracker.view).
+        """
+
+        head_x, tail_x, _ = self._x.view()
+        head_y, tail_y, _ = self._y.view()
+        return head_x + head_y, (tail_x, tail_y)
+
+    def originals(self) -> Tuple[deque[Segment], deque[Segment]]:
+        """
+        The stream's own closed segments per axis (ordered by start_id),
+        without the window head.
+        """
+
+        return self._closed_x, self._closed_y
+
+    def tentative(self) -> list[Segment]:
+        """
+        Segments that exist only because the stream ends here
+        (open segments and closures still waiting for confirmation).
+        """
+
+        return self._x.tentative() + self._y.tentative()
+
+    def segments(self) -> list[Segment]:
+        """
+        Closed + tentative segments, ordered as `extract_segments` orders them.
+        """
+
+        segments: list[Segment] = []
+        for tracker, closed in ((self._x, self._closed_x), (self._y, self._closed_y)):
+            head, tail, _ = tracker.view()
+            segments += head
+            segments += (segment for segment in closed if segment.start_id >= tail)
+            segments += tracker.tentative()
+
+        segments.sort(key=by_start_id)
+        return segments
+
+    def reset(self) -> None:
+        self._x.reset()
+        self._y.reset()
+        self._closed_x.clear()
+        self._closed_y.clear()
@@ -0,0 +1,155 @@
+"""
+tests:
+    test_GestureTrie.py
+"""
+
+from bisect import bisect_right
+from typing import Any, Iterable, Optional, Tuple
+
+from ...models.mouse import GestureMouseCondition
+from .segments import Segment, TREND_CODES
+
+
+class TrieNode:
+    """
+    One condition on the path of one or more gestures.
+
+    Args:
+        min_delta: threshold of this condition (0 for the root)
+        source:    the original condition (for tracing)
+        callbacks: (gesture_index, callback) of gestures ending here
+        groups:    children grouped by (axis, trend)
+        below:     callbacks of every gesture through this node
+    """
+
+    __slots__ = ("min_delta", "source", "callbacks", "groups", "below")
+
+    def __init__(self, min_delta: int = 0, source: Any = None) -> None:
+        self.min_delta = min_delta
+        self.source = source
+        self.callbacks: list[Tuple[int, str]] = []
+        self.groups: dict[Tuple[int, int], ChildGroup] = {}
+        self.below: list[str] = []
+
+
+class ChildGroup:
+    """
+    Children of one node that share the same (axis, trend),
+    sorted by min_delta (the bounds of the group).
+    """
+
+    __slots__ = ("axis", "trend", "mins", "nodes")
+
+    def __init__(self, axis: int, trend: int) -> None:
+        self.axis = axis
+        self.trend = trend
+        self.mins: list[int] = []
+        self.nodes: list[TrieNode] = []
+
+    def child(self, min_delta: int, source: Any) -> TrieNode:
+        """Existing child with this min_delta, or a new one."""
+
+        index = bisect_right(self.mins, min_delta)
+        if index and self.mins[index - 1] == min_delta:
+            return self.nodes[index - 1]
+
+        node = TrieNode(min_delta, source)
+        self.mins.insert(index, min_delta)
+        self.nodes.insert(index, node)
+        return node
+
+    def satisfied(self, delta: int, first: int = 0) -> list[TrieNode]:
+        """Children from `first` on whose min_delta is <= delta."""
+
+        return self.nodes[first:bisect_right(self.mins, delta, first)]
+
+    def assign(
+        self,
+        segments: Iterable[Segment],
+        last_end: int,
+        first: int = 0,
+    ) -> Tuple[list[Tuple[TrieNode, Segment]], int]:
+        """
+        Greedy step for every child from `first` on: each child takes the
+        first segment (in iteration order) of this (axis, trend) with
+        end_id >= last_end and delta >= its min_delta.
+
+        Children are sorted, so a segment always serves a contiguous run.
+        Returns (assigned (child, segment) pairs, first unassigned index).
+        """
+
+        pairs: list[Tuple[TrieNode, Segment]] = []
+        nodes, mins = self.nodes, self.mins
+        axis, trend = self.axis, self.trend
+
+        for segment in segments:
+            if segment.end_id < last_end or segment.axis != axis or segment.trend != trend:
+                continue
+
+            stop = bisect_right(mins, segment.delta, first)
+            for child in nodes[first:stop]:
+                pairs.append((child, segment))
+
+            first = stop
+            if first == len(nodes):
+                break
+
+        return pairs, first
+
+
+class GestureTrie:
+    """
+    Mouse gestures compiled into a prefix tree.
+
+    A node is one (axis, trend, min_delta) condition; gestures whose
+    condition lists share a prefix share the nodes of that prefix, so the
+    prefix is matched once and one traversal can report several callbacks.
+
+    Read-only once built: matchers keep their progress outside the nodes,
+    so one trie can be shared by any number of streams.
+    """
+
+    def __init__(self, gesture_definitions: list[GestureMouseCondition]) -> None:
+        self.root = TrieNode()
+
+        for index, gesture in enumerate(gesture_definitions):
+            node = self.root
+            node.below.append(gesture.callback)
+
+            for condition in gesture.conditions:
+                key = TREND_CODES[condition.trend]
+
+                group = node.groups.get(key)
+                if group is None:
+                    group = node.groups[key] = ChildGroup(*key)
+
+                node = group.child(condition.min_delta, condition)
+                node.below.append(gesture.callback)
+
+            node.callbacks.append((index, gesture.callback))
+
+        self._thresholds = self._collect_thresholds()
+
+    def thresholds(self) -> dict[Tuple[int, int], list[int]]:
+        """
+        (axis, trend) -> sorted distinct min_delta over all nodes.
+        """
+
+        return self._thresholds
+
+    def _collect_thresholds(self) -> dict[Tuple[int, int], list[int]]:
+        values: dict[Tuple[int, int], set[int]] = {}
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for key, group in node.groups.items():
+                values.setdefault(key, set()).update(group.mins)
+                stack.extend(group.nodes)
+
+        return {key: sorted(mins) for key, mins in values.items()}
+
+    def first_group(self, segment: Segment) -> Optional[ChildGroup]:
+        """Root children a segment can start."""
+
+        return self.root.groups.get((segment.axis, segment.trend))
@@ -0,0 +1,115 @@
+"""
+NumPy batch segment extraction (optional dependency).
+
+tests:
+    test_detect_array.py
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .segments import AXIS_X, AXIS_Y, Segment, by_start_id
+
+
+def _axis_segments(
+    values: NDArray[np.int64],
+    ids: NDArray[np.int64],
+    axis: int,
+    segment_min_delta: float,
+    jitter_max_delta: float,
+    lookahead: int,
+) -> list[Segment]:
+    """
+    Vectorized `MouseGestureDetector._build_axis_segments`.
+
+    Delta k is values[k + 1] - values[k] (event index k + 1).
+    A trend change at k is a real reversal when the jump is large or the
+    next `lookahead` deltas all keep the new direction. Both conditions
+    depend only on the deltas, so they are computed for every k at once;
+    only the walk over actual reversals (one step per segment) is a loop.
+    """
+
+    n = len(values)
+    if n < 2:
+        return []
+
+    deltas = np.diff(values)
+    signs = np.sign(deltas)
+
+    moving = np.flatnonzero(signs)
+    if moving.size == 0:
+        return []
+
+    m = len(deltas)
+    confirmed = np.zeros(m, dtype=bool)
+    if lookahead == 0:
+        confirmed[:] = True
+    elif m > lookahead:
+        head = signs[: m - lookahead]
+        ok = np.ones(m - lookahead, dtype=bool)
+        for j in range(1, lookahead + 1):
+            ok &= signs[j : m - lookahead + j] == head
+        confirmed[: m - lookahead] = ok
+
+    real = (signs != 0) & ((np.abs(deltas) >= jitter_max_delta) | confirmed)
+    real_up = np.flatnonzero(real & (signs > 0))
+    real_down = np.flatnonzero(real & (signs < 0))
+
+    # walk reversals: the next real delta with the opposite sign
+    trend = int(signs[moving[0]])
+    position = int(moving[0])
+    trends = [trend]
+    reversals: list[int] = []
+
+    while True:
+        candidates = real_down if trend > 0 else real_up
+        j = int(np.searchsorted(candidates, position, side="right"))
+        if j == len(candidates):
+            break
+
+        position = int(candidates[j])
+        reversals.append(position)     # segment closes at event `position`
+        trend = -trend
+        trends.append(trend)
+
+    boundaries = np.asarray(reversals, dtype=np.int64)
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [n - 1]))
+
+    totals = np.abs(values[ends] - values[starts])
+    keep = np.flatnonzero(totals >= segment_min_delta)
+
+    start_ids = ids[starts].tolist()
+    end_ids = ids[ends].tolist()
+    deltas_total = totals.tolist()
+
+    return [
+        Segment(start_ids[k], end_ids[k], axis, trends[k], deltas_total[k])
+        for k in keep.tolist()
+    ]
+
+
+def extract_segments_array(
+    xs: ArrayLike,
+    ys: ArrayLike,
+    ids: ArrayLike,
+    segment_min_delta: float,
+    jitter_max_delta: float,
+    lookahead: int,
+) -> list[Segment]:
+    """
+    Vectorized `MouseGestureDetector.extract_segments` over columnar input.
+    """
+
+    x = np.asarray(xs, dtype=np.int64)
+    y = np.asarray(ys, dtype=np.int64)
+    event_ids = np.asarray(ids, dtype=np.int64)
+
+    if not (len(x) == len(y) == len(event_ids)):
+        raise ValueError("xs, ys and ids must have the same length")
+
+    segments = _axis_segments(x, event_ids, AXIS_X, segment_min_delta, jitter_max_delta, lookahead)
+    segments += _axis_segments(y, event_ids, AXIS_Y, segment_min_delta, jitter_max_delta, lookahead)
+
+    segments.sort(key=by_start_id)
+    return segments
@@ -0,0 +1,176 @@
+"""
+tests:
+    test_move_buffer.py
+"""
+
+from array import array
+from bisect import bisect_left
+import time
+from typing import Callable, Optional
+
+from ..models.event import EventData_move
+
+
+class MoveRingBuffer:
+    """
+    Bounded, time-windowed, columnar buffer for mouse moves.
+
+    Storage:
+    - ids, times, xs, ys in typed `array` columns (no per-sample objects)
+    - every sample is written twice (slot and slot + ring size), so the
+      live window is always one contiguous range and can be exposed as
+      zero-copy memoryviews (numpy.asarray(view) shares the memory)
+
+    Columns start small and double when the window fills them, up to
+    `capacity`; a short window never pays for the full cap.
+    Pruning only moves the head index (binary search on time).
+    When capacity is reached the oldest sample is overwritten.
+    """
+
+    INITIAL_SIZE = 64
+
+    def __init__(
+        self,
+        window: float,
+        capacity: int = 8192,
+        func_now: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.window = window
+        self.capacity = capacity
+        self.func_now = func_now
+
+        # current ring size (grows up to capacity)
+        self._size: int = min(capacity, self.INITIAL_SIZE)
+
+        zeros = bytes(16 * self._size)
+        self._ids = array("q", zeros)
+        self._times = array("d", zeros)
+        self._xs = array("q", zeros)
+        self._ys = array("q", zeros)
+
+        # absolute sample counters: window is [_head, _tail)
+        self._head: int = 0
+        self._tail: int = 0
+
+    # ------------------------------------------------------------------ #
+    # Internal
+    # ------------------------------------------------------------------ #
+
+    def _grow(self) -> None:
+        """Double the ring (up to capacity), keeping the window in order."""
+
+        start, end = self._span()
+        size = self._size = min(2 * self._size, self.capacity)
+
+        zeros = bytes(16 * size)
+        ids, times, xs, ys = array("q", zeros), array("d", zeros), array("q", zeros), array("q", zeros)
+
+        count = end - start
+        ids[:count] = ids[size:size + count] = self._ids[start:end]
+        times[:count] = times[size:size + count] = self._times[start:end]
+        xs[:count] = xs[size:size + count] = self._xs[start:end]
+        ys[:count] = ys[size:size + count] = self._ys[start:end]
+
+        self._ids, self._times, self._xs, self._ys = ids, times, xs, ys
+        self._head, self._tail = 0, count
+
+    def _prune(self, now: float) -> None:
+        count = self._tail - self._head
+        if not count:
+            return
+
+        start = self._head % self._size
+        cutoff = now - self.window
+
+        # times inside the window are non-decreasing
+        index = bisect_left(self._times, cutoff, start, start + count)
+        self._head += index - start
+
+    def _span(self) -> tuple[int, int]:
+        start = self._head % self._size
+        return start, start + self._tail - self._head
+
+    # ------------------------------------------------------------------ #
+    # Write
+    # ------------------------------------------------------------------ #
+
+    def append(self, event_id: int, x: int, y: int, timestamp: Optional[float] = None) -> None:
+        now = self.func_now() if timestamp is None else timestamp
+        self._prune(now)
+
+        if self._tail - self._head == self._size:
+            if self._size < self.capacity:
+                self._grow()
+            else:
+                self._head += 1  # overwrite oldest
+
+        size = self._size
+        slot = self._tail % size
+        mirror = slot + size
+
+        self._ids[slot] = self._ids[mirror] = event_id
+        self._times[slot] = self._times[mirror] = now
+        self._xs[slot] = self._xs[mirror] = x
+        self._ys[slot] = self._ys[mirror] = y
+
+        self._tail += 1
+
+    def add(self, event: EventData_move) -> None:
+        """EventBuffer-compatible entry point."""
+        self.append(event.id, event.x, event.y, event.time)  # type: ignore[arg-type]
+
+    def clear(self) -> None:
+        self._head = self._tail = 0
+
+    # ------------------------------------------------------------------ #
+    # Read
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        self._prune(self.func_now())
+        return self._tail - self._head
+
+    def window_views(self, now: Optional[float] = None) -> tuple[memoryview, memoryview, memoryview, memoryview]:
+        """
+        Zero-copy (ids, times, xs, ys) views of the window at `now`: the
+        capture time of the move being processed (defaults to func_now()).
+
+        Views stay valid until the next append; copy them if they must
+        outlive it.
+        """
+
+        self._prune(self.func_now() if now is None else now)
+        start, end = self._span()
+        return (
+            memoryview(self._ids)[start:end],
+            memoryview(self._times)[start:end],
+            memoryview(self._xs)[start:end],
+            memoryview(self._ys)[start:end],
+        )
+
+    def oldest(self, now: Optional[float] = None) -> Optional[tuple[int, int, int]]:
+        """
+        (id, x, y) of the oldest sample inside the window at `now`
+        (None if empty).
+        """
+
+        self._prune(self.func_now() if now is None else now)
+        if self._tail == self._head:
+            return None
+
+        start = self._head % self._size
+        return self._ids[start], self._xs[start], self._ys[start]
+
+    def snapshot(self, now: Optional[float] = None) -> list[EventData_move]:
+        """
+        Materialize the window at `now` as EventData_move objects (copies).
+        """
+
+        ids, times, xs, ys = self.window_views(now)
+        return [
+            EventData_move(id=i, time=t, x=x, y=y)
+            for i, t, x, y in zip(ids.tolist(), times.tolist(), xs.tolist(), ys.tolist())
+        ]
@@ -0,0 +1,112 @@
+"""
+Tracing hooks for the detection pipelines.
+
+Pipelines call a tracer only when one is attached
+(`if tracer is not None`), so an absent tracer costs one attribute check
+on the rare paths below and nothing is formatted.
+
+tests:
+    test_tracing.py
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mouse.segments import Segment
+
+
+class GestureTracer(Protocol):
+    """
+    Observer of detection decisions.
+
+    Mouse pipeline: all four events.
+    Keyboard pipeline: match_fail / match_success.
+
+    match_success is only called for occurrences that trigger (after
+    duplicate suppression). match_fail is called for the conditions a
+    partial match was still waiting for when it was given up (batch: no
+    segment in the window satisfies it; streaming mouse: the partial
+    match left the time window).
+    """
+
+    def segment_closed(self, segment: "Segment") -> None: ...
+
+    def reversal(self, axis: str, event_id: int, delta: int, real: bool) -> None: ...
+
+    def match_fail(self, callback: str, condition: Any) -> None: ...
+
+    def match_success(self, callback: str, end_id: int) -> None: ...
+
+
+class LoggingTracer:
+    """
+    Development tracer: the classic DEBUG output.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None, level: int = logging.DEBUG) -> None:
+        self._logger = logger or logging.getLogger("gestura.trace")
+        self._level = level
+
+    def segment_closed(self, segment: "Segment") -> None:
+        self._logger.log(
+            self._level,
+            "[Segment] %s:%s Δ%s (%s→%s)",
+            segment.axis_name, segment.trend_name, segment.delta,
+            segment.start_id, segment.end_id,
+        )
+
+    def reversal(self, axis: str, event_id: int, delta: int, real: bool) -> None:
+        self._logger.log(
+            self._level,
+            "[Reversal] axis=%s id=%s Δ=%s → %s",
+            axis, event_id, delta, "REAL" if real else "JITTER",
+        )
+
+    def match_fail(self, callback: str, condition: Any) -> None:
+        self._logger.log(self._level, "[MatchFail] %s failed at condition %s", callback, condition)
+
+    def match_success(self, callback: str, end_id: int) -> None:
+        self._logger.log(self._level, "[MatchSuccess] %s ending at id=%s", callback, end_id)
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEvent:
+    """
+    One recorded tracer call.
+
+    Args:
+        kind: "segment_closed" | "reversal" | "match_fail" | "match_success"
+        data: call arguments by name
+    """
+
+    kind: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class RecordingTracer:
+    """
+    Collects structured TraceEvents (tests, visualizers, threshold tuning).
+    """
+
+    def __init__(self) -> None:
+        self.events: list[TraceEvent] = []
+
+    def segment_closed(self, segment: "Segment") -> None:
+        self.events.append(TraceEvent("segment_closed", segment.as_dict()))
+
+    def reversal(self, axis: str, event_id: int, delta: int, real: bool) -> None:
+        self.events.append(TraceEvent("reversal", {"axis": axis, "event_id": event_id, "delta": delta, "real": real}))
+
+    def match_fail(self, callback: str, condition: Any) -> None:
+        self.events.append(TraceEvent("match_fail", {"callback": callback, "condition": condition}))
+
+    def match_success(self, callback: str, end_id: int) -> None:
+        self.events.append(TraceEvent("match_success", {"callback": callback, "end_id": end_id}))
+
+    def of_kind(self, kind: str) -> list[TraceEvent]:
+        return [e for e in self.events if e.kind == kind]
+
+    def clear(self) -> None:
+        self.events.clear()
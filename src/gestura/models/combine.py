@@ -1,6 +1,6 @@
 # 100/100
 
-from typing import Callable
+from typing import Callable, Literal, Optional
 from dataclasses import dataclass, field
 
 from .mouse import GestureMouse
@@ -12,3 +12,21 @@ class GestureCombine_KM:
     mouse: GestureMouse = field(default_factory=GestureMouse)
     keyboard: GestureKeyboard = field(default_factory=GestureKeyboard)
     callback: Callable[[], None] | str = "Unknown"
+
+
+CombineOrder = Literal["either", "keyboard_first", "mouse_first"]
+
+
+@dataclass(frozen=True, slots=True)
+class CombineRule:
+    """
+    Pairing rule for a combined keyboard + mouse callback.
+
+    Args:
+        window_seconds: max time between the two halves; None uses the
+            worker's combined_window_seconds
+        order: which half must come first ("either" accepts both)
+    """
+
+    window_seconds: Optional[float] = None
+    order: CombineOrder = "either"
@@ -31,6 +31,7 @@ class EventData_keyboard(_Base_Event):
     Args:
         press: True if press else False
         key: All key in keyboard(ENG, another language not support all character)
+        code: Interned key code (KeyTable); None when the event was not interned
 
     NOTE: support another language good, but change language need to restart program.
 
@@ -39,6 +40,7 @@ class EventData_keyboard(_Base_Event):
 
     key: str
     press: bool
+    code: Optional[int] = None
     type: Literal["keyboard"] = "keyboard"
 
 
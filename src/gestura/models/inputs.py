@@ -1,17 +1,23 @@
 from dataclasses import dataclass
+from typing import Any, Optional
 
 
+# timestamp_ns: optional capture time set by the adapter when the OS hook
+# fired (time.monotonic_ns()); None lets the engine stamp it on arrival
+
 # Keyboard
 @dataclass(frozen=True, slots=True, kw_only=True)
 class KeyboardEvent:
     key: str
     press: bool
+    timestamp_ns: Optional[int] = None
 
 # Mouse
 @dataclass(frozen=True, slots=True, kw_only=True)
 class MouseMoveEvent:
     x: int
     y: int
+    timestamp_ns: Optional[int] = None
 
 @dataclass(frozen=True, slots=True, kw_only=True)
 class MouseClickEvent:
@@ -19,5 +25,18 @@ class MouseClickEvent:
     y: int
     position: str
     press: bool
+    timestamp_ns: Optional[int] = None
 
 MouseEvent = MouseMoveEvent | MouseClickEvent
+
+
+def capture_time(event: Any) -> Optional[float]:
+    """
+    The adapter's timestamp_ns in seconds (the time.monotonic clock the
+    engine uses by default), or None when the event carries none.
+    """
+
+    timestamp_ns = getattr(event, "timestamp_ns", None)
+    if timestamp_ns is None:
+        return None
+    return timestamp_ns / 1e9
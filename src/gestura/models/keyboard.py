@@ -8,8 +8,8 @@ __all__ = (
 
 # NOTE: CPU 0.05% USE
 
-from typing import Iterable
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Iterable, Literal
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 
 # ========== Container model ==========
@@ -18,6 +18,12 @@ class GestureKeyboard(BaseModel):
     Model structure for Keyboard Gesture.
 
     :param conditions: List of Keyboard Keys (e.g. ["esc", "ctrl", "shift", "alt", "a", "z", "/"])
+    :param mode: "sequence" (keys pressed one after another),
+        "chord" (all keys held together, any press order) or
+        "hold" (all keys held together for hold_seconds)
+    :param hold_seconds: hold duration for mode "hold" (must be > 0)
+    :param max_gap: mode "sequence" only; other key presses allowed between
+        two consecutive keys (0 = strictly contiguous)
 
     TODO: ["f1", ..., "f12", "H", "|"] => The support for these keys is not stable enough.
     """
@@ -25,6 +31,16 @@ class GestureKeyboard(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     conditions: list[str] = Field(default_factory=list)
+    mode: Literal["sequence", "chord", "hold"] = "sequence"
+    hold_seconds: float = Field(default=0.0, ge=0.0)
+    max_gap: int = Field(default=0, ge=0)
+
+    @model_validator(mode="after")
+    def _check_hold_seconds(self) -> "GestureKeyboard":
+        # A zero-length hold would fire on press
+        if self.mode == "hold" and self.hold_seconds <= 0:
+            raise ValueError("hold_seconds must be > 0 for mode 'hold'")
+        return self
 
     # -------- implementation --------
     def add_condition(self, data: str | list[str] | tuple[str, ...]) -> None:
@@ -11,9 +11,17 @@ from collections import deque
 
 @dataclass(frozen=True, slots=True)
 class TriggerEvent:
+    """
+    Args:
+        callback: callback name (what custom policy engines key on)
+        callback_id: dense callback id (see parse_shortcut_config), set
+            by ShortcutWorker; -1 when the trigger was not numbered
+    """
+
     source: Literal["__STOP__", "keyboard", "mouse"]
     callback: str
     timestamp: float
+    callback_id: int = -1
 
 
 @dataclass(frozen=True, slots=True)
@@ -54,6 +62,9 @@ class CallbackState:
 class PolicyEngineProtocol(Protocol):
     """
     Public contract required by ShortcutWorker.
+
+    A trigger carries both the callback name and its dense id; engines
+    may key their state on either.
     """
 
     def evaluate(self, _TriggerEvent: TriggerEvent) -> bool: ...
@@ -0,0 +1,74 @@
+"""
+Capacity and overload policy of the engine's internal queues.
+"""
+
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+
+# What a full queue does with a new item
+#   block:       wait until the consumer makes room
+#   drop_oldest: evict the oldest pending item of the same source
+#   drop_newest: discard the new item
+#   coalesce:    discard callbacks already pending for the same source
+#                (trigger queues only; bounded by the number of callbacks)
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest", "coalesce"]
+POLICIES: tuple[OverflowPolicy, ...] = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+
+@dataclass(frozen=True, slots=True)
+class QueueLimit:
+    """
+    Args:
+        capacity: max pending items of one source (None: unbounded)
+        policy: applied once `capacity` items are pending; None uses the
+            queue's default ("drop_newest" for input queues, whose
+            producer is an OS hook thread that must not block, "block"
+            for the others)
+    """
+
+    capacity: Optional[int] = None
+    policy: Optional[OverflowPolicy] = None
+
+    def __post_init__(self) -> None:
+        if self.capacity is not None and self.capacity < 1:
+            raise ValueError("capacity must be positive")
+
+    def resolve(self, default: OverflowPolicy, supported: tuple[OverflowPolicy, ...]) -> OverflowPolicy:
+        """
+        The policy a queue applies (`default` when none is set).
+        Raises ValueError when the queue does not support it.
+        """
+
+        policy = default if self.policy is None else self.policy
+        if policy not in supported:
+            raise ValueError(f"this queue supports {', '.join(map(repr, supported))}, not {policy!r}")
+        return policy
+
+
+@dataclass(frozen=True, slots=True)
+class QueueLimits:
+    """
+    Per-source limits of every queue owned by an engine.
+
+    *_input: raw events, listener threads -> detection thread (InputWorker)
+    *_triggers: callbacks, detection thread -> ShortcutWorker
+    actions: published actions not yet taken by the consumer
+        (AsyncGesturaEngine, ShardedEngine result queue)
+    """
+
+    keyboard_input: QueueLimit = QueueLimit()
+    mouse_input: QueueLimit = QueueLimit()
+    keyboard_triggers: QueueLimit = QueueLimit()
+    mouse_triggers: QueueLimit = QueueLimit()
+    actions: QueueLimit = QueueLimit()
+
+
+@dataclass(frozen=True, slots=True)
+class QueueStats:
+    """
+    Items lost to an overload policy since start (triggers: callbacks).
+    """
+
+    dropped: int = 0
+    coalesced: int = 0
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ..models.policy import TriggerEvent, CallbackPolicy, CallbackState
 
 
@@ -15,11 +17,32 @@ class PolicyEngine:
 
         max_triggers:
             Maximum number of executions allowed within the rate window.
+
+    Policies and states are kept in lists indexed by callback id
+    (`callback_ids`, numbered in policy order when not given). Triggers
+    without an id are looked up by name.
     """
 
-    def __init__(self, policies: dict[str, CallbackPolicy]) -> None:
+    def __init__(
+        self,
+        policies: dict[str, CallbackPolicy],
+        callback_ids: Optional[dict[str, int]] = None,
+    ) -> None:
+
         self._policies = policies
-        self._states: dict[str, CallbackState] = {}
+        self.callback_ids: dict[str, int] = (
+            dict(callback_ids) if callback_ids is not None
+            else {name: i for i, name in enumerate(policies)}
+        )
+
+        size = max(self.callback_ids.values(), default=-1) + 1
+
+        # id -> policy / runtime state
+        self._policy_by_id: list[Optional[CallbackPolicy]] = [None] * size
+        self._state_by_id: list[Optional[CallbackState]] = [None] * size
+
+        for name, callback_id in self.callback_ids.items():
+            self._policy_by_id[callback_id] = policies.get(name)
 
     # ------------------------------------------------------------------
     # Public API
@@ -31,13 +54,21 @@ class PolicyEngine:
         Updates state if allowed.
         """
 
-        policy = self._policies.get(_TriggerEvent.callback)
+        callback_id = _TriggerEvent.callback_id
+        if callback_id < 0:
+            callback_id = self.callback_ids.get(_TriggerEvent.callback, -1)
 
         # No policy → always allow
+        if not 0 <= callback_id < len(self._policy_by_id):
+            return True
+
+        policy = self._policy_by_id[callback_id]
         if policy is None:
             return True
 
-        state = self._states.setdefault(_TriggerEvent.callback, CallbackState())
+        state = self._state_by_id[callback_id]
+        if state is None:
+            state = self._state_by_id[callback_id] = CallbackState()
 
         # Cooldown check
         if not self._check_cooldown(state, policy, _TriggerEvent.timestamp):
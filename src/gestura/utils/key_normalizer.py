@@ -5,8 +5,9 @@ tests:
     test_key_utils.py
 """
 
-from typing import Optional, Union, Literal, overload
+from typing import Any, Optional, Union, Literal, overload
 from functools import lru_cache
+import string
 import re
 
 from pynput.keyboard import Key, KeyCode
@@ -29,6 +30,19 @@ class KeyUtils:
 
     HEX_PATTERN = re.compile(r"^0x([0-9a-f]{2})$", re.IGNORECASE)
 
+    # Key names seen from adapters even when the pynput backend does not
+    # define them as Key members
+    COMMON_KEY_NAMES = (
+        "alt", "alt_l", "alt_r", "alt_gr", "backspace", "caps_lock", "cmd", "cmd_l", "cmd_r",
+        "ctrl", "ctrl_l", "ctrl_r", "delete", "down", "end", "enter", "esc", "home", "insert",
+        "left", "menu", "num_lock", "page_down", "page_up", "pause", "print_screen", "right",
+        "scroll_lock", "shift", "shift_l", "shift_r", "space", "tab", "up",
+        *(f"f{i}" for i in range(1, 25)),
+    )
+
+    # output_type -> raw key -> result; filled by build_tables() at import
+    _TABLES: dict[str, dict[Any, Any]] = {"str": {}, "type": {}, "object": {}}
+
     @staticmethod
     def is_modifier(key: Optional[Union[Key, KeyCode, str]]) -> bool:
         if key is None:
@@ -105,6 +119,24 @@ class KeyUtils:
         key: Optional[Union[Key, KeyCode, str]],
         output_type: Literal["object", "str", "type"] = "object"
     ) -> Union[Key, KeyCode, str]:
+        """
+        Fast path: one dict lookup in the precomputed table.
+        Keys outside the table (or unhashable ones) take the full logic.
+        """
+
+        try:
+            return KeyUtils._TABLES[output_type][key]
+        except (KeyError, TypeError):
+            return KeyUtils.normalize_key_uncached(key, output_type)
+
+    @staticmethod
+    def normalize_key_uncached(
+        key: Optional[Union[Key, KeyCode, str]],
+        output_type: Literal["object", "str", "type"] = "object"
+    ) -> Union[Key, KeyCode, str]:
+        """
+        Full normalization logic, without the precomputed table.
+        """
 
         if key is None:
             if output_type == "str":
@@ -160,6 +192,42 @@ class KeyUtils:
         if output_type == "type":
             return "KeyCode"
 
+    @staticmethod
+    def table_inputs() -> list[Union[Key, str]]:
+        """
+        Every raw key the table covers: Key members (object and name,
+        with/without the 'key.' prefix), modifier aliases, control
+        characters, hex keycodes and printable characters (bare and quoted).
+        """
+
+        names = {member.name for member in Key} | set(KeyUtils.COMMON_KEY_NAMES) | set(KeyUtils.SIMPLE_MODIFIERS)
+
+        inputs: list[Union[Key, str]] = list(Key)
+        inputs += [prefix + name for name in names for prefix in ("", "key.")]
+
+        for code in range(1, 27):
+            inputs.append(chr(code))
+            inputs += [f"0x{code:02x}", f"0x{code:02X}"]
+
+        printable = string.ascii_letters + string.digits + string.punctuation + " "
+        inputs += list(printable)
+        inputs += [f"'{char}'" for char in printable]
+
+        return inputs
+
+    @staticmethod
+    def build_tables() -> None:
+        """
+        Precompute normalize_key() for every table input with the full
+        logic itself, so the fast path cannot disagree with it.
+        Runs at import; call again after changing the alias tables.
+        """
+
+        for output_type, table in KeyUtils._TABLES.items():
+            table.clear()
+            for key in KeyUtils.table_inputs():
+                table[key] = KeyUtils.normalize_key_uncached(key, output_type)  # type: ignore[arg-type]
+
     @staticmethod
     @overload
     def parse_key(key: Optional[Union[Key, KeyCode, str]], output_type: Literal["object"]) -> Union[Key, KeyCode]: ...
@@ -176,3 +244,6 @@ class KeyUtils:
         output_type: Literal["object", "str", "type"] = "object"
     ) -> Union[Key, KeyCode, str]:
         return KeyUtils.normalize_key(key, output_type=output_type)
+
+
+KeyUtils.build_tables()
@@ -0,0 +1,166 @@
+from gestura import AsyncGesturaEngine, ActionEvent, QueueLimit, QueueLimits, QueueStats
+from gestura.models.inputs import KeyboardEvent
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from .test_InputWorker import FakeListener
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+CONFIG = [
+    {"keyboard": {"conditions": ["ctrl", "k"]}, "mouse": {"conditions": []},
+     "policy": {"max_triggers": 100}, "callback": "search"},
+]
+
+
+def make_engine(queue_limits=None, max_trigger_age=None):
+    listeners = {}
+
+    def factory(name):
+        def create(on_event):
+            listeners[name] = FakeListener(on_event)
+            return listeners[name]
+        return create
+
+    engine = AsyncGesturaEngine(
+        CONFIG,
+        keyboard_listener_factory=factory("keyboard"),
+        mouse_listener_factory=factory("mouse"),
+        queue_limits=queue_limits,
+        max_trigger_age=max_trigger_age,
+    )
+    return engine, listeners
+
+
+def press(listeners, *keys):
+    for key in keys:
+        listeners["keyboard"].on_event(KeyboardEvent(key=key, press=True))
+        listeners["keyboard"].on_event(KeyboardEvent(key=key, press=False))
+
+
+# ------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------
+
+def test_actions_async_iteration():
+    async def main():
+        engine, listeners = make_engine()
+        async with engine:
+            press(listeners, "ctrl", "k")
+            async for action in engine.actions():
+                return action.callback
+
+    assert asyncio.run(asyncio.wait_for(main(), 2.0)) == "search"
+
+
+def test_stop_delivers_pending_and_ends_iteration():
+    async def main():
+        engine, listeners = make_engine()
+        async with engine:
+            press(listeners, "ctrl", "k")
+            await asyncio.sleep(0.05)
+            press(listeners, "ctrl", "k")
+
+        return [action.callback async for action in engine.actions()]
+
+    assert asyncio.run(asyncio.wait_for(main(), 2.0)) == ["search", "search"]
+
+
+def test_one_loop_wakeup_per_batch():
+    async def main():
+        engine, _ = make_engine()
+        async with engine:
+            loop = asyncio.get_running_loop()
+            scheduled = []
+            original = loop.call_soon_threadsafe
+
+            def counting(callback, *args, **kwargs):
+                scheduled.append(callback)
+                return original(callback, *args, **kwargs)
+
+            loop.call_soon_threadsafe = counting  # type: ignore[method-assign]
+
+            # one worker batch, published from another thread while the
+            # loop is busy (join blocks it on purpose)
+            batch = [ActionEvent("search", float(i)) for i in range(50)]
+            thread = threading.Thread(target=lambda: [engine._publish(a) for a in batch])
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0)
+
+            del loop.call_soon_threadsafe
+
+        delivered = [action async for action in engine.actions()]
+        return len(scheduled), delivered, batch
+
+    wakeups, delivered, batch = asyncio.run(asyncio.wait_for(main(), 2.0))
+    assert wakeups == 1
+    assert delivered == batch
+
+
+def test_bounded_actions_drop_newest():
+    async def main():
+        engine, _ = make_engine(QueueLimits(actions=QueueLimit(capacity=3, policy="drop_newest")))
+        async with engine:
+            batch = [ActionEvent("search", float(i)) for i in range(5)]
+            thread = threading.Thread(target=lambda: [engine._publish(a) for a in batch])
+            thread.start()
+            thread.join()
+
+        delivered = [action async for action in engine.actions()]
+        return delivered, batch, engine.queue_stats()
+
+    delivered, batch, stats = asyncio.run(asyncio.wait_for(main(), 2.0))
+    assert delivered == batch[:3]
+    assert stats["actions"] == QueueStats(dropped=2)
+
+
+def test_bounded_actions_block_until_consumed():
+    async def main():
+        engine, _ = make_engine(QueueLimits(actions=QueueLimit(capacity=2)))
+        async with engine:
+            batch = [ActionEvent("search", float(i)) for i in range(6)]
+            thread = threading.Thread(target=lambda: [engine._publish(a) for a in batch])
+            thread.start()
+
+            delivered = []
+            async for action in engine.actions():
+                delivered.append(action)
+                if len(delivered) == len(batch):
+                    break
+
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+        return delivered, batch, engine.queue_stats()
+
+    delivered, batch, stats = asyncio.run(asyncio.wait_for(main(), 2.0))
+    assert delivered == batch
+    assert stats["actions"] == QueueStats()
+
+
+def test_max_trigger_age_drops_late_triggers():
+    async def main():
+        engine, listeners = make_engine(max_trigger_age=0.5)
+        stale = int((time.monotonic() - 10.0) * 1e9)
+        async with engine:
+            for key in ("ctrl", "k"):
+                listeners["keyboard"].on_event(KeyboardEvent(key=key, press=True, timestamp_ns=stale))
+            press(listeners, "ctrl", "k")
+            async for action in engine.actions():
+                return action, engine._engine.late_triggers()
+
+    action, late = asyncio.run(asyncio.wait_for(main(), 2.0))
+    assert action.callback == "search"
+    assert late == {"keyboard": 1, "mouse": 0}
+
+
+def test_rejects_non_positive_max_trigger_age():
+    with pytest.raises(ValueError):
+        make_engine(max_trigger_age=0)
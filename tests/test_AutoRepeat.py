@@ -0,0 +1,96 @@
+from gestura.config import KeyboardConfig
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.input.keyboard.repeat import AutoRepeatDetector
+from gestura.models.inputs import KeyboardEvent
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def make_app(policy, gestures):
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=gestures,
+        on_trigger=triggered.extend,
+        BufferWindowSeconds=1.5,
+        AutoRepeatPolicy=policy,
+    ))
+    return app, triggered
+
+
+def hold(app, key, start, seconds, rate=30):
+    """Press + OS auto-repeat for `seconds` (no release)."""
+    for i in range(int(seconds * rate) + 1):
+        app.HandleEvens(KeyboardEvent(key=key, press=True), start + i / rate)
+
+
+# ------------------------------------------------------------
+# Detector
+# ------------------------------------------------------------
+
+def test_only_the_last_key_repeats():
+    detector = AutoRepeatDetector(max_interval=1.0)
+
+    assert detector.press("a", 0.0) is False
+    assert detector.press("a", 0.5) is True
+    assert detector.press("b", 0.6) is False
+    assert detector.press("a", 0.7) is False    # "b" stopped the repeat
+
+
+def test_release_and_interval_end_the_repeat():
+    detector = AutoRepeatDetector(max_interval=1.0)
+
+    detector.press("a", 0.0)
+    detector.release("a")
+    assert detector.press("a", 0.1) is False
+
+    assert detector.press("a", 5.0) is False    # missed release, later real press
+
+
+# ------------------------------------------------------------
+# Policies
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("policy, expected", [("pass", True), ("drop", False), ("collapse", False)])
+def test_holding_a_key_is_not_a_double_tap(policy, expected):
+    app, triggered = make_app(policy, [make_gesture(["ctrl", "ctrl"], "pause")])
+
+    hold(app, "ctrl_l", 0.0, 2.0)
+
+    assert ("pause" in triggered) is expected
+
+
+def test_default_policy_passes_repeats_on():
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=[make_gesture(["ctrl", "ctrl"], "pause")],
+        on_trigger=triggered.extend,
+    ))
+
+    hold(app, "ctrl_l", 0.0, 1.0)
+
+    assert "pause" in triggered
+
+
+@pytest.mark.parametrize("policy", ["drop", "collapse"])
+def test_repeats_do_no_matching_work(policy):
+    app, _ = make_app(policy, [make_gesture(["ctrl", "ctrl"], "pause")])
+
+    hold(app, "ctrl_l", 0.0, 2.0)
+
+    assert app._event_id == 1                    # only the real press became an event
+
+
+@pytest.mark.parametrize("policy, expected", [("drop", []), ("collapse", ["save"])])
+def test_collapse_keeps_held_key_in_window(policy, expected):
+    app, triggered = make_app(policy, [make_gesture(["ctrl", "s"], "save")])
+
+    hold(app, "ctrl_l", 0.0, 3.0)               # longer than the 1.5 s window
+    app.HandleEvens(KeyboardEvent(key="s", press=True), 3.05)
+
+    assert triggered == expected
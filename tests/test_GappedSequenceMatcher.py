@@ -0,0 +1,117 @@
+from gestura.input.keyboard.gapped import GappedSequenceMatcher, latest_start
+from gestura.input.keyboard.pipeline import KeyboardGesturePipeline
+from gestura.models.event import EventData_keyboard
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+from itertools import combinations
+import random
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def brute_starts(keys, sequence, max_gap):
+    """Every start index of an occurrence ending on the last key."""
+    last = len(keys) - 1
+    starts = []
+    for positions in combinations(range(last + 1), len(sequence)):
+        if positions[-1] != last:
+            continue
+        if any(keys[p] != k for p, k in zip(positions, sequence)):
+            continue
+        if all(b - a - 1 <= max_gap for a, b in zip(positions, positions[1:])):
+            starts.append(positions[0])
+    return starts
+
+
+def make_gapped(keys, callback, max_gap):
+    gesture = make_gesture(keys, callback)
+    gesture.max_gap = max_gap
+    return gesture
+
+
+# ------------------------------------------------------------
+# Matcher
+# ------------------------------------------------------------
+
+def test_latest_start_needs_full_search():
+    # nearest "b" (index 3) has no "a" close enough; index 2 does
+    keys = ["a", "x", "b", "b", "c"]
+    assert latest_start(keys, ["a", "b", "c"], 1) == 0
+    assert latest_start(keys, ["a", "b", "c"], 0) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_shift_and_matches_brute_force(seed):
+    rng = random.Random(seed)
+    alphabet = "abcx"
+
+    sequences = [[rng.choice("abc") for _ in range(rng.randint(1, 3))] for _ in range(8)]
+    gaps = [rng.randint(1, 2) for _ in sequences]
+    matcher = GappedSequenceMatcher(sequences, gaps)
+
+    keys = []
+    for _ in range(60):
+        keys.append(rng.choice(alphabet))
+        completed = sorted(matcher.step(keys[-1]))
+
+        expected = []
+        for index, (sequence, gap) in enumerate(zip(sequences, gaps)):
+            starts = brute_starts(keys[-matcher.span:], sequence, gap)
+            if starts:
+                expected.append(index)
+                assert matcher.start_offset(index) == min(matcher.span, len(keys)) - 1 - max(starts)
+
+        assert completed == expected
+
+
+# ------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------
+
+def test_extra_key_between_steps():
+    pipeline = KeyboardGesturePipeline([
+        make_gapped(["ctrl", "k"], "gapped", 1),
+        make_gesture(["ctrl", "k"], "strict"),
+    ])
+
+    keys = ["ctrl", "shift", "k"]
+    results = [
+        pipeline.process_event(EventData_keyboard(id=i, press=True, key=k))
+        for i, k in enumerate(keys)
+    ]
+    assert results == [[], [], ["gapped"]]
+
+
+def test_gapped_start_outside_window():
+    pipeline = KeyboardGesturePipeline([make_gapped(["ctrl", "k"], "cb", 2)])
+
+    pipeline.process_event(EventData_keyboard(id=1, press=True, key="ctrl"))
+    pipeline.process_event(EventData_keyboard(id=2, press=True, key="x"))
+    assert pipeline.process_event(EventData_keyboard(id=3, press=True, key="k"), window_start=2) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_streaming_matches_snapshot_with_gaps(seed):
+    rng = random.Random(seed)
+    alphabet = ["ctrl", "shift", "a", "k"]
+
+    gestures = [
+        make_gapped([rng.choice(alphabet) for _ in range(rng.randint(1, 3))], f"cb{i}", rng.randint(0, 2))
+        for i in range(20)
+    ]
+
+    streaming = KeyboardGesturePipeline(gestures)
+    snapshot = KeyboardGesturePipeline(gestures)
+
+    events = []
+    for i in range(200):
+        event = EventData_keyboard(id=i, press=True, key=rng.choice(alphabet))
+        events.append(event)
+        buffer = events[-rng.randint(1, 7):]
+
+        expected = snapshot.process_for_trigger(trigger_key=event.key, event_sequence=buffer)
+        assert streaming.process_event(event, window_start=buffer[0].id) == expected
@@ -0,0 +1,116 @@
+from gestura.input.mouse.trie import GestureTrie
+from gestura.input.mouse.pipeline import MouseGestureDetector, MouseGesturePipeline
+from gestura.input.mouse.segments import TREND_CODES
+
+from .test_SegmentStream import random_trace, make_gesture
+
+import random
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+KEYS = [("x", "right"), ("x", "left"), ("y", "up"), ("y", "down")]
+
+
+def random_gestures(seed: int, count: int):
+    """
+    Gestures built from a few shared prefixes.
+    """
+    rng = random.Random(seed)
+
+    prefixes = [
+        [(*rng.choice(KEYS), rng.choice([20, 40])) for _ in range(rng.randint(1, 2))]
+        for _ in range(4)
+    ]
+
+    gestures = []
+    for i in range(count):
+        conditions = list(rng.choice(prefixes))
+        conditions += [(*rng.choice(KEYS), rng.choice([10, 20, 40, 80])) for _ in range(rng.randint(0, 2))]
+        gestures.append(make_gesture(
+            [{"axis": a, "trend": t, "min_delta": d} for a, t, d in conditions],
+            f"g{i}",
+        ))
+
+    return gestures
+
+
+def reference_match(gestures, segments):
+    """
+    Per-gesture greedy matching (one pass per gesture).
+    """
+    occurrences = []
+
+    for seg in segments:
+        for gesture in gestures:
+            conditions = [(*TREND_CODES[c.trend], c.min_delta) for c in gesture.conditions]
+            axis, trend, min_delta = conditions[0]
+            if (seg.axis, seg.trend) != (axis, trend) or seg.delta < min_delta:
+                continue
+
+            last_end = seg.end_id
+            for axis, trend, min_delta in conditions[1:]:
+                for other in segments:
+                    if other.end_id >= last_end and (other.axis, other.trend) == (axis, trend) and other.delta >= min_delta:
+                        last_end = other.end_id
+                        break
+                else:
+                    break
+            else:
+                occurrences.append((gesture.callback, last_end))
+
+    return occurrences
+
+
+# ------------------------------------------------------------
+# Structure
+# ------------------------------------------------------------
+
+def test_shared_prefix_is_one_path():
+    trie = GestureTrie([
+        make_gesture([{"axis": "y", "trend": "up", "min_delta": 50},
+                      {"axis": "x", "trend": "left", "min_delta": 30}], "up_left"),
+        make_gesture([{"axis": "y", "trend": "up", "min_delta": 50},
+                      {"axis": "x", "trend": "right", "min_delta": 30}], "up_right"),
+        make_gesture([{"axis": "y", "trend": "up", "min_delta": 50}], "up"),
+        make_gesture([{"axis": "y", "trend": "up", "min_delta": 80}], "up_far"),
+    ])
+
+    group = trie.root.groups[TREND_CODES["up"]]
+    assert group.mins == [50, 80]
+
+    up = group.nodes[0]
+    assert [cb for _, cb in up.callbacks] == ["up"]
+    assert sorted(up.below) == ["up", "up_left", "up_right"]
+    assert set(up.groups) == {TREND_CODES["left"], TREND_CODES["right"]}
+
+    assert trie.thresholds()[TREND_CODES["up"]] == [50, 80]
+
+
+# ------------------------------------------------------------
+# Equivalence
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(10))
+def test_batch_matches_per_gesture_reference(seed):
+    gestures = random_gestures(seed, 60)
+    detector = MouseGestureDetector(gestures, segment_min_delta=10)
+
+    segments = detector.extract_segments(random_trace(seed, 300))
+
+    assert detector.match_segments(segments) == reference_match(gestures, segments)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_streaming_matches_batch_with_shared_prefixes(seed):
+    gestures = random_gestures(seed, 60)
+    streaming = MouseGesturePipeline(gestures, segment_min_delta=10)
+    batch = MouseGesturePipeline(gestures, segment_min_delta=10)
+
+    events = random_trace(seed, 150)
+
+    for i, event in enumerate(events):
+        assert sorted(streaming.process_event(event)) == sorted(batch.process_for_trigger(events[: i + 1]))
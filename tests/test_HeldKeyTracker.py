@@ -0,0 +1,152 @@
+from gestura.config import KeyboardConfig
+from gestura.config.parser import parse_shortcut_config
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.input.keyboard.held import HeldKeyTracker
+from gestura.input.keyboard.keycodes import UNKNOWN_KEY
+from gestura.models.inputs import KeyboardEvent
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def make_chord(keys, callback):
+    gesture = make_gesture(keys, callback)
+    gesture.mode = "chord"
+    return gesture
+
+
+def make_app(gestures, expiry=10.0):
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=gestures,
+        on_trigger=triggered.extend,
+        HeldKeyExpirySeconds=expiry,
+    ))
+    return app, triggered
+
+
+def press(app, key, t=0.0):
+    app.HandleEvens(KeyboardEvent(key=key, press=True), t)
+
+
+def release(app, key, t=0.0):
+    app.HandleEvens(KeyboardEvent(key=key, press=False), t)
+
+
+# ------------------------------------------------------------
+# Tracker
+# ------------------------------------------------------------
+
+def test_mask_follows_press_and_release():
+    tracker = HeldKeyTracker()
+
+    assert tracker.press(3, 0.0) is True
+    assert tracker.press(5, 0.0) is True
+    assert tracker.press(3, 0.1) is False       # auto-repeat
+    assert tracker.mask == (1 << 3) | (1 << 5)
+
+    tracker.release(3)
+    assert tracker.mask == 1 << 5
+    assert not tracker.is_held(3)
+
+
+def test_missed_release_expires():
+    tracker = HeldKeyTracker(expiry_seconds=1.0)
+
+    tracker.press(3, 0.0)
+    tracker.press(5, 0.8)
+    tracker.press(5, 1.5)                       # 3 never released
+
+    assert tracker.mask == 1 << 5
+
+
+def test_unknown_keys_share_bit_until_last_release():
+    tracker = HeldKeyTracker()
+
+    assert tracker.press(UNKNOWN_KEY, 0.0, "x") is True
+    assert tracker.press(UNKNOWN_KEY, 0.0, "y") is True
+    assert tracker.press(UNKNOWN_KEY, 0.1, "x") is False     # auto-repeat
+
+    tracker.release(UNKNOWN_KEY, "x")
+    assert tracker.is_held(UNKNOWN_KEY)                      # "y" still down
+
+    tracker.release(UNKNOWN_KEY, "y")
+    assert tracker.mask == 0
+
+
+# ------------------------------------------------------------
+# Chords
+# ------------------------------------------------------------
+
+def test_chord_fires_in_any_press_order():
+    app, triggered = make_app([make_chord(["ctrl", "shift", "k"], "cb")])
+
+    press(app, "k")
+    press(app, "shift_r")
+    press(app, "ctrl_l")
+
+    assert triggered == ["cb"]
+
+
+def test_chord_needs_keys_held_together():
+    app, triggered = make_app([make_chord(["ctrl", "k"], "cb")])
+
+    press(app, "ctrl_l")
+    release(app, "ctrl_l")
+    press(app, "k")
+    assert triggered == []
+
+    press(app, "ctrl_l")
+    assert triggered == ["cb"]
+
+
+def test_chord_ignores_auto_repeat_and_extra_keys():
+    app, triggered = make_app([make_chord(["ctrl", "k"], "cb")])
+
+    press(app, "ctrl_l")
+    press(app, "k")
+    press(app, "k")                             # auto-repeat
+    assert triggered == ["cb"]
+
+    press(app, "x")                             # ctrl + k + x
+    release(app, "k")
+    press(app, "k")
+    assert triggered == ["cb"]
+
+
+def test_chord_waits_for_every_unknown_key_release():
+    app, triggered = make_app([make_chord(["ctrl", "k"], "cb")])
+
+    press(app, "x")
+    press(app, "y")
+    release(app, "x")                           # "y" still held
+    press(app, "ctrl_l")
+    press(app, "k")
+    assert triggered == []
+
+    release(app, "k")
+    release(app, "y")
+    press(app, "k")
+    assert triggered == ["cb"]
+
+
+def test_chord_recovers_from_missed_release():
+    app, triggered = make_app([make_chord(["ctrl", "k"], "cb")], expiry=2.0)
+
+    press(app, "x", t=0.0)                      # release never delivered
+    press(app, "ctrl_l", t=5.0)
+    press(app, "k", t=5.1)
+
+    assert triggered == ["cb"]
+
+
+def test_parser_reads_chord_mode():
+    bundle = parse_shortcut_config([
+        {"callback": "save", "keyboard": {"conditions": ["ctrl", "s"], "mode": "chord"}},
+        {"callback": "pause", "keyboard": {"conditions": ["ctrl", "ctrl"]}},
+    ])
+
+    assert [g.mode for g in bundle.keyboard_gestures] == ["chord", "sequence"]
@@ -0,0 +1,94 @@
+from gestura.config import KeyboardConfig
+from gestura.engine.timers import TimerHeap
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.models.inputs import KeyboardEvent
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def make_hold(keys, seconds, callback):
+    gesture = make_gesture(keys, callback)
+    gesture.mode = "hold"
+    gesture.hold_seconds = seconds
+    return gesture
+
+
+def make_app(gestures):
+    triggered = []
+    timers = TimerHeap()
+    app = KeyboardApp(KeyboardConfig(
+        gestures=gestures,
+        on_trigger=triggered.extend,
+        scheduler=timers,
+    ))
+    return app, timers, triggered
+
+
+def key(app, name, press, t):
+    app.HandleEvens(KeyboardEvent(key=name, press=press), t)
+
+
+# ------------------------------------------------------------
+# Hold
+# ------------------------------------------------------------
+
+def test_hold_fires_at_deadline_once():
+    app, timers, triggered = make_app([make_hold(["space"], 0.6, "hold_space")])
+
+    key(app, "space", True, 1.0)
+    assert timers.timeout(1.0) == pytest.approx(0.6)
+
+    timers.run_due(1.5)
+    assert triggered == []
+
+    key(app, "space", True, 1.55)               # auto-repeat does not re-arm
+    timers.run_due(1.6)
+    assert triggered == ["hold_space"]
+
+    timers.run_due(10.0)
+    assert triggered == ["hold_space"]
+    assert timers.timeout(10.0) is None
+
+
+def test_release_before_deadline_cancels():
+    app, timers, triggered = make_app([make_hold(["space"], 0.6, "hold_space")])
+
+    key(app, "space", True, 0.0)
+    key(app, "space", False, 0.3)
+
+    assert timers.timeout(0.3) is None
+    timers.run_due(5.0)
+    assert triggered == []
+
+
+def test_multi_key_hold_and_extra_key():
+    app, timers, triggered = make_app([
+        make_hold(["ctrl", "space"], 0.5, "short"),
+        make_hold(["ctrl", "space"], 1.0, "long"),
+    ])
+
+    key(app, "ctrl_l", True, 0.0)
+    key(app, "space", True, 0.1)
+    timers.run_due(0.6)
+    assert triggered == ["short"]
+
+    key(app, "x", True, 0.7)                    # held set changed: "long" cancelled
+    timers.run_due(5.0)
+    assert triggered == ["short"]
+
+
+def test_hold_without_scheduler_is_ignored():
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=[make_hold(["space"], 0.1, "hold_space")],
+        on_trigger=triggered.extend,
+    ))
+
+    key(app, "space", True, 0.0)
+    assert triggered == []
@@ -0,0 +1,355 @@
+from gestura.config import KeyboardConfig
+from gestura.engine.input_worker import InputWorker
+from gestura.engine.engine import GesturaEngine
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.models.inputs import KeyboardEvent, MouseMoveEvent
+from gestura.models.queues import QueueLimit, QueueLimits, QueueStats
+
+import threading
+import time
+
+import pytest
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+class Recorder:
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.threads = set()
+
+    def __call__(self, event, timestamp):
+        self.threads.add(threading.get_ident())
+        self.log.append((self.name, event, timestamp))
+
+
+class FakeListener:
+    def __init__(self, on_event):
+        self.on_event = on_event
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return predicate()
+
+
+# ------------------------------------------------------------
+# InputWorker
+# ------------------------------------------------------------
+
+def test_merged_timeline_preserves_arrival_order():
+    log = []
+    ticks = iter(range(100))
+    keyboard, mouse = Recorder("keyboard", log), Recorder("mouse", log)
+
+    worker = InputWorker(keyboard, mouse, func_now=lambda: float(next(ticks)))
+
+    # enqueue before start: the first drain sees one batch
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+    worker.submit_mouse(MouseMoveEvent(x=1, y=1))
+    worker.submit_keyboard(KeyboardEvent(key="a", press=False))
+    worker.submit_mouse(MouseMoveEvent(x=2, y=2))
+
+    worker.start()
+    worker.stop()
+
+    assert [(name, stamp) for name, _, stamp in log] == [
+        ("keyboard", 0.0), ("mouse", 1.0), ("keyboard", 2.0), ("mouse", 3.0),
+    ]
+
+
+def test_handlers_run_on_detection_thread():
+    log = []
+    keyboard, mouse = Recorder("keyboard", log), Recorder("mouse", log)
+
+    worker = InputWorker(keyboard, mouse)
+    worker.start()
+
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+    worker.submit_mouse(MouseMoveEvent(x=1, y=1))
+    worker.stop()
+
+    assert len(log) == 2
+    assert keyboard.threads == mouse.threads
+    assert threading.get_ident() not in keyboard.threads
+
+
+def test_handler_error_does_not_stop_the_loop():
+    log = []
+
+    def failing(event, timestamp):
+        raise RuntimeError("boom")
+
+    worker = InputWorker(failing, Recorder("mouse", log), batch_size=1)
+    worker.start()
+
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+    worker.submit_mouse(MouseMoveEvent(x=1, y=1))
+    worker.stop()
+
+    assert [name for name, _, _ in log] == ["mouse"]
+
+
+def test_current_timestamp_is_capture_time_of_handled_event():
+    seen = []
+    worker = InputWorker(
+        keyboard_handler=lambda event, ts: seen.append((ts, worker.current_timestamp)),
+        mouse_handler=lambda event, ts: None,
+    )
+
+    assert worker.current_timestamp is None
+
+    worker.submit(worker._keyboard_handler, KeyboardEvent(key="a", press=True), timestamp=5.0)
+    worker.submit(worker._keyboard_handler, KeyboardEvent(key="b", press=True), timestamp=6.0)
+    worker.start()
+    worker.stop()
+
+    assert seen == [(5.0, 5.0), (6.0, 6.0)]
+    assert worker.current_timestamp is None
+
+
+def test_adapter_timestamp_ns_is_the_capture_time():
+    log = []
+    worker = InputWorker(Recorder("keyboard", log), Recorder("mouse", log), func_now=lambda: 100.0)
+
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True, timestamp_ns=2_500_000_000))
+    worker.submit_mouse(MouseMoveEvent(x=1, y=1))
+    worker.submit(worker._mouse_handler, MouseMoveEvent(x=2, y=2, timestamp_ns=3_000_000_000))
+    worker.start()
+    worker.stop()
+
+    assert [stamp for _, _, stamp in log] == [2.5, 100.0, 3.0]
+
+
+@pytest.mark.parametrize("stamped, expected", [(False, []), (True, ["ab"])])
+def test_processing_lag_does_not_stretch_gesture_windows(stamped, expected):
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=[make_gesture(["a", "b"], "ab")],
+        on_trigger=triggered.extend,
+        BufferWindowSeconds=1.5,
+    ))
+
+    # every arrival is 2 s later than the previous one (backlog)
+    ticks = iter(range(0, 100, 2))
+    worker = InputWorker(app.HandleEvens, lambda event, ts: None, func_now=lambda: float(next(ticks)))
+
+    for key, captured_ns in (("a", 0), ("b", 100_000_000)):
+        worker.submit_keyboard(KeyboardEvent(key=key, press=True, timestamp_ns=captured_ns if stamped else None))
+    worker.start()
+    worker.stop()
+
+    assert triggered == expected
+
+
+# ------------------------------------------------------------
+# Limits
+# ------------------------------------------------------------
+
+def test_bounded_input_drops_newest_per_source():
+    log = []
+    worker = InputWorker(
+        keyboard_handler=Recorder("keyboard", log),
+        mouse_handler=Recorder("mouse", log),
+        mouse_limit=QueueLimit(capacity=2, policy="drop_newest"),
+    )
+
+    # not started: nothing is consumed
+    for x in range(5):
+        worker.submit_mouse(MouseMoveEvent(x=x, y=0))
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+
+    assert worker.queue_stats() == {"mouse": QueueStats(dropped=3)}
+
+    worker.start()
+    worker.stop()
+    assert [name for name, _, _ in log] == ["mouse", "mouse", "keyboard"]
+
+    # handled events free their slots
+    log.clear()
+    worker.submit_mouse(MouseMoveEvent(x=9, y=0))
+    worker.start()
+    worker.stop()
+    assert [name for name, _, _ in log] == ["mouse"]
+
+
+def test_events_after_stop_wait_for_the_next_start():
+    log = []
+    gate = threading.Event()
+
+    def keyboard(event, timestamp):
+        gate.wait()
+        log.append(event.key)
+
+    worker = InputWorker(
+        keyboard_handler=keyboard,
+        mouse_handler=lambda event, ts: None,
+        keyboard_limit=QueueLimit(capacity=3),
+    )
+
+    worker.start()
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+    assert wait_for(lambda: worker.current_timestamp is not None)
+
+    # "b", the stop marker and "c" are drained in one batch
+    worker.submit_keyboard(KeyboardEvent(key="b", press=True))
+    worker.stop(timeout=0)
+    worker.submit_keyboard(KeyboardEvent(key="c", press=True))
+    gate.set()
+
+    assert wait_for(lambda: not worker.is_alive())
+    assert log == ["a", "b"]
+
+    worker.start()
+    worker.stop()
+    assert log == ["a", "b", "c"]
+
+    # every slot was given back
+    for key in "def":
+        worker.submit_keyboard(KeyboardEvent(key=key, press=True))
+    assert worker.queue_stats() == {"keyboard": QueueStats()}
+
+
+def test_bounded_input_drops_newest_by_default():
+    worker = InputWorker(
+        keyboard_handler=lambda event, ts: None,
+        mouse_handler=lambda event, ts: None,
+        keyboard_limit=QueueLimit(capacity=1),
+    )
+
+    # not started: a blocking default would hang the caller (the hook thread)
+    for key in "abc":
+        worker.submit_keyboard(KeyboardEvent(key=key, press=True))
+
+    assert worker.queue_stats() == {"keyboard": QueueStats(dropped=2)}
+
+
+def test_input_rejects_unsupported_policies():
+    for policy in ("drop_oldest", "coalesce"):
+        with pytest.raises(ValueError):
+            InputWorker(
+                keyboard_handler=lambda event, ts: None,
+                mouse_handler=lambda event, ts: None,
+                keyboard_limit=QueueLimit(capacity=8, policy=policy),
+            )
+
+
+# ------------------------------------------------------------
+# Engine wiring
+# ------------------------------------------------------------
+
+def test_engine_listeners_only_enqueue():
+    actions = []
+    listeners = {}
+
+    def keyboard_factory(on_event):
+        listeners["keyboard"] = FakeListener(on_event)
+        return listeners["keyboard"]
+
+    def mouse_factory(on_event):
+        listeners["mouse"] = FakeListener(on_event)
+        return listeners["mouse"]
+
+    config = [{
+        "mouse": {"conditions": []},
+        "keyboard": {"conditions": ["ctrl", "k"]},
+        "callback": "search",
+    }]
+
+    engine = GesturaEngine(
+        config, actions.append,
+        keyboard_listener_factory=keyboard_factory,
+        mouse_listener_factory=mouse_factory,
+    )
+
+    with engine:
+        listeners["keyboard"].on_event(KeyboardEvent(key="ctrl", press=True))
+        listeners["mouse"].on_event(MouseMoveEvent(x=10, y=10))
+        listeners["keyboard"].on_event(KeyboardEvent(key="k", press=True))
+
+        assert wait_for(lambda: actions)
+
+    assert [a.callback for a in actions] == ["search"]
+
+
+def test_engine_queue_stats_lists_bounded_queues():
+    engine = GesturaEngine(
+        [{"keyboard": {"conditions": ["esc"]}, "callback": "exit"}],
+        lambda action: None,
+        keyboard_listener_factory=FakeListener,
+        mouse_listener_factory=FakeListener,
+        queue_limits=QueueLimits(
+            mouse_input=QueueLimit(capacity=1024, policy="drop_newest"),
+            mouse_triggers=QueueLimit(capacity=64, policy="coalesce"),
+        ),
+    )
+
+    assert engine.queue_stats() == {"mouse_input": QueueStats(), "mouse_triggers": QueueStats()}
+
+
+def test_engine_rejects_non_positive_max_trigger_age():
+    with pytest.raises(ValueError):
+        GesturaEngine(
+            [{"keyboard": {"conditions": ["esc"]}, "callback": "exit"}],
+            lambda action: None,
+            keyboard_listener_factory=FakeListener,
+            mouse_listener_factory=FakeListener,
+            max_trigger_age=0,
+        )
+
+
+def test_engine_stop_keeps_triggers_of_a_slow_backlog():
+    actions = []
+    engine = GesturaEngine(
+        [{"keyboard": {"conditions": ["esc"]}, "callback": "exit"}],
+        actions.append,
+        keyboard_listener_factory=FakeListener,
+        mouse_listener_factory=FakeListener,
+    )
+
+    # longer than the input worker's default stop timeout
+    handler = engine._input_worker._keyboard_handler
+
+    def slow(event, timestamp):
+        time.sleep(1.2)
+        handler(event, timestamp)
+
+    engine._input_worker._keyboard_handler = slow
+
+    with engine:
+        engine._input_worker.submit_keyboard(KeyboardEvent(key="esc", press=True))
+
+    assert [a.callback for a in actions] == ["exit"]
+
+
+def test_trigger_outside_worker_loop_is_stamped_now():
+    actions = []
+    engine = GesturaEngine(
+        [{"keyboard": {"conditions": ["esc"]}, "callback": "exit"}],
+        actions.append,
+        keyboard_listener_factory=FakeListener,
+        mouse_listener_factory=FakeListener,
+        max_trigger_age=0.5,
+    )
+
+    before = time.monotonic()
+    with engine:
+        # straight into the app, not through the detection thread
+        engine._keyboard_app.HandleEvens(KeyboardEvent(key="esc", press=True))
+        assert wait_for(lambda: actions)
+
+    assert engine.late_triggers() == {"keyboard": 0, "mouse": 0}
+    assert actions[0].triggered_at >= before
@@ -0,0 +1,119 @@
+from gestura.input.keyboard.automaton import KeySequenceAutomaton
+from gestura.input.keyboard.keycodes import KeyTable
+from gestura.input.keyboard.pipeline import KeyboardGesturePipeline, KeySequenceIndex
+from gestura.models.event import EventData_keyboard
+
+from .test_GappedSequenceMatcher import make_gapped
+from .test_KeyboardGesturePipeline import make_gesture
+
+import random
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def run(automaton, keys):
+    state = 0
+    found = []
+    for position, key in enumerate(keys):
+        state = automaton.step(state, key)
+        found += [(position, index) for index in automaton.outputs(state)]
+    return found
+
+
+# ------------------------------------------------------------
+# Automaton
+# ------------------------------------------------------------
+
+def test_overlapping_sequences_are_all_reported():
+    sequences = [["h", "e"], ["s", "h", "e"], ["h", "i", "s"], ["h", "e", "r", "s"]]
+    automaton = KeySequenceAutomaton(sequences)
+
+    # "ushers": she + he end at 3, hers ends at 5
+    assert run(automaton, list("ushers")) == [(3, 0), (3, 1), (5, 3)]
+
+
+def test_outputs_are_shortest_first():
+    automaton = KeySequenceAutomaton([["a", "b", "c"], ["c"], ["b", "c"]])
+
+    state = 0
+    for key in "abc":
+        state = automaton.step(state, key)
+
+    assert [automaton.lengths[i] for i in automaton.outputs(state)] == [1, 2, 3]
+
+
+def test_unknown_key_resets_to_root():
+    automaton = KeySequenceAutomaton([["ctrl", "k"]])
+
+    state = automaton.step(0, "ctrl")
+    assert automaton.step(state, "space") == 0
+    assert automaton.step(state, "ctrl") == state
+
+
+def test_step_does_not_modify_the_automaton():
+    automaton = KeySequenceAutomaton([["a", "b"], ["b", "c"], ["a", "a", "c"]])
+    goto = [dict(transitions) for transitions in automaton._goto]
+
+    run(automaton, list("abcaacbbac"))
+
+    assert automaton._goto == goto
+
+
+# ------------------------------------------------------------
+# Streaming pipeline
+# ------------------------------------------------------------
+
+def test_pipelines_sharing_an_index_keep_their_own_state():
+    gestures = [make_gesture(["ctrl", "k"], "search"), make_gapped(["a", "b"], "ab", 1)]
+    index = KeySequenceIndex(gestures, KeyTable.from_gestures(gestures))
+    first = KeyboardGesturePipeline(gestures, index=index)
+    second = KeyboardGesturePipeline(gestures, index=index)
+
+    def press(pipeline, event_id, key):
+        return pipeline.process_event(EventData_keyboard(id=event_id, press=True, key=key))
+
+    assert press(first, 0, "ctrl") == []
+    assert press(first, 1, "a") == []
+    assert press(second, 0, "k") == []
+    assert press(second, 1, "b") == []
+    assert press(first, 2, "x") == []
+    assert press(first, 3, "b") == ["ab"]
+    assert press(first, 4, "ctrl") == []
+    assert press(first, 5, "k") == ["search"]
+
+
+def test_streaming_respects_window_start():
+    pipeline = KeyboardGesturePipeline([make_gesture(["ctrl", "ctrl"], "pause")])
+
+    first = EventData_keyboard(id=1, press=True, key="ctrl")
+    second = EventData_keyboard(id=2, press=True, key="ctrl")
+
+    assert pipeline.process_event(first, window_start=1) == []
+    assert pipeline.process_event(second, window_start=2) == []   # first press left the window
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_streaming_matches_snapshot_pipeline(seed):
+    rng = random.Random(seed)
+    alphabet = ["ctrl", "shift", "a", "b", "k"]
+
+    gestures = [
+        make_gesture([rng.choice(alphabet) for _ in range(rng.randint(1, 4))], f"cb{i}")
+        for i in range(30)
+    ]
+
+    streaming = KeyboardGesturePipeline(gestures)
+    snapshot = KeyboardGesturePipeline(gestures)
+
+    window = 5
+    events = []
+    for i in range(300):
+        event = EventData_keyboard(id=2 * i, press=True, key=rng.choice(alphabet))
+        events.append(event)
+        buffer = events[-rng.randint(1, window):]
+
+        expected = snapshot.process_for_trigger(trigger_key=event.key, event_sequence=buffer)
+        assert streaming.process_event(event, window_start=buffer[0].id) == expected
@@ -0,0 +1,71 @@
+from gestura.config import KeyboardConfig
+from gestura.config.parser import parse_shortcut_config
+from gestura.input.keyboard.handler import KeyboardApp
+from gestura.input.keyboard.keycodes import KeyTable, UNKNOWN_KEY
+from gestura.input.keyboard.pipeline import KeyboardGesturePipeline
+from gestura.models.event import EventData_keyboard
+from gestura.models.inputs import KeyboardEvent
+
+from .test_KeyboardGesturePipeline import make_gesture
+
+
+# ------------------------------------------------------------
+# Table
+# ------------------------------------------------------------
+
+def test_codes_are_small_and_stable():
+    table = KeyTable(["ctrl", "k", "ctrl"])
+
+    assert len(table) == 2
+    assert table.code("ctrl") == 1
+    assert table.code("k") == 2
+    assert table.name(2) == "k"
+    assert table.encode(["k", "ctrl"]) == (2, 1)
+
+
+def test_unknown_key_does_not_grow_table():
+    table = KeyTable(["a"])
+
+    assert table.code("z") == UNKNOWN_KEY
+    assert "z" not in table
+    assert len(table) == 1
+
+
+def test_parser_builds_table_from_keyboard_gestures():
+    bundle = parse_shortcut_config([
+        {"callback": "save", "keyboard": {"conditions": ["ctrl", "s"]}},
+        {"callback": "swipe", "mouse": {"conditions": [{"axis": "x", "trend": "left", "min_delta": 10}]}},
+    ])
+
+    assert len(bundle.key_table) == 2
+    assert "s" in bundle.key_table
+
+
+# ------------------------------------------------------------
+# Pipeline / App
+# ------------------------------------------------------------
+
+def test_pipeline_matches_on_codes():
+    table = KeyTable()
+    pipeline = KeyboardGesturePipeline([make_gesture(["ctrl", "k"], "cb")], key_table=table)
+
+    ctrl, k = table.code("ctrl"), table.code("k")
+
+    # the name is ignored once a code is present
+    assert pipeline.process_event(EventData_keyboard(id=1, press=True, key="?", code=ctrl)) == []
+    assert pipeline.process_event(EventData_keyboard(id=2, press=True, key="?", code=k)) == ["cb"]
+
+
+def test_app_interns_adapter_keys():
+    triggered = []
+    app = KeyboardApp(KeyboardConfig(
+        gestures=[make_gesture(["ctrl", "k"], "cb")],
+        on_trigger=triggered.extend,
+    ))
+
+    for key in ["ctrl_l", "x", "ctrl_l", "k"]:
+        app.HandleEvens(KeyboardEvent(key=key, press=True))
+
+    assert triggered == ["cb"]
+    assert app._interned["ctrl_l"] == ("ctrl", app._key_table.code("ctrl"))
+    assert app._interned["x"] == ("x", UNKNOWN_KEY)
@@ -0,0 +1,126 @@
+from gestura.input.mouse.matcher import MouseGestureMatcher
+from gestura.input.mouse.segments import make_segment
+from gestura.models.mouse import GestureMouseCondition
+
+import pytest
+
+
+def make_gesture(conditions, callback):
+    gesture = GestureMouseCondition()
+    for axis, trend, min_delta in conditions:
+        gesture.add_condition(axis=axis, trend=trend, min_delta=min_delta)
+    gesture.callback = callback
+    return gesture
+
+
+def seg(start_id, end_id, axis, trend, delta):
+    return make_segment(start_id, end_id, axis, trend, delta)
+
+
+def test_token_waits_for_next_condition():
+    matcher = MouseGestureMatcher([
+        make_gesture([("y", "up", 50), ("x", "left", 50)], "up_left"),
+    ])
+
+    assert matcher.on_segment_closed(seg(0, 10, "y", "up", 80)) == []
+    assert matcher.on_segment_closed(seg(10, 20, "x", "left", 30)) == []   # too small
+    assert matcher.on_segment_closed(seg(20, 30, "x", "left", 60)) == [("up_left", 30)]
+
+
+def test_tentative_segment_does_not_change_state():
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 50), ("y", "down", 50)], "right_down"),
+    ])
+
+    matcher.on_segment_closed(seg(0, 10, "x", "right", 60))
+
+    open_segment = seg(10, 15, "y", "down", 70)
+    assert matcher.evaluate([open_segment]) == [("right_down", 15)]
+    assert matcher.evaluate([open_segment]) == [("right_down", 15)]
+    assert matcher.evaluate([]) == []
+
+
+def test_segment_closed_before_token_is_found():
+    # the y segment closes before the x segment that starts the gesture,
+    # but ends after it: batch matching accepts it, so must the matcher
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 10), ("y", "up", 10)], "right_up"),
+    ])
+
+    assert matcher.on_segment_closed(seg(0, 101, "y", "up", 40)) == []
+    assert matcher.on_segment_closed(seg(50, 100, "x", "right", 40)) == [("right_up", 101)]
+
+
+def test_tentative_token_uses_later_closed_segment():
+    # the tentative x segment ends before the closed y one (undecided reversal)
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 40), ("y", "down", 40)], "right_down"),
+    ])
+
+    matcher.on_segment_closed(seg(0, 12, "y", "down", 50))
+
+    assert matcher.evaluate([seg(0, 10, "x", "right", 50)]) == [("right_down", 12)]
+
+
+def test_window_drops_tokens_with_first_segment_outside_window():
+    matcher = MouseGestureMatcher([
+        make_gesture([("y", "up", 50), ("x", "left", 50)], "up_left"),
+    ])
+
+    first = seg(0, 10, "y", "up", 80)
+    matcher.on_segment_closed(first)
+
+    # the window starts after the y segment: nothing of it is left
+    closed = [seg(20, 30, "x", "left", 60)]
+    assert matcher.on_window([], (20, 20), ([first], closed), closed) == []
+
+
+def test_window_truncates_first_segment():
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 40), ("x", "left", 40)], "right_left"),
+    ])
+
+    right = seg(0, 10, "x", "right", 100)
+    matcher.on_segment_closed(right)
+
+    left = seg(10, 15, "x", "left", 50)
+    assert matcher.evaluate([left]) == [("right_left", 15)]
+
+    # window starts at 5: the right segment is truncated but still long enough
+    assert matcher.on_window([seg(5, 10, "x", "right", 50)], (float("inf"), float("-inf")), ([right], []), []) == []
+    assert matcher.evaluate([left]) == [("right_left", 15)]
+
+    # window starts at 8: too short now
+    assert matcher.on_window([seg(8, 10, "x", "right", 20)], (float("inf"), float("-inf")), ([right], []), []) == []
+    assert matcher.evaluate([left]) == []
+
+
+def test_evaluation_only_runs_on_threshold_crossing(monkeypatch):
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 40)], "right"),
+        make_gesture([("x", "right", 80), ("y", "down", 10)], "right_down"),
+    ])
+
+    calls = []
+    evaluate = matcher._evaluate
+    monkeypatch.setattr(matcher, "_evaluate", lambda t: calls.append(t) or evaluate(t))
+
+    results = [matcher.evaluate([seg(0, i, "x", "right", 5 * i)]) for i in range(1, 21)]
+
+    # buckets of x:right are [.., 40), [40, 80), [80, ..)
+    assert len(calls) == 3
+    assert results[6] == []
+    assert results[7] == [("right", 8)]
+    assert results[19] == [("right", 20)]   # reused result follows the open segment
+
+
+def test_closed_segment_invalidates_reused_result():
+    matcher = MouseGestureMatcher([
+        make_gesture([("x", "right", 50), ("y", "down", 50)], "right_down"),
+    ])
+
+    open_segment = seg(10, 15, "y", "down", 70)
+    assert matcher.evaluate([open_segment]) == []
+
+    matcher.on_segment_closed(seg(0, 10, "x", "right", 60))
+    assert matcher.evaluate([seg(10, 16, "y", "down", 71)]) == [("right_down", 16)]
@@ -0,0 +1,175 @@
+from gestura import MultiSessionEngine, QueueLimit, QueueLimits, QueueStats
+from gestura.models.inputs import KeyboardEvent, MouseMoveEvent
+
+import threading
+
+import pytest
+
+from .test_InputWorker import wait_for
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+CONFIG = [
+    {"keyboard": {"conditions": ["ctrl", "k"]}, "mouse": {"conditions": []},
+     "policy": {"cooldown_seconds": 10.0}, "callback": "search"},
+    {"keyboard": {"conditions": ["ctrl"]},
+     "mouse": {"conditions": [{"axis": "y", "trend": "down", "min_delta": 20}]},
+     "callback": "combo"},
+]
+
+
+def make_engine(workers=2):
+    published = []
+    lock = threading.Lock()
+
+    def publish(session_id, action):
+        with lock:
+            published.append((session_id, action.callback, threading.get_ident()))
+
+    return MultiSessionEngine(CONFIG, publish, workers=workers), published
+
+
+def press(engine, session_id, *keys):
+    for key in keys:
+        engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=True))
+        engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=False))
+
+
+def move_down(engine, session_id, pixels=40):
+    for y in range(0, pixels + 1, 4):
+        engine.submit_mouse(session_id, MouseMoveEvent(x=100, y=100 + y))
+
+
+# ------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------
+
+def test_sessions_are_independent_streams():
+    engine, published = make_engine()
+
+    with engine:
+        press(engine, "alice", "ctrl")
+        press(engine, "bob", "k")          # not alice's ctrl -> k
+        press(engine, "alice", "k")
+        assert wait_for(lambda: published)
+
+    assert [(s, cb) for s, cb, _ in published] == [("alice", "search")]
+
+
+def test_policy_state_per_session():
+    engine, published = make_engine()
+
+    with engine:
+        for session_id in ("alice", "bob", "alice"):
+            press(engine, session_id, "ctrl", "k")
+
+    # alice's second trigger is inside her cooldown; bob's is not
+    assert sorted((s, cb) for s, cb, _ in published) == [("alice", "search"), ("bob", "search")]
+
+
+def test_combo_state_per_session():
+    engine, published = make_engine()
+
+    with engine:
+        press(engine, "alice", "ctrl")
+        move_down(engine, "bob")
+        move_down(engine, "alice")
+
+    assert [(s, cb) for s, cb, _ in published] == [("alice", "combo")]
+
+
+def test_shared_compiled_config_and_fixed_pool():
+    engine, published = make_engine(workers=2)
+
+    with engine:
+        sessions = [f"user{i}" for i in range(20)]
+        for session_id in sessions:
+            press(engine, session_id, "ctrl", "k")
+
+        assert len(engine) == 20
+
+        key_tables = {id(engine._session(s).keyboard._key_table) for s in sessions}
+        tables = {id(engine._session(s).worker._table) for s in sessions}
+        assert key_tables == {id(engine._bundle.key_table)}
+        assert tables == {id(engine._table)}
+
+        # matcher indexes are shared, only the cursors are per session
+        keyboards = [engine._session(s).keyboard for s in sessions]
+        pipelines = [engine._session(s).mouse._pipeline for s in sessions]
+        index = engine._keyboard_index
+
+        assert {id(k._gesture_pipeline._index) for k in keyboards} == {id(index.sequences)}
+        assert {id(k._gesture_pipeline._automaton) for k in keyboards} == {id(index.sequences.automaton)}
+        assert {id(k._gesture_pipeline._gapped.index) for k in keyboards} == {id(index.sequences.gapped)}
+        assert {id(k._chords) for k in keyboards} == {id(index.chords)}
+        assert {id(p._matcher._trie) for p in pipelines} == {id(engine._mouse_trie)}
+        assert {id(p.detector._trie) for p in pipelines} == {id(engine._mouse_trie)}
+        assert len({id(k._gesture_pipeline) for k in keyboards}) == len(sessions)
+
+    assert len(published) == 20
+    assert len({thread for _, _, thread in published}) <= 2
+
+
+def test_session_move_buffer_is_small():
+    engine, _ = make_engine()
+
+    with engine:
+        move_down(engine, "alice")
+
+        buffer = engine._session("alice").mouse._buffer
+        assert buffer.capacity == MultiSessionEngine.MOVE_BUFFER_CAPACITY
+        assert len(buffer._ids) == 2 * buffer.INITIAL_SIZE
+
+
+def test_close_session():
+    engine, published = make_engine()
+
+    with engine:
+        press(engine, "alice", "ctrl", "k")
+        engine.close_session("alice")
+        assert "alice" not in engine
+
+        # a new stream with fresh state
+        press(engine, "alice", "ctrl", "k")
+
+    assert [(s, cb) for s, cb, _ in published] == [("alice", "search"), ("alice", "search")]
+
+
+def test_max_trigger_age_drops_late_triggers():
+    published = []
+    engine = MultiSessionEngine(
+        CONFIG, lambda session_id, action: published.append(session_id), max_trigger_age=0.5)
+
+    with engine:
+        stale = engine.func_now() - 10.0
+        for key in ("ctrl", "k"):
+            engine.submit_keyboard("late", KeyboardEvent(key=key, press=True), stale)
+        press(engine, "fresh", "ctrl", "k")
+
+    assert published == ["fresh"]
+
+
+def test_rejects_non_positive_max_trigger_age():
+    with pytest.raises(ValueError):
+        MultiSessionEngine(CONFIG, lambda session_id, action: None, max_trigger_age=0)
+
+
+def test_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        MultiSessionEngine(CONFIG, lambda session_id, action: None, workers=0)
+
+
+def test_queue_limits_bound_pool_queues():
+    engine = MultiSessionEngine(
+        CONFIG, lambda session_id, action: None, workers=1,
+        queue_limits=QueueLimits(mouse_input=QueueLimit(capacity=4)),
+    )
+
+    # not started: the pool thread's queue only fills
+    move_down(engine, "a")
+    move_down(engine, "b")
+
+    assert engine.queue_stats() == {"mouse_input": QueueStats(dropped=18)}
@@ -0,0 +1,209 @@
+from gestura.input.mouse.pipeline import MouseGestureDetector, MouseGesturePipeline
+from gestura.input.mouse.segments import make_segment
+from gestura.models.mouse import GestureMouseCondition
+from gestura.models.event import EventData_move
+
+import random
+import pytest
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def random_trace(seed: int, length: int) -> list[EventData_move]:
+    """
+    Random walk with long strokes, small jitter, pauses and large jumps.
+    """
+    rng = random.Random(seed)
+    x, y = 500, 500
+    dx, dy = rng.choice([-1, 1]), rng.choice([-1, 1])
+
+    events = []
+    for i in range(length):
+        r = rng.random()
+        if r < 0.05:
+            dx = -dx
+        elif r < 0.10:
+            dy = -dy
+
+        step_x = dx * rng.randint(0, 12)
+        step_y = dy * rng.randint(0, 12)
+
+        r = rng.random()
+        if r < 0.10:
+            step_x = -dx * rng.randint(1, 4)   # small jitter back
+        elif r < 0.13:
+            step_y = -dy * rng.randint(20, 60) # large jump back
+        elif r < 0.18:
+            step_x = step_y = 0                # pause
+
+        x += step_x
+        y += step_y
+        events.append(EventData_move(id=i, x=x, y=y))
+
+    return events
+
+
+def make_gesture(conditions, callback):
+    gesture = GestureMouseCondition()
+    for cond in conditions:
+        gesture.add_condition(**cond)
+    gesture.callback = callback
+    return gesture
+
+
+GESTURES = [
+    make_gesture([{"axis": "x", "trend": "right", "min_delta": 40}], "right"),
+    make_gesture([{"axis": "y", "trend": "up", "min_delta": 60}], "up"),
+    make_gesture([
+        {"axis": "x", "trend": "right", "min_delta": 30},
+        {"axis": "y", "trend": "down", "min_delta": 30},
+    ], "right_down"),
+    make_gesture([
+        {"axis": "x", "trend": "left", "min_delta": 20},
+        {"axis": "x", "trend": "right", "min_delta": 20},
+        {"axis": "y", "trend": "up", "min_delta": 20},
+    ], "zigzag"),
+    make_gesture([
+        {"axis": "x", "trend": "right", "min_delta": 20},
+        {"axis": "x", "trend": "right", "min_delta": 20},
+        {"axis": "y", "trend": "down", "min_delta": 10},
+        {"axis": "y", "trend": "up", "min_delta": 10},
+    ], "repeat"),
+]
+
+
+# ------------------------------------------------------------
+# Extraction equivalence
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(20))
+def test_stream_matches_batch_extraction_on_every_prefix(seed):
+    detector = MouseGestureDetector([], segment_min_delta=10)
+    stream = detector.create_stream()
+
+    events = random_trace(seed, 150)
+
+    for i, event in enumerate(events):
+        stream.push(event)
+        assert stream.segments() == detector.extract_segments(events[: i + 1])
+
+
+def test_pending_reversal_is_committed_after_lookahead():
+    detector = MouseGestureDetector([], segment_min_delta=5, lookahead=2)
+    stream = detector.create_stream()
+
+    xs = [0, 50, 100, 97, 94, 91]   # small reversal confirmed by 2 more samples
+    closed = []
+    for i, x in enumerate(xs):
+        closed += stream.push(EventData_move(id=i, x=x, y=0))
+
+    assert closed == [
+        make_segment(0, 2, "x", "right", 100),
+    ]
+
+
+def test_expire_truncates_open_segment():
+    detector = MouseGestureDetector([], segment_min_delta=5)
+    stream = detector.create_stream()
+
+    events = [EventData_move(id=i, x=i * 10, y=0) for i in range(10)]
+    for event in events:
+        stream.push(event)
+
+    stream.expire(events[6].id)
+
+    assert stream.segments() == [
+        make_segment(6, 9, "x", "right", 30),
+    ]
+
+
+def test_expire_truncates_closed_segment_straddling_window_start():
+    detector = MouseGestureDetector([], segment_min_delta=5)
+    stream = detector.create_stream()
+
+    xs = [0, 20, 40, 60, 80, 100, 80, 60, 40, 20, 0]
+    for i, x in enumerate(xs):
+        stream.push(EventData_move(id=i, x=x, y=0))
+
+    stream.expire(3)
+
+    assert stream.segments() == [
+        make_segment(3, 5, "x", "right", 40),
+        make_segment(5, 10, "x", "left", 100),
+    ]
+
+
+@pytest.mark.parametrize("width", [1, 3, 8, 40])
+@pytest.mark.parametrize("seed", range(10))
+def test_windowed_stream_matches_batch_extraction(seed, width):
+    detector = MouseGestureDetector([], segment_min_delta=10)
+    stream = detector.create_stream()
+
+    events = random_trace(seed, 150)
+
+    for i, event in enumerate(events):
+        stream.push(event)
+
+        window = events[max(0, i - width + 1): i + 1]
+        stream.expire(window[0].id)
+
+        assert stream.segments() == detector.extract_segments(window)
+
+
+# ------------------------------------------------------------
+# Pipeline equivalence
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(30))
+def test_process_event_matches_process_for_trigger(seed):
+    streaming = MouseGesturePipeline(GESTURES, segment_min_delta=10)
+    batch = MouseGesturePipeline(GESTURES, segment_min_delta=10)
+
+    events = random_trace(seed, 150)
+
+    for i, event in enumerate(events):
+        # same callbacks; order inside one event may differ
+        assert sorted(streaming.process_event(event)) == sorted(batch.process_for_trigger(events[: i + 1]))
+
+
+@pytest.mark.parametrize("width", [1, 3, 8, 40])
+@pytest.mark.parametrize("seed", range(10))
+def test_windowed_process_event_matches_process_for_trigger(seed, width):
+    streaming = MouseGesturePipeline(GESTURES, segment_min_delta=10)
+    batch = MouseGesturePipeline(GESTURES, segment_min_delta=10)
+
+    events = random_trace(seed, 150)
+
+    for i, event in enumerate(events):
+        window = events[max(0, i - width + 1): i + 1]
+
+        assert (
+            sorted(streaming.process_event(event, window_start=window[0].id))
+            == sorted(batch.process_for_trigger(window))
+        )
+
+
+def test_windowed_process_event_truncates_closed_segment():
+    gestures = [
+        make_gesture([
+            {"axis": "x", "trend": "right", "min_delta": 40},
+            {"axis": "x", "trend": "left", "min_delta": 40},
+        ], "right_left"),
+    ]
+    streaming = MouseGesturePipeline(gestures, segment_min_delta=10)
+    batch = MouseGesturePipeline(gestures, segment_min_delta=10)
+
+    xs = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 90, 80, 70, 60, 50]
+    events = [EventData_move(id=i, x=x, y=0) for i, x in enumerate(xs)]
+
+    # once the left stroke reaches 40, the window only keeps
+    # 70 -> 100 of the right one (delta 30 < 40)
+    results = []
+    for i, event in enumerate(events):
+        window = events[max(0, i - 7): i + 1]
+        results.append(streaming.process_event(event, window_start=window[0].id))
+        assert results[-1] == batch.process_for_trigger(window)
+
+    assert results == [[]] * len(events)
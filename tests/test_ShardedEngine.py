@@ -0,0 +1,189 @@
+from gestura import QueueLimit, QueueLimits, QueueStats, ShardedEngine
+from gestura.engine.shards import HashRing
+from gestura.models.inputs import KeyboardEvent, MouseMoveEvent
+
+from collections import Counter
+import os, signal, threading, time
+
+import pytest
+from pydantic import ValidationError
+
+
+# ------------------------------------------------------------
+# HashRing
+# ------------------------------------------------------------
+
+KEYS = [f"user{i}" for i in range(2000)]
+
+
+def test_ring_is_deterministic_and_spreads_keys():
+    ring = HashRing(range(4))
+
+    assert [ring.node(k) for k in KEYS] == [HashRing(range(4)).node(k) for k in KEYS]
+
+    counts = Counter(ring.node(k) for k in KEYS)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > len(KEYS) / 4 * 0.6
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(range(4))
+    before = {k: ring.node(k) for k in KEYS}
+
+    ring.add(4)
+    moved = {k for k in KEYS if ring.node(k) != before[k]}
+
+    assert moved and all(ring.node(k) == 4 for k in moved)
+    assert len(moved) < len(KEYS) / 3
+
+    ring.remove(4)
+    assert {k: ring.node(k) for k in KEYS} == before
+
+
+def test_empty_ring():
+    with pytest.raises(LookupError):
+        HashRing().node("user")
+
+
+# ------------------------------------------------------------
+# ShardedEngine (synthetic sessions, real processes)
+# ------------------------------------------------------------
+
+CONFIG = [
+    {"keyboard": {"conditions": ["ctrl", "k"]}, "mouse": {"conditions": []},
+     "policy": {"cooldown_seconds": 10.0}, "callback": "search"},
+]
+
+
+def test_sessions_across_shards_merge_into_one_stream():
+    published = []
+    lock = threading.Lock()
+
+    def publish(session_id, action):
+        with lock:
+            published.append((session_id, action.callback))
+
+    sessions = [f"user{i}" for i in range(16)]
+    engine = ShardedEngine(CONFIG, publish, shards=2)
+
+    with engine:
+        for key in ("ctrl", "k"):
+            for session_id in sessions:
+                engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=True))
+                engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=False))
+
+        # half a sequence on other sessions: no cross-session matches
+        engine.submit_keyboard("lonely", KeyboardEvent(key="k", press=True))
+
+    assert sorted(published) == sorted((s, "search") for s in sessions)
+    assert {engine._ring.node(s) for s in sessions} == {0, 1}
+
+
+def test_invalid_config_fails_in_parent():
+    with pytest.raises(ValidationError, match="mode"):
+        ShardedEngine([{"keyboard": {"conditions": ["ctrl"], "mode": "bogus"}, "callback": "x"}],
+                      lambda session_id, action: None)
+
+
+def test_dead_shard_does_not_block_the_others():
+    published = []
+    lock = threading.Lock()
+
+    def publish(session_id, action):
+        with lock:
+            published.append((session_id, action.callback))
+
+    engine = ShardedEngine(CONFIG, publish, shards=2)
+    sessions = [f"user{i}" for i in range(16)]
+    alive = [s for s in sessions if engine.shard_of(s) == 1]
+
+    engine.start()
+    engine._processes[0].kill()
+    engine._processes[0].join()
+
+    for key in ("ctrl", "k"):
+        for session_id in sessions:
+            engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=True))
+            engine.submit_keyboard(session_id, KeyboardEvent(key=key, press=False))
+
+    engine.stop(timeout=30)
+
+    assert sorted(published) == sorted((s, "search") for s in alive)
+    assert not engine._sender.is_alive() and not engine._collector.is_alive()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="needs SIGSTOP")
+def test_stop_kills_stuck_shard_after_timeout():
+    engine = ShardedEngine(CONFIG, lambda session_id, action: None, shards=2)
+
+    engine.start()
+    os.kill(engine._processes[0].pid, signal.SIGSTOP)
+
+    started = time.monotonic()
+    engine.stop(timeout=1)
+
+    assert time.monotonic() - started < 10
+    assert not any(process.is_alive() for process in engine._processes)
+
+
+def test_max_trigger_age_applies_in_the_shards():
+    published = []
+    engine = ShardedEngine(
+        CONFIG, lambda session_id, action: published.append(session_id), shards=1, max_trigger_age=1.0)
+
+    stale = int((time.monotonic() - 10.0) * 1e9)
+    with engine:
+        for key in ("ctrl", "k"):
+            engine.submit_keyboard("late", KeyboardEvent(key=key, press=True, timestamp_ns=stale))
+            engine.submit_keyboard("fresh", KeyboardEvent(key=key, press=True))
+
+    assert published == ["fresh"]
+
+    with pytest.raises(ValueError):
+        ShardedEngine(CONFIG, lambda session_id, action: None, max_trigger_age=0)
+
+
+def test_input_limits_apply_before_the_shards():
+    engine = ShardedEngine(
+        CONFIG, lambda session_id, action: None, shards=2,
+        queue_limits=QueueLimits(mouse_input=QueueLimit(capacity=3)),
+    )
+
+    # not started: nothing is shipped, the caller must not block
+    for x in range(10):
+        engine.submit_mouse("user", MouseMoveEvent(x=x, y=0))
+    engine.submit_keyboard("user", KeyboardEvent(key="a", press=True))
+
+    assert engine.queue_stats() == {"mouse_input": QueueStats(dropped=7)}
+
+
+def test_shards_report_their_queue_losses():
+    engine = ShardedEngine(
+        CONFIG, lambda session_id, action: None, shards=1,
+        queue_limits=QueueLimits(actions=QueueLimit(capacity=8, policy="drop_newest")),
+    )
+
+    with engine:
+        pass
+
+    assert engine.queue_stats() == {"actions": QueueStats()}
+
+
+def test_input_after_stop_is_not_shipped_on_restart():
+    published = []
+    engine = ShardedEngine(CONFIG, lambda session_id, action: published.append(session_id), shards=1)
+
+    engine.start()
+    engine.stop()
+
+    for key in ("ctrl", "k"):
+        engine.submit_keyboard("late", KeyboardEvent(key=key, press=True))
+
+    assert engine._pending == [[]]
+    assert engine._late == 2
+
+    with engine:
+        for key in ("ctrl", "k"):
+            engine.submit_keyboard("user", KeyboardEvent(key=key, press=True))
+
+    assert published == ["user"]
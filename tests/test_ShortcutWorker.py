@@ -0,0 +1,237 @@
+import pytest
+
+from gestura.config import ShortcutConfig
+from gestura.config.parser import parse_shortcut_config
+from gestura.engine.worker import ShortcutWorker
+from gestura.models.policy import TriggerEvent
+from gestura.policy.engine import PolicyEngine
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+CONFIG = [
+    {"callback": "save", "keyboard": {"conditions": ["ctrl", "s"]},
+     "policy": {"cooldown_seconds": 1.0, "max_triggers": 10}},
+    {"callback": "swipe", "mouse": {"conditions": [{"axis": "x", "trend": "left", "min_delta": 10}]}},
+    {"callback": "combo", "keyboard": {"conditions": ["ctrl"]},
+     "mouse": {"conditions": [{"axis": "y", "trend": "down", "min_delta": 20}]}},
+]
+
+
+def make_worker(config=CONFIG, **overrides):
+    bundle = parse_shortcut_config(config)
+    published = []
+    worker = ShortcutWorker(ShortcutConfig(**{
+        "policy_engine": PolicyEngine(bundle.policies, bundle.callback_ids),
+        "publish_action": lambda action: published.append((action.callback, action.triggered_at)),
+        "worker_map": bundle.worker_map,
+        "callback_ids": bundle.callback_ids,
+        "combine_rules": bundle.combine_rules,
+        "max_trigger_ages": bundle.max_trigger_ages,
+        **overrides,
+    }))
+    return worker, published
+
+
+def run(worker, batches):
+    for source, callbacks, timestamp in batches:
+        worker._channel.put(source, callbacks, timestamp)
+    worker.start()
+    worker.stop()
+
+
+# ------------------------------------------------------------
+# IDs
+# ------------------------------------------------------------
+
+def test_parser_assigns_dense_ids_in_config_order():
+    bundle = parse_shortcut_config(CONFIG)
+    assert bundle.callback_ids == {"save": 0, "swipe": 1, "combo": 2}
+
+
+def test_policy_state_indexed_by_id():
+    engine = PolicyEngine(parse_shortcut_config(CONFIG).policies)
+
+    save = engine.callback_ids["save"]
+    assert engine.evaluate(TriggerEvent("keyboard", "save", 10.0, save)) is True
+    assert engine.evaluate(TriggerEvent("keyboard", "save", 10.5, save)) is False     # cooldown
+    assert engine.evaluate(TriggerEvent("keyboard", "other", 10.5, 99)) is True       # unknown id
+
+
+def test_policy_engine_keys_unnumbered_triggers_by_name():
+    engine = PolicyEngine(parse_shortcut_config(CONFIG).policies)
+
+    assert engine.evaluate(TriggerEvent("keyboard", "save", 10.0)) is True
+    assert engine.evaluate(TriggerEvent("keyboard", "save", 10.5)) is False   # cooldown
+    assert engine.evaluate(TriggerEvent("keyboard", "unknown", 10.5)) is True
+
+
+def test_custom_policy_engine_sees_callback_names():
+    seen = []
+
+    class NamePolicy:
+        def evaluate(self, trigger):
+            seen.append((trigger.callback, trigger.callback_id))
+            return trigger.callback != "swipe"
+
+    worker, published = make_worker(policy_engine=NamePolicy())
+
+    run(worker, [("keyboard", ["save"], 1.0), ("mouse", ["swipe"], 2.0)])
+
+    ids = parse_shortcut_config(CONFIG).callback_ids
+    assert seen == [("save", ids["save"]), ("swipe", ids["swipe"])]
+    assert [callback for callback, _ in published] == ["save"]
+
+
+# ------------------------------------------------------------
+# Dispatch
+# ------------------------------------------------------------
+
+def test_dispatch_and_publish_names():
+    worker, published = make_worker()
+
+    run(worker, [
+        ("keyboard", ["save", "unknown"], 10.0),
+        ("keyboard", ["save"], 10.5),          # cooldown
+        ("keyboard", ["swipe"], 10.6),         # mouse-only from keyboard
+        ("mouse", ["swipe"], 10.7),
+        ("keyboard", ["combo"], 11.0),
+        ("mouse", ["combo"], 11.5),
+    ])
+
+    assert published == [("save", 10.0), ("swipe", 10.7), ("combo", 11.5)]
+
+
+def test_ids_derived_from_policy_engine_when_not_configured():
+    bundle = parse_shortcut_config(CONFIG)
+    engine = PolicyEngine(bundle.policies)
+    worker = ShortcutWorker(ShortcutConfig(
+        policy_engine=engine,
+        publish_action=lambda action: None,
+        worker_map=bundle.worker_map,
+    ))
+
+    assert worker._ids == engine.callback_ids
+
+
+# ------------------------------------------------------------
+# Combined windows / order
+# ------------------------------------------------------------
+
+def combo(callback, **combine):
+    return {"callback": callback, "keyboard": {"conditions": ["ctrl"]},
+            "mouse": {"conditions": [{"axis": "y", "trend": "down", "min_delta": 20}]},
+            "combine": combine}
+
+
+def test_combine_rules_parsed_for_combos_only():
+    bundle = parse_shortcut_config(CONFIG + [combo("fast", window_seconds=0.5, order="keyboard_first")])
+
+    assert set(bundle.combine_rules) == {"combo", "fast"}
+    assert bundle.combine_rules["fast"].window_seconds == 0.5
+    assert bundle.combine_rules["fast"].order == "keyboard_first"
+    assert bundle.combine_rules["combo"].window_seconds is None
+
+
+def test_combine_rule_rejects_unknown_order():
+    with pytest.raises(ValueError):
+        parse_shortcut_config([combo("bad", order="sideways")])
+
+
+def test_per_combo_window():
+    worker, published = make_worker([combo("fast", window_seconds=0.5), combo("slow")])
+
+    run(worker, [
+        ("keyboard", ["fast", "slow"], 10.0),
+        ("mouse", ["fast", "slow"], 11.0),     # fast expired, slow within 4s
+        ("mouse", ["fast"], 12.0),
+        ("keyboard", ["fast"], 12.4),
+    ])
+
+    assert published == [("slow", 11.0), ("fast", 12.4)]
+
+
+def test_combine_order():
+    worker, published = make_worker([
+        combo("kb_first", order="keyboard_first"),
+        combo("mouse_first", order="mouse_first"),
+    ])
+
+    run(worker, [
+        ("mouse", ["kb_first", "mouse_first"], 10.0),
+        ("keyboard", ["kb_first", "mouse_first"], 10.5),    # only mouse_first completes
+        ("mouse", ["kb_first"], 11.0),                      # keyboard led at 10.5
+    ])
+
+    assert published == [("mouse_first", 10.5), ("kb_first", 11.0)]
+
+
+def test_expiry_heap_skips_stale_entries():
+    worker, published = make_worker([combo("c", window_seconds=1.0)])
+
+    run(worker, [
+        ("keyboard", ["c"], 10.0),
+        ("keyboard", ["c"], 10.8),     # re-recorded: the 10.0 entry goes stale
+        ("mouse", ["c"], 11.5),        # 10.0 entry due, 10.8 still pairs
+    ])
+
+    assert published == [("c", 11.5)]
+    assert worker._recent_keyboard == {} and worker._recent_mouse == {}
+
+
+# ------------------------------------------------------------
+# Late triggers
+# ------------------------------------------------------------
+
+def test_parser_reads_max_trigger_age():
+    bundle = parse_shortcut_config([
+        {"callback": "a", "keyboard": {"conditions": ["a"]}, "policy": {"max_trigger_age": 0.2}},
+        {"callback": "b", "keyboard": {"conditions": ["b"]}},
+    ])
+    assert bundle.max_trigger_ages == {"a": 0.2}
+
+    with pytest.raises(ValueError):
+        parse_shortcut_config([{"callback": "a", "keyboard": {"conditions": ["a"]}, "policy": {"max_trigger_age": 0}}])
+
+
+def test_stale_triggers_dropped_before_policy():
+    config = [
+        {"callback": "save", "keyboard": {"conditions": ["ctrl", "s"]},
+         "policy": {"cooldown_seconds": 5.0, "max_triggers": 10}},
+        {"callback": "quick", "keyboard": {"conditions": ["q"]},
+         "policy": {"max_trigger_age": 0.1, "max_triggers": 10}},
+    ]
+    worker, published = make_worker(config, max_trigger_age=0.5, func_now=lambda: 20.0)
+
+    run(worker, [
+        ("keyboard", ["save"], 19.0),      # 1.0s old: late (global limit)
+        ("keyboard", ["save"], 19.8),      # cooldown untouched by the late one
+        ("keyboard", ["quick"], 19.8),     # 0.2s old: late (own limit)
+        ("keyboard", ["quick"], 19.95),
+    ])
+
+    assert published == [("save", 19.8), ("quick", 19.95)]
+    assert worker.late_triggers() == {"keyboard": 2, "mouse": 0}
+
+
+def test_stale_combo_half_is_not_paired():
+    worker, published = make_worker([combo("c")], max_trigger_age=0.5, func_now=lambda: 20.0)
+
+    run(worker, [
+        ("keyboard", ["c"], 18.0),         # late: never recorded
+        ("mouse", ["c"], 19.9),
+        ("keyboard", ["c"], 19.95),
+    ])
+
+    assert published == [("c", 19.95)]
+    assert worker.late_triggers() == {"keyboard": 1, "mouse": 0}
+
+
+def test_no_age_limit_by_default():
+    worker, published = make_worker(func_now=lambda: 1000.0)
+    run(worker, [("keyboard", ["save"], 1.0)])
+
+    assert published == [("save", 1.0)]
+    assert worker.late_triggers() == {"keyboard": 0, "mouse": 0}
@@ -0,0 +1,80 @@
+from gestura.engine.input_worker import InputWorker
+from gestura.engine.timers import TimerHeap
+from gestura.models.inputs import KeyboardEvent
+
+from .test_InputWorker import wait_for
+
+import time
+
+
+# ------------------------------------------------------------
+# Heap
+# ------------------------------------------------------------
+
+def test_runs_due_timers_in_deadline_order():
+    heap = TimerHeap()
+    fired = []
+
+    heap.call_at(2.0, lambda: fired.append("b"))
+    heap.call_at(1.0, lambda: fired.append("a"))
+    heap.call_at(1.0, lambda: fired.append("a2"))     # same deadline: FIFO
+    heap.call_at(5.0, lambda: fired.append("late"))
+
+    assert heap.run_due(2.0) == 3
+    assert fired == ["a", "a2", "b"]
+    assert heap.timeout(2.0) == 3.0
+
+
+def test_cancelled_timers_never_run_and_do_not_bound_the_wait():
+    heap = TimerHeap()
+    fired = []
+
+    handle = heap.call_at(1.0, lambda: fired.append("x"))
+    heap.cancel(handle)
+
+    assert heap.timeout(0.0) is None               # idle: unbounded wait
+    assert heap.run_due(10.0) == 0
+    assert fired == []
+
+
+# ------------------------------------------------------------
+# InputWorker
+# ------------------------------------------------------------
+
+def test_worker_wakes_at_deadline_without_events():
+    fired = []
+    armed = []
+
+    def arm(event, timestamp):
+        # runs on the detection thread, like KeyboardApp arming a hold
+        armed.append(timestamp + 0.05)
+        worker.timers.call_at(armed[0], lambda: fired.append(time.monotonic()))
+
+    worker = InputWorker(arm, lambda e, t: None)
+    worker.start()
+    try:
+        worker.submit_keyboard(KeyboardEvent(key="a", press=True))
+
+        # no further events: only the deadline can wake the thread
+        assert wait_for(lambda: fired, timeout=1.0)
+        assert fired[0] >= armed[0]
+    finally:
+        worker.stop()
+
+
+def test_timers_run_before_later_events_in_capture_order():
+    log = []
+    ticks = iter([0.0, 1.0, 3.0, 3.0, 3.0, 3.0])
+
+    worker = InputWorker(lambda e, t: log.append(("event", e.key)), lambda e, t: None,
+                         func_now=lambda: next(ticks))
+    worker.timers.call_at(2.0, lambda: log.append(("timer", 2.0)))
+
+    worker.submit_keyboard(KeyboardEvent(key="a", press=True))    # t=0
+    worker.submit_keyboard(KeyboardEvent(key="b", press=True))    # t=1
+    worker.submit_keyboard(KeyboardEvent(key="c", press=True))    # t=3
+
+    worker.start()
+    worker.stop()
+
+    assert log == [("event", "a"), ("event", "b"), ("timer", 2.0), ("event", "c")]
@@ -0,0 +1,129 @@
+from gestura.config import ShortcutConfig
+from gestura.config.parser import WorkerGestureMap
+from gestura.engine.channel import TriggerChannel
+from gestura.engine.worker import ShortcutWorker
+from gestura.models.queues import QueueLimit, QueueStats
+from gestura.policy.engine import PolicyEngine
+
+import threading
+
+import pytest
+
+
+# ------------------------------------------------------------
+# Channel
+# ------------------------------------------------------------
+
+def test_empty_batches_are_skipped_and_drain_takes_all():
+    channel = TriggerChannel()
+
+    channel.put("mouse", [], 0.0)
+    channel.put("mouse", ["a"], 1.0)
+    channel.put("keyboard", ["b", "c"], 2.0)
+
+    assert len(channel) == 2
+    assert list(channel.drain()) == [("mouse", ["a"], 1.0), ("keyboard", ["b", "c"], 2.0)]
+    assert len(channel) == 0
+
+
+def test_close_wakes_consumer_after_pending():
+    channel = TriggerChannel()
+    drained = []
+
+    def consume():
+        while (batches := channel.drain()) is not None:
+            drained.extend(batches)
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+
+    channel.put("mouse", ["a"], 1.0)
+    channel.close()
+    thread.join(timeout=1)
+
+    assert not thread.is_alive()
+    assert drained == [("mouse", ["a"], 1.0)]
+
+
+# ------------------------------------------------------------
+# Limits
+# ------------------------------------------------------------
+
+def test_drop_newest_and_drop_oldest_per_source():
+    channel = TriggerChannel({
+        "mouse": QueueLimit(capacity=2, policy="drop_newest"),
+        "keyboard": QueueLimit(capacity=1, policy="drop_oldest"),
+    })
+
+    channel.put("mouse", ["m1"], 1.0)
+    channel.put("keyboard", ["k1", "k2"], 1.5)
+    channel.put("mouse", ["m2"], 2.0)
+    channel.put("mouse", ["m3"], 3.0)          # full: dropped
+    channel.put("keyboard", ["k3"], 3.5)       # full: evicts k1, k2
+
+    assert list(channel.drain()) == [("mouse", ["m1"], 1.0), ("mouse", ["m2"], 2.0), ("keyboard", ["k3"], 3.5)]
+    assert channel.stats() == {"mouse": QueueStats(dropped=1), "keyboard": QueueStats(dropped=2)}
+
+    # drain frees capacity
+    channel.put("mouse", ["m4"], 4.0)
+    assert list(channel.drain()) == [("mouse", ["m4"], 4.0)]
+
+
+def test_coalesce_keeps_distinct_callbacks_only():
+    channel = TriggerChannel({"mouse": QueueLimit(capacity=1, policy="coalesce")})
+
+    channel.put("mouse", ["a"], 1.0)
+    channel.put("mouse", ["a", "b"], 2.0)      # full: "a" already pending
+    channel.put("mouse", ["a", "b"], 3.0)      # nothing new
+    channel.put("keyboard", ["a"], 3.5)        # unbounded source
+
+    assert list(channel.drain()) == [("mouse", ["a"], 1.0), ("mouse", ["b"], 2.0), ("keyboard", ["a"], 3.5)]
+    assert channel.stats() == {"mouse": QueueStats(coalesced=3)}
+
+
+def test_block_waits_for_consumer():
+    channel = TriggerChannel({"keyboard": QueueLimit(capacity=1, policy="block")})
+    channel.put("keyboard", ["k1"], 1.0)
+
+    done = threading.Event()
+
+    def produce():
+        channel.put("keyboard", ["k2"], 2.0)
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+
+    assert not done.wait(0.05)
+    assert list(channel.drain()) == [("keyboard", ["k1"], 1.0)]
+    assert done.wait(1.0)
+    assert list(channel.drain()) == [("keyboard", ["k2"], 2.0)]
+    thread.join()
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        QueueLimit(capacity=0)
+
+
+# ------------------------------------------------------------
+# Worker
+# ------------------------------------------------------------
+
+def test_worker_handles_batches_in_order():
+    published = []
+    worker = ShortcutWorker(ShortcutConfig(
+        policy_engine=PolicyEngine({}),
+        publish_action=lambda action: published.append(action.callback),
+        worker_map=WorkerGestureMap(keyboard_only={"k1", "k2"}, mouse_only={"m1"}, combo=set()),
+    ))
+
+    # submitted before start: handled in one wakeup
+    worker.submit_keyboard_triggers(["k1", "k2"])
+    worker.submit_mouse_triggers([])
+    worker.submit_mouse_triggers(["m1", "k1"])    # k1 from mouse is ignored
+
+    worker.start()
+    worker.stop()
+
+    assert published == ["k1", "k2", "m1"]
@@ -0,0 +1,48 @@
+from gestura.input.mouse.pipeline import MouseGestureDetector
+from gestura.models.event import EventData_move
+
+from .test_SegmentStream import random_trace, GESTURES
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def columns(events):
+    return (
+        np.array([e.x for e in events]),
+        np.array([e.y for e in events]),
+        np.array([e.id for e in events]),
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("lookahead", [0, 1, 2, 4])
+def test_detect_array_matches_detect(seed, lookahead):
+    detector = MouseGestureDetector(GESTURES, segment_min_delta=10, lookahead=lookahead)
+    events = random_trace(seed, 400)
+
+    xs, ys, ids = columns(events)
+
+    assert detector.detect_array(xs, ys, ids) == detector.detect(events)
+
+
+def test_detect_array_default_ids():
+    detector = MouseGestureDetector(GESTURES, segment_min_delta=10)
+    events = [EventData_move(id=i, x=i * 5, y=0) for i in range(20)]
+
+    assert detector.detect_array([e.x for e in events], [0] * 20) == detector.detect(events)
+
+
+def test_detect_array_without_movement():
+    detector = MouseGestureDetector(GESTURES, segment_min_delta=10)
+
+    assert detector.detect_array([5, 5, 5], [1, 1, 1]) == []
+    assert detector.detect_array([], []) == []
+
+
+def test_detect_array_length_mismatch():
+    detector = MouseGestureDetector(GESTURES, segment_min_delta=10)
+
+    with pytest.raises(ValueError):
+        detector.detect_array([1, 2, 3], [1, 2])
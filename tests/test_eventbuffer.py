@@ -62,3 +62,17 @@ def test_exact_boundary():
 
     clock.advance(0.000001)
     assert buffer.snapshot() == []
+
+
+def test_window_measured_at_capture_time():
+    clock = FakeClock()
+    buffer = EventBuffer(window=1.0, func_now=clock.now)
+
+    buffer.add("a", 0.0)
+    buffer.add("b", 0.8)
+
+    # processed long after capture: the window is measured at capture time
+    clock.advance(10.0)
+    assert buffer.snapshot(0.8) == ["a", "b"]
+    assert buffer.oldest(1.5) == "b"
+    assert buffer.snapshot() == []
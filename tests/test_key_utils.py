@@ -28,3 +28,16 @@ def test_type_key():
 
     assert type(KeyUtils.parse_key(key="ctrl", output_type="object")) == Key
     assert type(KeyUtils.parse_key(key=" ", output_type="object")) == KeyCode
+
+
+@pytest.mark.parametrize("output_type", ["str", "type", "object"])
+def test_table_matches_full_logic(output_type):
+    for key in KeyUtils.table_inputs():
+        assert KeyUtils.parse_key(key, output_type) == KeyUtils.normalize_key_uncached(key, output_type)
+
+
+def test_table_miss_uses_full_logic():
+    assert "ctrl_left" not in KeyUtils.table_inputs()
+    assert KeyUtils.parse_key("ctrl_left", "str") == "ctrl"
+    assert KeyUtils.parse_key(KeyCode.from_char("q"), "str") == "q"
+    assert KeyUtils.parse_key(None, "str") == ""
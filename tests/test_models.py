@@ -68,4 +68,12 @@ def test_GestureMouse_insert_condition_as_Iterable():
         m.add_condition(axis="y", trend="down" if i // 2 == 0 else "up", min_delta=i)
     assert len(m.conditions) == len(data["conditions"]) + 3
     assert len(m.x()) == 1
-    assert len(m.y()) == 4
\ No newline at end of file
+    assert len(m.y()) == 4
+
+@pytest.mark.parametrize("seconds", [0.0, -1.0])
+def test_GestureKeyboard_hold_requires_positive_duration(seconds):
+    with pytest.raises(ValueError):
+        GestureKeyboard(conditions=["ctrl"], mode="hold", hold_seconds=seconds)
+
+    assert GestureKeyboard(conditions=["ctrl"], mode="hold", hold_seconds=0.5).hold_seconds == 0.5
+    assert GestureKeyboard(conditions=["ctrl"], mode="chord").hold_seconds == 0.0
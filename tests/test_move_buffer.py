@@ -0,0 +1,141 @@
+from gestura.input.move_buffer import MoveRingBuffer
+from gestura.models.event import EventData_move
+
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self._time = 0.0
+
+    def now(self):
+        return self._time
+
+    def advance(self, seconds: float):
+        self._time += seconds
+
+
+def test_sliding_window_basic():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, capacity=8, func_now=clock.now)
+
+    buffer.append(1, 10, 20)  # t = 0
+    clock.advance(0.5)
+    buffer.append(2, 11, 21)  # t = 0.5
+
+    ids, times, xs, ys = buffer.window_views()
+    assert ids.tolist() == [1, 2]
+    assert times.tolist() == [0.0, 0.5]
+    assert xs.tolist() == [10, 11]
+    assert ys.tolist() == [20, 21]
+
+    clock.advance(0.6)  # t = 1.1
+    assert buffer.oldest() == (2, 11, 21)
+    assert len(buffer) == 1
+
+    clock.advance(1.0)
+    assert buffer.oldest() is None
+    assert len(buffer) == 0
+
+
+def test_window_measured_at_capture_time():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, func_now=clock.now)
+
+    buffer.append(1, 0, 0, timestamp=0.0)
+    buffer.append(2, 1, 1, timestamp=0.8)
+
+    # processed long after capture: the window is measured at capture time
+    clock.advance(10.0)
+    assert buffer.oldest(0.8) == (1, 0, 0)
+    assert buffer.oldest(1.5) == (2, 1, 1)
+    assert [e.id for e in buffer.snapshot(1.5)] == [2]
+    assert buffer.window_views(1.5)[0].tolist() == [2]
+
+
+def test_exact_boundary():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, func_now=clock.now)
+
+    buffer.append(1, 0, 0)
+    clock.advance(1.0)
+    assert len(buffer) == 1
+
+    clock.advance(0.000001)
+    assert len(buffer) == 0
+
+
+def test_capacity_overwrites_oldest_and_window_stays_contiguous():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=100.0, capacity=4, func_now=clock.now)
+
+    for i in range(11):
+        buffer.append(i, i * 10, -i)
+        clock.advance(0.1)
+
+    ids, _, xs, ys = buffer.window_views()
+    assert ids.tolist() == [7, 8, 9, 10]
+    assert xs.tolist() == [70, 80, 90, 100]
+    assert ys.tolist() == [-7, -8, -9, -10]
+
+
+def test_columns_grow_lazily_up_to_capacity():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=100.0, capacity=200, func_now=clock.now)
+    assert len(buffer._ids) == 2 * MoveRingBuffer.INITIAL_SIZE
+
+    for i in range(150):
+        buffer.append(i, i, -i)
+        clock.advance(0.1)
+
+    # 64 -> 128 -> 200 (capped), window kept in order
+    assert len(buffer._ids) == 2 * 200
+    ids, _, xs, ys = buffer.window_views()
+    assert ids.tolist() == list(range(150))
+    assert xs.tolist() == list(range(150))
+    assert ys.tolist() == [-i for i in range(150)]
+
+    for i in range(150, 260):
+        buffer.append(i, i, -i)
+        clock.advance(0.1)
+
+    assert len(buffer._ids) == 2 * 200
+    assert buffer.window_views()[0].tolist() == list(range(60, 260))
+    assert buffer.oldest() == (60, 60, -60)
+
+
+def test_short_window_stays_small():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, capacity=8192, func_now=clock.now)
+
+    for i in range(1000):
+        buffer.append(i, i, i)
+        clock.advance(0.05)  # about 20 moves in the window
+
+    assert len(buffer._ids) == 2 * MoveRingBuffer.INITIAL_SIZE
+    assert len(buffer) == 20
+
+
+def test_snapshot_and_add_compatibility():
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, func_now=clock.now)
+
+    buffer.add(EventData_move(id=3, x=5, y=6))
+
+    assert buffer.snapshot() == [EventData_move(id=3, time=0.0, x=5, y=6)]
+
+
+def test_numpy_views_are_zero_copy():
+    np = pytest.importorskip("numpy")
+
+    clock = FakeClock()
+    buffer = MoveRingBuffer(window=1.0, capacity=4, func_now=clock.now)
+    for i in range(3):
+        buffer.append(i, i, i)
+
+    ids, _, xs, _ = buffer.window_views()
+    array = np.asarray(xs)
+
+    assert array.dtype == np.int64
+    assert array.tolist() == [0, 1, 2]
+    assert np.shares_memory(array, np.asarray(buffer.window_views()[2]))
@@ -0,0 +1,117 @@
+from gestura.input.tracing import RecordingTracer
+from gestura.input.mouse.pipeline import MouseGesturePipeline, MouseGestureDetector
+from gestura.input.keyboard.pipeline import KeyboardGesturePipeline
+from gestura.models.keyboard import GestureKeyboardCondition
+from gestura.models.mouse import GestureMouseCondition
+from gestura.models.event import EventData_move, EventData_keyboard
+
+
+def mouse_gesture(conditions, callback):
+    gesture = GestureMouseCondition()
+    for axis, trend, min_delta in conditions:
+        gesture.add_condition(axis=axis, trend=trend, min_delta=min_delta)
+    gesture.callback = callback
+    return gesture
+
+
+def test_streaming_mouse_trace():
+    tracer = RecordingTracer()
+    pipeline = MouseGesturePipeline(
+        [mouse_gesture([("x", "right", 50), ("x", "left", 50)], "right_left")],
+        segment_min_delta=5,
+        tracer=tracer,
+    )
+
+    xs = [0, 40, 80, 100, 98, 60, 20]   # 98: small reversal, then confirmed
+    for i, x in enumerate(xs):
+        pipeline.process_event(EventData_move(id=i, x=x, y=0))
+
+    assert tracer.of_kind("reversal")[0].data == {"axis": "x", "event_id": 4, "delta": -2, "real": True}
+    assert tracer.of_kind("segment_closed")[0].data == {
+        "start_id": 0, "end_id": 3, "axis": "x", "trend": "right", "delta": 100,
+    }
+    assert tracer.of_kind("match_success")[-1].data == {"callback": "right_left", "end_id": 6}
+
+
+def test_batch_mouse_trace_reports_jitter_and_fail():
+    tracer = RecordingTracer()
+    detector = MouseGestureDetector(
+        [mouse_gesture([("x", "right", 10), ("y", "down", 10)], "right_down")],
+        segment_min_delta=5,
+        tracer=tracer,
+    )
+
+    xs = [0, 20, 18, 40]   # 18: jitter, not confirmed
+    detector.detect([EventData_move(id=i, x=x, y=0) for i, x in enumerate(xs)])
+
+    assert [e.data["real"] for e in tracer.of_kind("reversal")] == [False]
+    assert tracer.of_kind("match_fail")[0].data["callback"] == "right_down"
+
+
+def test_keyboard_trace():
+    tracer = RecordingTracer()
+
+    gesture = GestureKeyboardCondition(conditions=["ctrl", "k"], callback="cb")
+    pipeline = KeyboardGesturePipeline(gestures=[gesture], tracer=tracer)
+
+    keys = [EventData_keyboard(id=1, press=True, key="a"), EventData_keyboard(id=2, press=True, key="k")]
+    pipeline.process_for_trigger(trigger_key="k", event_sequence=keys)
+
+    keys.insert(1, EventData_keyboard(id=3, press=True, key="ctrl"))
+    keys[-1] = EventData_keyboard(id=4, press=True, key="k")
+    pipeline.process_for_trigger(trigger_key="k", event_sequence=keys)
+
+    assert [e.kind for e in tracer.events] == ["match_fail", "match_success"]
+    assert tracer.events[1].data == {"callback": "cb", "end_id": 4}
+
+
+def test_no_tracer_is_default():
+    pipeline = MouseGesturePipeline([mouse_gesture([("x", "right", 10)], "r")], 5)
+
+    assert pipeline.detector.tracer is None
+
+
+def test_streaming_mouse_success_is_traced_only_for_triggers():
+    tracer = RecordingTracer()
+    pipeline = MouseGesturePipeline(
+        [mouse_gesture([("x", "right", 50)], "right")],
+        segment_min_delta=5,
+        tracer=tracer,
+    )
+
+    triggered = []
+    for i, x in enumerate([0, 40, 80, 100, 100, 100]):
+        triggered += pipeline.process_event(EventData_move(id=i, x=x, y=0))
+
+    # moves 4-5 reuse the cached evaluation and still trigger
+    assert len(triggered) == 4
+    assert [e.data["callback"] for e in tracer.of_kind("match_success")] == triggered
+
+
+def test_streaming_mouse_trace_reports_expired_partial_match():
+    tracer = RecordingTracer()
+    pipeline = MouseGesturePipeline(
+        [mouse_gesture([("x", "right", 50), ("y", "down", 50)], "right_down")],
+        segment_min_delta=5,
+        tracer=tracer,
+    )
+
+    xs = [0, 40, 80, 100, 60, 20, 20, 20, 20, 20]
+    for i, x in enumerate(xs):
+        pipeline.process_event(EventData_move(id=i, x=x, y=0), window_start=max(0, i - 5))
+
+    fails = tracer.of_kind("match_fail")
+    assert [e.data["callback"] for e in fails] == ["right_down"]
+    assert fails[0].data["condition"].trend == "down"
+    assert tracer.of_kind("match_success") == []
+
+
+def test_suppressed_occurrence_is_not_traced():
+    tracer = RecordingTracer()
+    pipeline = MouseGesturePipeline([mouse_gesture([("x", "right", 50)], "right")], 5, tracer=tracer)
+
+    events = [EventData_move(id=i, x=x, y=0) for i, x in enumerate([0, 40, 80, 100])]
+    assert pipeline.process_for_trigger(events) == ["right"]
+    assert pipeline.process_for_trigger(events) == []
+
+    assert len(tracer.of_kind("match_success")) == 1